@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+STAPpp Convergence Study
+自动化网格收敛性分析：逐级生成加密网格 (mesh_gen)，在进程池中并行求解，
+通过 get.py 从.out中提取端点位移，拟合收敛阶
+每一级的结果按.dat内容的哈希缓存，增加更细的网格时只需求解新增的那一级
+Usage: python3 convergence_study.py [--levels 8] [--base 2 1] [--backend direct|pcg|stap]
+                                    [--workdir DIR] [-j WORKERS] [--reference VALUE]
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import stap_model
+import out_writer
+import mesh_gen
+import get
+from pcg_solver import ElementOperator, solve as pcg_solve
+
+# 缓存格式版本：求解器或提取方式改变时递增，使旧缓存失效
+CACHE_VERSION = 1
+
+DEFAULT_STAP = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "..", "..", "other", "build", "stap++")
+
+
+def level_sizes(levels, base=(1, 1)):
+    """各级网格的 (nx, ny)：每级在两个方向上各加密一倍"""
+    return [(base[0] * 2**k, base[1] * 2**k) for k in range(levels)]
+
+
+def polygon_area(corners):
+    """四边形面积（鞋带公式）"""
+    c = np.asarray(corners, dtype=float)
+    x, y = c[:, 0], c[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def characteristic_size(corners, nx, ny):
+    """特征网格尺寸 h = sqrt(单元平均面积)，cantilever 上与 conv.py 的 h = 2, 1, 0.5 一致"""
+    return float(np.sqrt(polygon_area(corners) / (2 * nx * ny)))
+
+
+def free_dofs(nx, ny, clamp):
+    """方程数：未被固支的节点数 x 2（T3 只用 x、y 两个自由度）"""
+    fixed = np.zeros((ny + 1, nx + 1), dtype=bool)
+    fixed[:, 0] |= 'left' in clamp
+    fixed[:, -1] |= 'right' in clamp
+    fixed[0, :] |= 'bottom' in clamp
+    fixed[-1, :] |= 'top' in clamp
+    return int(2 * np.count_nonzero(~fixed))
+
+
+def file_hash(path):
+    """输入文件的SHA-256（分块读取）"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def beam_tip_deflection(preset):
+    """Euler-Bernoulli 悬臂梁端点挠度 P L^3 / (3 E I)（conv.py 原先硬编码的 32.0）"""
+    corners = np.asarray(preset['corners'], dtype=float)
+    length = corners[1, 0] - corners[0, 0]
+    height = corners[3, 1] - corners[0, 1]
+    E, nu, t = preset['material']
+    load = abs(sum(value for _, dof, value in preset.get('point_loads', []) if dof == 2))
+    return load * length**3 / (3.0 * E * t * height**3 / 12.0)
+
+
+def timed_direct_solution(model):
+    """稀疏LU直接求解（scipy splu），返回 (算子, 各工况的求解向量, (刚度组装耗时, 分解与求解耗时))"""
+    from scipy.sparse.linalg import splu
+
+    t0 = time.perf_counter()
+    operator = ElementOperator(model)
+    matrix = operator.to_sparse()
+    t1 = time.perf_counter()
+    lu = splu(matrix, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0)
+    displacements = [lu.solve(stap_model.assemble_force(model, operator.eqn, operator.neq, lcase))
+                     for lcase in range(1, model['nlcase'] + 1)]
+    return operator, displacements, (t1 - t0, time.perf_counter() - t1)
+
+
+def direct_solution(model):
+    """稀疏LU直接求解，返回 (算子, 各工况的求解向量)"""
+    operator, displacements, _ = timed_direct_solution(model)
+    return operator, displacements
+
+
+def solve_direct(dat_path, out_path):
+    """读取.dat直接求解，按COutputter格式写出.out（时间记录为输入、组装、求解三段的累计时间）"""
+    t0 = time.perf_counter()
+    model = stap_model.read_dat(dat_path)
+    time_input = time.perf_counter() - t0
+
+    operator, displacements, (time_assemble, time_solve) = timed_direct_solution(model)
+
+    out_writer.write_solution(out_path, model, operator.eqn, operator.lm, displacements,
+                              (time_input, time_input + time_assemble,
+                               time_input + time_assemble + time_solve))
+    return out_path
+
+
+def tip_displacement(out_path, node, dof):
+    """通过 get.py 的位移解析提取某节点某方向的位移（第一个载荷工况）"""
+    with open(out_path, 'r') as f:
+        content = f.read()
+    displacements = get.parse_displacement_results(content, 0)
+    return displacements[str(node)][['ux', 'uy', 'uz'][dof - 1]]
+
+
+def run_level(level, dat_path, backend, stap_exe, node, dof):
+    """工作进程：求解一级网格并提取端点位移"""
+    base = os.path.splitext(dat_path)[0]
+    t0 = time.perf_counter()
+
+    if backend == 'direct':
+        out_path = solve_direct(dat_path, base + ".out")
+    elif backend == 'pcg':
+        out_path = pcg_solve(dat_path, base + ".out", precond='ic')
+    else:
+        subprocess.run([stap_exe, dat_path], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        out_path = base + ".out"
+    solve_time = time.perf_counter() - t0
+
+    return {
+        'level': level,
+        'tip': tip_displacement(out_path, node, dof),
+        'solve_time': solve_time,
+        'extract_time': time.perf_counter() - t0 - solve_time,
+        'output': out_path
+    }
+
+
+def aitken_extrapolation(values):
+    """由最细三级的结果做Aitken外推，估计网格无限加密时的极限值；
+    相邻两级的差值不收缩（|u2 - u1| >= |u1 - u0|，如奇异点处或网格过粗）时无法外推，返回 None"""
+    u0, u1, u2 = values[-3:]
+    if abs(u2 - u1) >= abs(u1 - u0):
+        return None
+    return u2 - (u2 - u1)**2 / ((u2 - u1) - (u1 - u0))
+
+
+def fit_rate(h, errors):
+    """双对数最小二乘拟合 error = C h^p，返回 (p, C, R^2)"""
+    log_h, log_e = np.log(h), np.log(errors)
+    slope, intercept = np.polyfit(log_h, log_e, 1)
+    r = np.corrcoef(log_h, log_e)[0, 1]
+    return float(slope), float(np.exp(intercept)), float(r**2)
+
+
+def run_study(preset_name='cantilever', levels=6, base=(1, 1), workdir=None, backend='direct',
+              workers=None, reference=None, stap_exe=DEFAULT_STAP, force=False, probe=None,
+              fit_last=None):
+    """执行收敛性分析，返回包含各级结果与拟合结果的字典
+
+    fit_last: 只用最细的若干级（不含外推用掉的最细一级）拟合收敛阶，排除渐近区之前的粗网格
+    """
+    preset = mesh_gen.PRESETS[preset_name]
+    if workdir is None:
+        workdir = f"{preset_name}_convergence"
+    cache_dir = os.path.join(workdir, "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # 观测点：默认取集中载荷作用点（conv.py 的端点位移），没有集中载荷时取右上角
+    where, dof = ('top-right', 2)
+    if preset.get('point_loads'):
+        where, dof, _ = preset['point_loads'][0]
+    if probe is not None:
+        where = probe
+
+    records, pending, off_centre = [], [], []
+    for level, (nx, ny) in enumerate(level_sizes(levels, base)):
+        nume = 2 * nx * ny
+        dat_path = os.path.join(workdir, f"{preset_name}_{nume}.dat")
+        mesh_gen.write_structured_dat(dat_path, preset['corners'], nx, ny, preset['material'],
+                                      preset['clamp'], preset.get('point_loads', ()),
+                                      preset.get('edge_loads', ()),
+                                      f"T3 {preset_name.capitalize()} - {nume} Unit")
+
+        # 缓存的是观测点的位移，键中包含观测节点与自由度
+        tip_node = mesh_gen.node_number(nx, *mesh_gen.node_grid_index(nx, ny, where))
+        if (where in ('left-mid', 'right-mid') and ny % 2) or (where in ('bottom-mid', 'top-mid') and nx % 2):
+            off_centre.append(level)
+        key = f"{file_hash(dat_path)}-{backend}-n{tip_node}d{dof}-v{CACHE_VERSION}"
+        record = {
+            'level': level, 'nx': nx, 'ny': ny, 'elements': nume,
+            'dofs': free_dofs(nx, ny, preset['clamp']),
+            'h': characteristic_size(preset['corners'], nx, ny),
+            'key': key, 'dat': dat_path
+        }
+        records.append(record)
+
+        cache_path = os.path.join(cache_dir, key + ".json")
+        if not force and os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                record.update(json.load(f))
+            record['cached'] = True
+        else:
+            pending.append((level, dat_path, tip_node))
+
+    if off_centre:
+        print(f"Warning: {where} has no mid-edge node on level(s) {', '.join(map(str, off_centre))} "
+              f"(odd number of cells), the node below/left of the midpoint is used "
+              f"(the corner for a single cell)")
+    print(f"{levels} levels, {len(pending)} to solve, {levels - len(pending)} cached")
+
+    t0 = time.perf_counter()
+    if pending:
+        # 最大的网格最先提交，缩短总耗时
+        pending.sort(key=lambda item: -records[item[0]]['elements'])
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_level, level, dat_path, backend, stap_exe, node, dof)
+                       for level, dat_path, node in pending]
+            for future in futures:
+                result = future.result()
+                record = records[result['level']]
+                record.update(result, cached=False)
+                with open(os.path.join(cache_dir, record['key'] + ".json"), 'w', encoding='utf-8') as f:
+                    json.dump(result, f, indent=2)
+    wall_time = time.perf_counter() - t0
+
+    h = np.array([r['h'] for r in records])
+    tips = np.array([abs(r['tip']) for r in records])
+
+    # 参考解：给定值，或由最细三级外推（此时最细一级不参与拟合）；不能外推时取最细一级
+    fit_levels = len(records)
+    reference_source = 'given'
+    if reference is None:
+        if len(records) < 3:
+            raise ValueError("At least 3 levels are needed to extrapolate the reference value")
+        reference = aitken_extrapolation(tips)
+        reference_source = 'extrapolated'
+        if reference is None:
+            print("Warning: successive differences of the finest levels do not contract, "
+                  "using the finest level as the reference")
+            reference = tips[-1]
+            reference_source = 'finest level'
+        fit_levels -= 1
+
+    errors = np.abs(tips - reference)
+    for record, error in zip(records, errors):
+        record['error'] = float(error)
+        record['relative_error'] = float(error / abs(reference))
+
+    usable = np.nonzero(errors[:fit_levels] > 0.0)[0]
+    if fit_last is not None:
+        usable = usable[-fit_last:]
+    rate, constant, r_squared = fit_rate(h[usable], errors[usable])
+
+    return {
+        'preset': preset_name,
+        'backend': backend,
+        'reference': float(reference),
+        'reference_source': reference_source,
+        'beam_theory': beam_tip_deflection(preset) if preset.get('point_loads') else None,
+        'rate': rate,
+        'constant': constant,
+        'r_squared': r_squared,
+        'fit_levels': usable.tolist(),
+        'wall_time': wall_time,
+        'levels': records
+    }
+
+
+def print_study(study):
+    """打印收敛数据表"""
+    print("=" * 90)
+    print(f"{'Level':<6} {'Elements':<10} {'DOFs':<10} {'h':<10} {'|Tip|':<14} "
+          f"{'Error':<12} {'Rel.(%)':<9} {'Time(s)':<8}")
+    print("-" * 90)
+    for r in study['levels']:
+        time_str = "cached" if r['cached'] else f"{r['solve_time']:.2f}"
+        print(f"{r['level']:<6} {r['elements']:<10} {r['dofs']:<10} {r['h']:<10.4g} "
+              f"{abs(r['tip']):<14.6e} {r['error']:<12.4e} {100 * r['relative_error']:<9.3f} {time_str:<8}")
+    print("-" * 90)
+    print(f"Reference tip displacement: {study['reference']:.6e} ({study['reference_source']})")
+    if study['beam_theory'] is not None:
+        print(f"Euler-Bernoulli beam theory: {study['beam_theory']:.6e}")
+    print(f"Convergence rate: p = {study['rate']:.3f} (R² = {study['r_squared']:.6f})")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Cached, parallel mesh convergence study")
+    parser.add_argument('--preset', choices=sorted(mesh_gen.PRESETS), default='cantilever')
+    parser.add_argument('--levels', type=int, default=6, help="number of refinement levels")
+    parser.add_argument('--base', type=int, nargs=2, default=[1, 1], metavar=('NX', 'NY'),
+                        help="cells of the coarsest level (default: 1 1, as cantilever_2.dat)")
+    parser.add_argument('--backend', choices=['direct', 'pcg', 'stap'], default='direct',
+                        help="solver: sparse LU, IC-preconditioned PCG, or the stap++ executable")
+    parser.add_argument('--stap', default=DEFAULT_STAP, help="path of the stap++ executable")
+    parser.add_argument('--reference', type=float, default=None,
+                        help="reference tip displacement (default: extrapolated from the finest levels)")
+    parser.add_argument('--probe', help="node location to monitor, e.g. right-mid (default: the preset's "
+                                        "load point); with an odd number of cells a mid-edge probe "
+                                        "takes the node below/left of the midpoint, the corner for one cell")
+    parser.add_argument('--fit-last', type=int, default=None, metavar='N',
+                        help="fit the rate on the N finest usable levels only (default: all)")
+    parser.add_argument('--workdir', help="directory for meshes, results and the cache")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--force', action='store_true', help="ignore cached results")
+    args = parser.parse_args()
+
+    if args.levels < 2:
+        print("Error: At least 2 levels are needed")
+        sys.exit(1)
+    if args.reference is None and args.levels < 3:
+        print("Error: At least 3 levels are needed to extrapolate the reference value (or give --reference)")
+        sys.exit(1)
+    if args.fit_last is not None and args.fit_last < 2:
+        print("Error: --fit-last needs at least 2 levels")
+        sys.exit(1)
+
+    study = run_study(args.preset, args.levels, tuple(args.base), args.workdir, args.backend,
+                      args.workers, args.reference, args.stap, args.force, args.probe, args.fit_last)
+    print_study(study)
+
+    summary_path = os.path.join(args.workdir or f"{args.preset}_convergence", "convergence_study.json")
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(study, f, indent=2, ensure_ascii=False)
+    print(f"✓ Study saved to: {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
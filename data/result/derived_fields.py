@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+STAPpp Derived Fields
+由节点位移和单元应力导出的量，全部按列向量化计算，单位统一为国际单位（m、Pa、J/m^3），
+由使用者在输出时换算：
+- 位移模；von Mises 应力、主应力及主方向角、面内最大剪应力；应变能密度（需材料参数）
+- DerivedFields 缓存一个计算结果（run）的派生量，按 (载荷工况, 字段) 只计算一次，
+  报告、绘图、导出共用
+"""
+
+import numpy as np
+
+# 单元字段（T3 平面应力）与节点字段
+STRESS_FIELDS = ('sxx', 'syy', 'sxy', 'von_mises', 's1', 's2', 'principal_angle', 'max_shear',
+                 'energy_density')
+DISPLACEMENT_FIELDS = ('ux', 'uy', 'uz', 'umag')
+
+# 字段 -> 单位
+FIELD_UNITS = dict({name: 'Pa' for name in STRESS_FIELDS},
+                   principal_angle='deg', energy_density='J/m^3',
+                   **{name: 'm' for name in DISPLACEMENT_FIELDS})
+
+
+def von_mises(sxx, syy, sxy):
+    """平面应力 von Mises 应力"""
+    return np.sqrt(sxx * sxx + syy * syy - sxx * syy + 3.0 * sxy * sxy)
+
+
+def max_shear(sxx, syy, sxy):
+    """面内最大剪应力（莫尔圆半径）"""
+    return np.hypot(0.5 * (sxx - syy), sxy)
+
+
+def principal_stresses(sxx, syy, sxy):
+    """主应力 (s1 >= s2) 与 s1 方向相对 x 轴的角度（度，-90 ~ 90）"""
+    center = 0.5 * (sxx + syy)
+    radius = max_shear(sxx, syy, sxy)
+    angle = 0.5 * np.degrees(np.arctan2(2.0 * sxy, sxx - syy))
+    return center + radius, center - radius, angle
+
+
+def energy_density(sxx, syy, sxy, E, nu):
+    """平面应力应变能密度 W = sigma : D^-1 sigma / 2；E、nu 可为逐单元数组"""
+    return (sxx * sxx + syy * syy - 2.0 * nu * sxx * syy + 2.0 * (1.0 + nu) * sxy * sxy) / (2.0 * E)
+
+
+def displacement_magnitude(u):
+    """节点位移 (N, k) 的模"""
+    u = np.asarray(u, dtype=float)
+    return np.sqrt(np.einsum('ij,ij->i', u, u))
+
+
+def stress_fields(stress, materials=None):
+    """单元应力 (E, 3) [Sxx, Syy, Sxy] -> 全部单元字段 {名称: (E,)}
+
+    materials: 逐单元 (E, 2) [E, nu]，给出时才计算应变能密度
+    """
+    stress = np.asarray(stress, dtype=float).reshape(-1, 3)
+    sxx, syy, sxy = stress.T
+    s1, s2, angle = principal_stresses(sxx, syy, sxy)
+    fields = {'sxx': sxx, 'syy': syy, 'sxy': sxy, 'von_mises': von_mises(sxx, syy, sxy),
+              's1': s1, 's2': s2, 'principal_angle': angle, 'max_shear': 0.5 * (s1 - s2)}
+    if materials is not None:
+        materials = np.asarray(materials, dtype=float).reshape(-1, 2)
+        fields['energy_density'] = energy_density(sxx, syy, sxy, materials[:, 0], materials[:, 1])
+    return fields
+
+
+def displacement_fields(u):
+    """节点位移 (N, 2) 或 (N, 3) -> {ux, uy[, uz], umag}"""
+    u = np.asarray(u, dtype=float)
+    fields = dict(zip(DISPLACEMENT_FIELDS, u.T))
+    fields['umag'] = displacement_magnitude(u)
+    return fields
+
+
+class DerivedFields:
+    """一个计算结果的派生量缓存，按 (载荷工况, 字段) 记忆
+
+    displacements: {工况: 节点位移 (N, 2|3)}；stresses: {工况: T3 单元应力 (E, 3)}；
+    materials: 逐单元 [E, nu] (E, 2)，可选（应变能密度需要）
+    """
+
+    def __init__(self, displacements=None, stresses=None, materials=None):
+        self.displacements = displacements or {}
+        self.stresses = stresses or {}
+        self.materials = materials
+        self._cache = {}
+
+    @classmethod
+    def single(cls, u=None, stress=None, materials=None):
+        """只有一个载荷工况（工况号 1）的结果"""
+        return cls({1: u} if u is not None else None, {1: stress} if stress is not None else None,
+                   materials)
+
+    def load_cases(self):
+        """有结果的载荷工况"""
+        return sorted(set(self.displacements) | set(self.stresses))
+
+    def get(self, name, lcase=1):
+        """字段 name 在工况 lcase 下的值；同一工况的应力（或位移）字段一次全部算出并缓存"""
+        key = (lcase, name)
+        if key not in self._cache:
+            if name in DISPLACEMENT_FIELDS:
+                fields = displacement_fields(self.displacements[lcase])
+            elif name == 'energy_density' and self.materials is None:
+                raise KeyError("energy_density needs the material parameters (E, nu)")
+            elif name in STRESS_FIELDS:
+                fields = stress_fields(self.stresses[lcase], self.materials)
+            else:
+                raise KeyError(f"unknown field {name}")
+            self._cache.update(((lcase, field), values) for field, values in fields.items())
+            if key not in self._cache:
+                raise KeyError(f"{name} is not available for load case {lcase}")
+        return self._cache[key]
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def __contains__(self, name):
+        try:
+            self.get(name)
+        except KeyError:
+            return False
+        return True
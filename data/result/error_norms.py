@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+STAPpp Error Norms Against Analytic Solutions
+在全部T3单元上用堆叠的Gauss点（每个单元同一套面积坐标积分点）一次向量化积分：
+- 位移 L2 误差 ||u - u_h||_L2 = sqrt(int |u - u_h|^2 dA)
+- 能量范数误差 ||u - u_h||_E = sqrt(int (s - s_h)^T D^-1 (s - s_h) t dA)
+解析解：Timoshenko 端部受剪悬臂梁（平面应力精确解）与常应变分片试验
+不给.dat时执行收敛性分析：逐级生成结构化网格，按解析解施加一致的边界力、
+只约束消除刚体位移的3个自由度（解析解为精确解），求解并拟合 L2 与能量范数的收敛阶；
+给出.dat（及.out）时计算该结果相对解析解的误差。两种情况下解析场的刚体位移都按最小二乘与结果对齐
+Usage: python3 error_norms.py [--exact timoshenko|patch] [--levels 6] [--base 2 2] [--rule 7]
+       python3 error_norms.py xxx.dat [xxx.out] --exact timoshenko
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+
+import stap_model
+import mesh_gen
+from derived_fields import energy_density
+from convergence_study import level_sizes, characteristic_size, direct_solution, fit_rate
+
+# 三角形积分规则：积分点数 -> (面积坐标 (Q, 3)，权重 (Q,)，权重之和为1，乘以单元面积)
+# 1点（1阶）、3点（2阶）、Dunavant 7点（5阶）
+TRIANGLE_RULES = {
+    1: (np.array([[1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0]]), np.array([1.0])),
+    3: (np.array([[2.0 / 3.0, 1.0 / 6.0, 1.0 / 6.0],
+                  [1.0 / 6.0, 2.0 / 3.0, 1.0 / 6.0],
+                  [1.0 / 6.0, 1.0 / 6.0, 2.0 / 3.0]]), np.full(3, 1.0 / 3.0)),
+    7: (np.array([[1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0],
+                  [0.059715871789770, 0.470142064105115, 0.470142064105115],
+                  [0.470142064105115, 0.059715871789770, 0.470142064105115],
+                  [0.470142064105115, 0.470142064105115, 0.059715871789770],
+                  [0.797426985353087, 0.101286507323456, 0.101286507323456],
+                  [0.101286507323456, 0.797426985353087, 0.101286507323456],
+                  [0.101286507323456, 0.101286507323456, 0.797426985353087]]),
+        np.array([0.225, 0.132394152788506, 0.132394152788506, 0.132394152788506,
+                  0.125939180544827, 0.125939180544827, 0.125939180544827])),
+}
+DEFAULT_RULE = 7
+
+# 边界力积分：3点 Gauss-Legendre（[0, 1] 上的参数与权重），对二次分布力的一致节点力精确
+EDGE_POINTS = np.array([0.5 - 0.5 * np.sqrt(0.6), 0.5, 0.5 + 0.5 * np.sqrt(0.6)])
+EDGE_WEIGHTS = np.array([5.0, 8.0, 5.0]) / 18.0
+
+# 每批积分的单元数：(积分点, 单元) 的中间数组不超出CPU缓存时最快（百万单元约快一倍）
+CHUNK_ELEMENTS = 1 << 14
+
+# 收敛性分析的算例：几何、材料与载荷
+SOLUTIONS = {
+    # 与 cantilever 预设相同的 4 x 2 梁，端部 -100 的剪力按抛物线分布
+    'timoshenko': {'corners': mesh_gen.PRESETS['cantilever']['corners'],
+                   'material': mesh_gen.PRESETS['cantilever']['material'], 'load': -100.0},
+    # 扭曲的四边形区域上的常应力 [Sxx, Syy, Sxy]
+    'patch': {'corners': [(0.0, 0.0), (2.0, 0.0), (2.4, 1.6), (0.3, 1.2)],
+              'material': (100.0, 0.3, 1.0), 'stress': (1.0, 0.5, 0.25)},
+}
+
+
+def timoshenko_beam(length, height, load, E, nu, origin=(0.0, 0.0), thickness=1.0):
+    """Timoshenko 悬臂梁的平面应力精确解（Timoshenko & Goodier）
+
+    梁占 x0 <= x <= x0 + length、|y - y0| <= height / 2，origin = (x0, y0) 为固定端截面中点；
+    自由端作用合力为 load（沿 +y）的抛物线分布剪力，固定端为相应的反力分布
+    返回解析场 {'displacement': f(x, y) -> (ux, uy), 'stress': f(x, y) -> (sxx, syy, sxy)}
+    """
+    x0, y0 = origin
+    inertia = thickness * height**3 / 12.0
+    c2 = height**2 / 4.0
+    scale = load / (6.0 * E * inertia)
+
+    def displacement(x, y):
+        x, y = x - x0, y - y0
+        ux = -scale * y * ((6.0 * length - 3.0 * x) * x + (2.0 + nu) * (y * y - c2))
+        uy = scale * (3.0 * nu * y * y * (length - x) + (4.0 + 5.0 * nu) * c2 * x
+                      + (3.0 * length - x) * x * x)
+        return ux, uy
+
+    def stress(x, y):
+        x, y = x - x0, y - y0
+        sxx = -load * (length - x) * y / inertia
+        sxy = load / (2.0 * inertia) * (c2 - y * y)
+        return sxx, np.zeros_like(sxx), sxy
+
+    return {'displacement': displacement, 'stress': stress}
+
+
+def constant_strain(stress, E, nu):
+    """常应力 [Sxx, Syy, Sxy] 对应的线性位移场（不含刚体转动）"""
+    sxx, syy, sxy = map(float, stress)
+    exx = (sxx - nu * syy) / E
+    eyy = (syy - nu * sxx) / E
+    gxy = 2.0 * (1.0 + nu) * sxy / E
+
+    def displacement(x, y):
+        return exx * x + 0.5 * gxy * y, 0.5 * gxy * x + eyy * y
+
+    def stress_field(x, y):
+        one = np.ones_like(np.asarray(x, dtype=float))
+        return sxx * one, syy * one, sxy * one
+
+    return {'displacement': displacement, 'stress': stress_field}
+
+
+def with_rigid_motion(field, a, b, omega):
+    """解析位移叠加刚体位移 (a - omega y, b + omega x)，应力不变"""
+    base = field['displacement']
+
+    def displacement(x, y):
+        ux, uy = base(x, y)
+        return ux + a - omega * y, uy + b + omega * x
+
+    return dict(field, displacement=displacement)
+
+
+def fit_rigid_motion(field, xyz, u):
+    """按最小二乘选取刚体位移使解析位移与节点位移 u (N, 2|3) 最接近
+
+    纯面力问题的解析解只确定到刚体位移；有限元解由个别节点约束选定的刚体位移本身
+    有 O(h^2 log h) 的误差，直接比较会使 L2 误差的收敛阶偏低
+    """
+    x, y = xyz[:, 0], xyz[:, 1]
+    ux, uy = field['displacement'](x, y)
+    one, zero = np.ones_like(x), np.zeros_like(x)
+    A = np.vstack([np.column_stack([one, zero, -y]), np.column_stack([zero, one, x])])
+    rhs = np.concatenate([u[:, 0] - ux, u[:, 1] - uy])
+    a, b, omega = np.linalg.lstsq(A, rhs, rcond=None)[0]
+    return with_rigid_motion(field, a, b, omega)
+
+
+def element_errors(xyz, group, u, field, rule=DEFAULT_RULE, chunk=CHUNK_ELEMENTS):
+    """T3 单元组的逐单元误差平方，全部单元的全部积分点成批计算
+
+    u: 节点位移 (N, 2|3)；返回 {'l2', 'energy', 'l2_exact', 'energy_exact'}，各为 (NUME,)，
+    分别为 int |u - u_h|^2 dA、int (s - s_h)^T D^-1 (s - s_h) t dA 及解析解自身的对应积分
+    """
+    bary, weights = TRIANGLE_RULES[rule]
+    nume = len(group['conn'])
+    result = {name: np.empty(nume) for name in ('l2', 'energy', 'l2_exact', 'energy_exact')}
+
+    for start in range(0, nume, chunk):
+        part = slice(start, min(start + chunk, nume))
+        conn = stap_model.orient_t3(xyz, group['conn'][part])
+        b, c, area = stap_model.t3_geometry(xyz, conn)
+        mat = group['materials'][group['mset'][part] - 1]
+        E, nu, thickness = mat[:, 0], mat[:, 1], mat[:, 2]
+
+        # 单元常应变与常应力
+        index = conn - 1
+        ux_e, uy_e = u[index, 0], u[index, 1]                 # (NUME, 3)
+        inv_2a = 1.0 / (2.0 * area)
+        exx = (b * ux_e).sum(axis=1) * inv_2a
+        eyy = (c * uy_e).sum(axis=1) * inv_2a
+        gxy = ((c * ux_e).sum(axis=1) + (b * uy_e).sum(axis=1)) * inv_2a
+        factor = E / (1.0 - nu * nu)
+        sxx_h = factor * (exx + nu * eyy)
+        syy_h = factor * (eyy + nu * exx)
+        sxy_h = factor * 0.5 * (1.0 - nu) * gxy
+
+        # 积分点按 (Q, NUME) 排列：面积坐标插值与按积分点求和都是一次矩阵乘法
+        x = bary @ xyz[index, 0].T
+        y = bary @ xyz[index, 1].T
+        ux, uy = field['displacement'](x, y)
+        sxx, syy, sxy = field['stress'](x, y)
+        du, dv = ux - bary @ ux_e.T, uy - bary @ uy_e.T
+
+        result['l2'][part] = (weights @ (du * du + dv * dv)) * area
+        result['l2_exact'][part] = (weights @ (ux * ux + uy * uy)) * area
+
+        # s^T D^-1 s = 2 W（应变能密度）
+        energy = energy_density(sxx - sxx_h, syy - syy_h, sxy - sxy_h, E, nu)
+        result['energy'][part] = 2.0 * (weights @ energy) * area * thickness
+        energy = energy_density(sxx, syy, sxy, E, nu)
+        result['energy_exact'][part] = 2.0 * (weights @ energy) * area * thickness
+    return result
+
+
+def error_norms(model, u, field, rule=DEFAULT_RULE):
+    """全部T3单元组上的误差范数
+
+    u: 节点位移 (N, 2|3)；返回 {'elements', 'l2', 'energy', 'relative_l2', 'relative_energy',
+    'l2_exact', 'energy_exact'}（相对误差以解析解的范数归一化）
+    """
+    u = np.asarray(u, dtype=float).reshape(model['numnp'], -1)
+    totals = dict.fromkeys(('l2', 'energy', 'l2_exact', 'energy_exact'), 0.0)
+    elements = 0
+    for group in model['groups']:
+        if group['type'] != stap_model.ELEMENT_T3:
+            continue
+        for name, values in element_errors(model['xyz'], group, u, field, rule).items():
+            totals[name] += float(values.sum())
+        elements += len(group['conn'])
+
+    norms = {name: float(np.sqrt(value)) for name, value in totals.items()}
+    return {
+        'elements': elements,
+        **norms,
+        'relative_l2': norms['l2'] / norms['l2_exact'] if norms['l2_exact'] > 0 else 0.0,
+        'relative_energy': norms['energy'] / norms['energy_exact'] if norms['energy_exact'] > 0 else 0.0,
+    }
+
+
+def boundary_edges(conn):
+    """逆时针T3网格的边界边 (M, 2)，按单元内的方向排列（外法线在边的右侧）"""
+    edges = np.stack([conn[:, [0, 1]], conn[:, [1, 2]], conn[:, [2, 0]]], axis=1).reshape(-1, 2)
+    keys = np.sort(edges, axis=1)
+    _, index, counts = np.unique(keys[:, 0] * (conn.max() + 1) + keys[:, 1],
+                                 return_index=True, return_counts=True)
+    return edges[index[counts == 1]]
+
+
+def traction_loads(xyz, conn, field, thickness=1.0):
+    """解析应力在边界上的面力 t = s n 的一致节点力，返回 {'node', 'dof', 'load'}"""
+    edges = boundary_edges(conn)
+    pa, pb = xyz[edges[:, 0] - 1, :2], xyz[edges[:, 1] - 1, :2]
+    d = pb - pa
+    length = np.hypot(d[:, 0], d[:, 1])
+    nx, ny = d[:, 1] / length, -d[:, 0] / length
+
+    # 每条边的积分点 (M, 3)
+    points = pa[:, None, :] + EDGE_POINTS[None, :, None] * d[:, None, :]
+    sxx, syy, sxy = field['stress'](points[..., 0], points[..., 1])
+    tx = sxx * nx[:, None] + sxy * ny[:, None]
+    ty = sxy * nx[:, None] + syy * ny[:, None]
+
+    # 线性形函数：端点 a 为 1 - s，端点 b 为 s
+    shape = np.column_stack([1.0 - EDGE_POINTS, EDGE_POINTS]) * EDGE_WEIGHTS[:, None]   # (3, 2)
+    scale = (thickness * length)[:, None]
+    fx = (tx @ shape) * scale
+    fy = (ty @ shape) * scale
+
+    numnp = len(xyz)
+    force = np.column_stack([np.bincount(edges.ravel() - 1, weights=f.ravel(), minlength=numnp)
+                             for f in (fx, fy)])
+    node, dof = np.nonzero(force)
+    return {'node': node + 1, 'dof': dof + 1, 'load': force[node, dof]}
+
+
+def exact_field(name):
+    """收敛性分析算例的解析场（未约束刚体位移）"""
+    config = SOLUTIONS[name]
+    E, nu, t = config['material']
+    if name == 'timoshenko':
+        corners = np.asarray(config['corners'], dtype=float)
+        length = corners[1, 0] - corners[0, 0]
+        height = corners[3, 1] - corners[0, 1]
+        return timoshenko_beam(length, height, config['load'], E, nu,
+                               (corners[0, 0], corners[0, 1] + 0.5 * height), t)
+    return constant_strain(config['stress'], E, nu)
+
+
+def build_model(name, nx, ny):
+    """结构化网格上的算例模型：边界上施加解析面力的一致节点力，
+    只约束左下角的 x、y 和左上角的 x（消除刚体位移，支反力为零）
+    """
+    config = SOLUTIONS[name]
+    xyz, conn = mesh_gen.structured_mesh(config['corners'], nx, ny)
+    E, nu, t = config['material']
+
+    bcode = np.zeros((len(xyz), 3), dtype=int)
+    bcode[:, 2] = 1
+    p0 = mesh_gen.node_number(nx, *mesh_gen.node_grid_index(nx, ny, 'bottom-left')) - 1
+    p1 = mesh_gen.node_number(nx, *mesh_gen.node_grid_index(nx, ny, 'top-left')) - 1
+    bcode[p0, :2] = 1
+    bcode[p1, 0] = 1
+
+    model = {
+        'title': f"T3 {name.capitalize()} - {len(conn)} Unit",
+        'numnp': len(xyz), 'numeg': 1, 'nlcase': 1, 'modex': 1,
+        'bcode': bcode, 'xyz': xyz,
+        'load_cases': [traction_loads(xyz, conn, exact_field(name), t)],
+        'groups': [{'type': stap_model.ELEMENT_T3, 'materials': np.array([[E, nu, t]]),
+                    'conn': conn, 'mset': np.ones(len(conn), dtype=np.int64)}],
+    }
+    return model
+
+
+def fit_rates(h, errors, exact):
+    """误差的收敛阶 (p, R^2)；误差已在舍入量级（如分片试验）时返回 (None, None)"""
+    h, errors = np.asarray(h), np.asarray(errors)
+    usable = errors > 1e-10 * exact
+    if usable.sum() < 2:
+        return None, None
+    rate, _, r_squared = fit_rate(h[usable], errors[usable])
+    return rate, r_squared
+
+
+def run_study(name='timoshenko', levels=6, base=(2, 2), rule=DEFAULT_RULE):
+    """逐级加密的收敛性分析，返回各级的误差范数与拟合的收敛阶"""
+    corners = SOLUTIONS[name]['corners']
+    records = []
+    for level, (nx, ny) in enumerate(level_sizes(levels, base)):
+        model = build_model(name, nx, ny)
+
+        t0 = time.perf_counter()
+        operator, solutions = direct_solution(model)
+        u = stap_model.nodal_displacements(operator.eqn, solutions[0])
+        t1 = time.perf_counter()
+        field = fit_rigid_motion(exact_field(name), model['xyz'], u)
+        norms = error_norms(model, u, field, rule)
+        t2 = time.perf_counter()
+
+        records.append(dict(norms, level=level, nx=nx, ny=ny, dofs=operator.neq,
+                            h=characteristic_size(corners, nx, ny),
+                            solve_time=t1 - t0, integrate_time=t2 - t1))
+
+    # 相邻两级之间的收敛阶，粗网格处于渐近区之外时可看出拟合值偏低的原因
+    for previous, record in zip(records, records[1:]):
+        ratio = np.log(previous['h'] / record['h'])
+        for key in ('l2', 'energy'):
+            if record[key] > 0.0 and previous[key] > 0.0:
+                record[f'{key}_order'] = float(np.log(previous[key] / record[key]) / ratio)
+
+    h = [r['h'] for r in records]
+    l2_rate, l2_r2 = fit_rates(h, [r['l2'] for r in records], records[-1]['l2_exact'])
+    energy_rate, energy_r2 = fit_rates(h, [r['energy'] for r in records], records[-1]['energy_exact'])
+    return {'solution': name, 'rule': rule, 'l2_rate': l2_rate, 'l2_r_squared': l2_r2,
+            'energy_rate': energy_rate, 'energy_r_squared': energy_r2, 'levels': records}
+
+
+def print_study(study):
+    """打印各级误差范数与收敛阶"""
+    def order(record, key):
+        value = record.get(f'{key}_order')
+        return f"{value:.3f}" if value is not None else "-"
+
+    print("=" * 112)
+    print(f"{'Level':<6} {'Elements':<10} {'DOFs':<10} {'h':<10} {'L2 Error':<12} {'Rel.L2':<11} {'p':<7}"
+          f"{'Energy Error':<13} {'Rel.Energy':<11} {'p':<7}{'Solve(s)':<9} {'Integ.(s)':<9}")
+    print("-" * 112)
+    for r in study['levels']:
+        print(f"{r['level']:<6} {r['elements']:<10} {r['dofs']:<10} {r['h']:<10.4g} {r['l2']:<12.4e} "
+              f"{r['relative_l2']:<11.3e} {order(r, 'l2'):<7}{r['energy']:<13.4e} "
+              f"{r['relative_energy']:<11.3e} {order(r, 'energy'):<7}"
+              f"{r['solve_time']:<9.3f} {r['integrate_time']:<9.3f}")
+    print("-" * 112)
+    for label, key, expected in (('L2', 'l2', 2), ('Energy', 'energy', 1)):
+        rate = study[f'{key}_rate']
+        if rate is None:
+            print(f"{label} norm: error at round-off level on every mesh (exact solution reproduced)")
+        else:
+            print(f"{label} norm convergence rate: p = {rate:.3f} "
+                  f"(R² = {study[f'{key}_r_squared']:.6f}, theoretical p = {expected})")
+
+
+def field_from_model(name, model, operator=None):
+    """由给定模型推断解析场参数
+
+    timoshenko：包围盒为梁，第一个T3单元组的1号材料，第1工况 y 方向载荷之和为端部剪力；
+    patch：与外载荷相符的常应力（patch_harness.constant_stress_load）
+    """
+    group = next(g for g in model['groups'] if g['type'] == stap_model.ELEMENT_T3)
+    E, nu, t = group['materials'][0]
+    if name == 'timoshenko':
+        xyz = model['xyz']
+        (xmin, ymin), (xmax, ymax) = xyz[:, :2].min(axis=0), xyz[:, :2].max(axis=0)
+        case = model['load_cases'][0]
+        load = float(case['load'][case['dof'] == 2].sum())
+        return timoshenko_beam(xmax - xmin, ymax - ymin, load, E, nu, (xmin, 0.5 * (ymin + ymax)), t)
+
+    from pcg_solver import ElementOperator
+    from patch_harness import constant_stress_load
+
+    sigma, residual = constant_stress_load(model, operator or ElementOperator(model))
+    if residual > 1e-6:
+        print(f"Warning: the loads are not a constant-stress state (residual {residual:.2e}), "
+              f"the patch field is a least-squares fit")
+    return constant_strain(sigma, E, nu)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Displacement L2 and energy-norm errors against "
+                                                 "analytic solutions")
+    parser.add_argument('dat', nargs='?', help="input file (.dat); runs a convergence study when omitted")
+    parser.add_argument('out', nargs='?', help="result file (.out); solved here when omitted")
+    parser.add_argument('--exact', choices=sorted(SOLUTIONS), default='timoshenko',
+                        help="analytic solution (default: timoshenko)")
+    parser.add_argument('--levels', type=int, default=6, help="number of refinement levels")
+    parser.add_argument('--base', type=int, nargs=2, default=[2, 2], metavar=('NX', 'NY'),
+                        help="cells of the coarsest level (default: 2 2)")
+    parser.add_argument('--rule', type=int, choices=sorted(TRIANGLE_RULES), default=DEFAULT_RULE,
+                        help=f"Gauss points per triangle (default: {DEFAULT_RULE})")
+    parser.add_argument('--json', help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.dat is None:
+        if args.levels < 2:
+            print("Error: At least 2 levels are needed")
+            sys.exit(1)
+        result = run_study(args.exact, args.levels, tuple(args.base), args.rule)
+        print_study(result)
+    else:
+        from reactions import displacements_from_out, displacements_from_solution
+
+        model = stap_model.read_dat(args.dat)
+        if model is None:
+            sys.exit(1)
+        if args.out and not os.path.exists(args.out):
+            print(f"Error: File {args.out} not found!")
+            sys.exit(1)
+        U = displacements_from_out(args.out, model['numnp']) if args.out else displacements_from_solution(model)
+        u = U[:, 0].reshape(-1, stap_model.NDF)
+
+        field = fit_rigid_motion(field_from_model(args.exact, model), model['xyz'], u)
+        t0 = time.perf_counter()
+        result = error_norms(model, u, field, args.rule)
+        elapsed = time.perf_counter() - t0
+
+        print(f"Title: {model['title']}")
+        print(f"Analytic solution: {args.exact} ({result['elements']} T3 elements, "
+              f"{args.rule}-point rule, {elapsed:.3f} s)")
+        print(f"  L2 error:     {result['l2']:.6e}  (relative {result['relative_l2']:.4e})")
+        print(f"  Energy error: {result['energy']:.6e}  (relative {result['relative_energy']:.4e})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"✓ Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
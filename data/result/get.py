@@ -2,15 +2,21 @@
 """
 STAPpp Output File Parser
 解析STAPpp输出文件，提取几何、载荷、位移和应力信息
-Usage: python3 get.py xxx.out
+--profile 按 parse_* 等函数调用分阶段计时，--profile-memory 另统计峰值内存（计时因此偏高），
+--cprofile 另存 cProfile 与折叠栈
+Usage: python3 get.py xxx.out [--profile | --profile-memory | --cprofile]
 """
 
 import sys
 import os
 import re
 import json
+import argparse
 import numpy as np
 
+import derived_fields
+import profiling
+
 def parse_stappp_output(filepath):
     """解析STAPpp输出文件"""
     
@@ -139,14 +145,17 @@ def parse_element_data(content):
                                content, re.DOTALL)
     
     if element_section:
-        element_lines = element_section.group(1).strip().split('\n')
-        for line in element_lines:
-            line = line.strip()
+        element_lines = element_section.group(1).split('\n')
+        for raw_line in element_lines:
+            line = raw_line.strip()
             if not line or 'ELEMENT' in line or 'NUMBER' in line:
                 continue
             
             # 解析单元行: ELEMENT_ID NODE_I NODE_J NODE_K MATERIAL_SET
             parts = line.split()
+            # COutputter 中单元号列宽9、节点I列宽5，节点号达到5位时两列之间没有空格
+            if len(parts) == 4 and len(raw_line) > 9:
+                parts = [raw_line[:9]] + raw_line[9:].split()
             if len(parts) >= 5:
                 try:
                     elem_id = int(parts[0])
@@ -305,35 +314,49 @@ def generate_summary(data, summary_path):
         f.write("\nDISPLACEMENT RESULTS:\n")
         f.write("-"*40 + "\n")
         f.write(f"{'Node':<4} {'UX(mm)':<12} {'UY(mm)':<12} {'UZ(mm)':<12} {'Mag(mm)':<12}\n")
-        for node_id, disp in sorted(data['displacements'].items(), key=lambda x: int(x[0])):
-            ux_mm = disp['ux'] * 1000
-            uy_mm = disp['uy'] * 1000
-            uz_mm = disp['uz'] * 1000
-            mag_mm = np.sqrt(ux_mm**2 + uy_mm**2 + uz_mm**2)
-            f.write(f"{node_id:<4} {ux_mm:<12.3f} {uy_mm:<12.3f} {uz_mm:<12.3f} {mag_mm:<12.3f}\n")
+        disp_items = sorted(data['displacements'].items(), key=lambda x: int(x[0]))
+        u_mm = np.array([[d['ux'], d['uy'], d['uz']] for _, d in disp_items]).reshape(-1, 3) * 1000
+        mag_mm = derived_fields.displacement_magnitude(u_mm)
+        for (node_id, _), (ux_mm, uy_mm, uz_mm), mag in zip(disp_items, u_mm, mag_mm):
+            f.write(f"{node_id:<4} {ux_mm:<12.3f} {uy_mm:<12.3f} {uz_mm:<12.3f} {mag:<12.3f}\n")
         
         f.write("\nSTRESS RESULTS:\n")
         f.write("-"*40 + "\n")
         f.write(f"{'Elem':<4} {'SXX(Pa)':<12} {'SYY(Pa)':<12} {'SXY(Pa)':<12} {'Mises(Pa)':<12}\n")
-        for elem_id, stress in sorted(data['stresses'].items(), key=lambda x: int(x[0])):
-            sxx, syy, sxy = stress['sxx'], stress['syy'], stress['sxy']
-            mises = np.sqrt(sxx**2 + syy**2 - sxx*syy + 3*sxy**2)
-            f.write(f"{elem_id:<4} {sxx:<12.2f} {syy:<12.2f} {sxy:<12.2f} {mises:<12.2f}\n")
+        stress_items = sorted(data['stresses'].items(), key=lambda x: int(x[0]))
+        stress = np.array([[s['sxx'], s['syy'], s['sxy']] for _, s in stress_items]).reshape(-1, 3)
+        mises = derived_fields.von_mises(*stress.T)
+        for (elem_id, _), (sxx, syy, sxy), vm in zip(stress_items, stress, mises):
+            f.write(f"{elem_id:<4} {sxx:<12.2f} {syy:<12.2f} {sxy:<12.2f} {vm:<12.2f}\n")
     
     print(f"✓ Summary saved to: {summary_path}")
 
 def main():
     """主函数"""
-    if len(sys.argv) != 2:
-        print("Usage: python3 get.py xxx.out")
-        sys.exit(1)
-    
-    input_file = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Parse a STAPpp output file into JSON")
+    parser.add_argument('input_file', help="STAPpp output file (.out)")
+    parser.add_argument('--profile', action='store_true',
+                        help="record wall/CPU time of every parse_* stage into xxx_profile.json")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="like --profile, plus the tracemalloc peak of every stage "
+                             "(tracemalloc slows parsing several times, so times are inflated)")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="like --profile, plus a cProfile dump (xxx_profile.prof) and its "
+                             "collapsed stacks for flame graphs (xxx_profile.collapsed)")
+    args = parser.parse_args()
+    
+    input_file = args.input_file
     
     if not input_file.endswith('.out'):
         print("Error: Input file must be a .out file")
         sys.exit(1)
     
+    profiler = None
+    if args.profile or args.profile_memory or args.cprofile:
+        profiler = profiling.StageProfiler(memory=args.profile_memory, cprofile=args.cprofile)
+        profiler.instrument(sys.modules[__name__], 'parse_*', 'save_parsed_data', 'generate_summary')
+        profiler.start()
+    
     print(f"Parsing STAPpp output file: {input_file}")
     print("="*50)
     
@@ -354,6 +377,12 @@ def main():
     print(f"Elements: {len(parsed_data['elements'])}")
     print(f"Loads: {len(parsed_data['loads'])}")
     print("="*50)
+    
+    if profiler is not None:
+        profiler.stop()
+        print(profiler.report())
+        for path in profiler.save(os.path.splitext(input_file)[0] + "_profile"):
+            print(f"✓ Profile saved to: {path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+STAPpp Hot-Spot Query
+在一个或多个结果目录（例如 sweep.py 的输出）中查找各载荷工况位移最大的 k 个节点
+和应力最大的 k 个单元：
+- .out 按列一次读成一个数组（全部工况与单元组），并以 .npz 缓存在结果目录的 .columns/ 下，
+  文件大小或修改时间改变时重新读取
+- 每个文件在工作进程中用 argpartition 取前 k 个，再在全部文件上合并出总体的前 k 个
+Usage: python3 hotspots.py DIR|xxx.out ... [-k 10] [--field von_mises] [--per-file] [-j WORKERS]
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import stap_model
+import derived_fields
+
+# 缓存格式版本：读取方式改变时递增，使旧缓存失效
+CACHE_VERSION = 1
+CACHE_DIR = ".columns"
+
+# read_columns 中数据块的种类
+BLOCK_DISPLACEMENT = 0
+BLOCK_STRESS = 1
+
+
+def t3_field(name, absolute=False):
+    """T3 单元字段的排序值（分量按绝对值）"""
+    def rank(element_type, stress):
+        if element_type != stap_model.ELEMENT_T3:
+            return None
+        values = derived_fields.stress_fields(stress)[name]
+        return np.abs(values) if absolute else values
+    return rank
+
+
+# 单元应力场：名称 -> 由 (单元类型, 应力数组) 计算排序值的函数，不适用于该单元类型时返回 None
+# T3 应力列为 Sxx, Syy, Sxy（派生量由 derived_fields 计算）；Bar 为 轴力, 轴向应力
+ELEMENT_FIELDS = {
+    'von_mises': lambda t, s: (derived_fields.von_mises(*s.T) if t == stap_model.ELEMENT_T3
+                               else np.abs(s[:, 1])),
+    'sxx': t3_field('sxx', absolute=True),
+    'syy': t3_field('syy', absolute=True),
+    'sxy': t3_field('sxy', absolute=True),
+    's1': t3_field('s1'),
+    'max_shear': t3_field('max_shear'),
+    'axial': lambda t, s: np.abs(s[:, 1]) if t == stap_model.ELEMENT_BAR else None,
+}
+
+LOAD_CASE_RE = re.compile(r'^ LOAD CASE\s*(\d+)\s*$', re.M)
+DISPLACEMENT_RE = re.compile(r'D I S P L A C E M E N T S\s*\n\s*\n[^\n]*Z-DISPLACEMENT[^\n]*\n(.*?)\n\s*\n',
+                             re.S)
+STRESS_RE = re.compile(r'E L E M E N T  G R O U P\s*(\d+)\s*\n\s*\n([^\n]*)\n\s*NUMBER\s*\n(.*?)\n\s*\n',
+                       re.S)
+
+
+def number_block(text, columns):
+    """空白分隔的数值块 -> (行数, columns) 数组"""
+    values = np.array(text.split(), dtype=float)
+    return values.reshape(-1, columns)
+
+
+def read_columns(out_path):
+    """读取.out中全部载荷工况的位移与各单元组应力，按列放在一个数组中
+
+    返回 (layout, data)：data 为 (R, 4) 的 [编号, 值1, 值2, 值3]（位移为 ux, uy, uz；
+    T3 为 Sxx, Syy, Sxy；Bar 为 轴力, 轴向应力, 0），layout 每行
+    [种类(BLOCK_DISPLACEMENT/BLOCK_STRESS), 工况, 单元组, 单元类型, 起始行, 结束行]
+    """
+    with open(out_path, 'r') as f:
+        content = f.read()
+
+    starts = [m.start() for m in LOAD_CASE_RE.finditer(content)] + [len(content)]
+    layout = []
+    blocks = []
+    rows = 0
+    for lcase, (start, end) in enumerate(zip(starts[:-1], starts[1:]), start=1):
+        section = content[start:end]
+        found = []
+        disp = DISPLACEMENT_RE.search(section)
+        if disp:
+            found.append((BLOCK_DISPLACEMENT, 0, 0, number_block(disp.group(1), 4)))
+        for m in STRESS_RE.finditer(section):
+            if 'FORCE' in m.group(2):
+                block = np.pad(number_block(m.group(3), 3), ((0, 0), (0, 1)))
+                found.append((BLOCK_STRESS, int(m.group(1)), stap_model.ELEMENT_BAR, block))
+            else:
+                found.append((BLOCK_STRESS, int(m.group(1)), stap_model.ELEMENT_T3,
+                              number_block(m.group(3), 4)))
+        for kind, group, element_type, block in found:
+            layout.append([kind, lcase, group, element_type, rows, rows + len(block)])
+            blocks.append(block)
+            rows += len(block)
+
+    data = np.concatenate(blocks) if blocks else np.empty((0, 4))
+    return np.array(layout, dtype=np.int64).reshape(-1, 6), data
+
+
+def cached_columns(out_path):
+    """read_columns 的结果，缓存在 .columns/ 下的 .npz 中；layout 首行记录
+    (版本, 文件大小, 修改时间)，与文件不符时重新读取"""
+    stat = os.stat(out_path)
+    stamp = np.array([[CACHE_VERSION, stat.st_size, stat.st_mtime_ns, 0, 0, 0]], dtype=np.int64)
+    directory, name = os.path.split(os.path.abspath(out_path))
+    cache_path = os.path.join(directory, CACHE_DIR, name + ".npz")
+
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            layout = cached['layout']
+            if np.array_equal(layout[:1], stamp):
+                return layout[1:], cached['data']
+
+    layout, data = read_columns(out_path)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        np.savez(cache_path, layout=np.concatenate([stamp, layout]), data=data)
+    except OSError:
+        pass   # 结果目录只读时不缓存
+    return layout, data
+
+
+def top_k(values, k):
+    """values 中最大的 k 个的下标（按值从大到小）：argpartition 后只对 k 个排序"""
+    if len(values) > k:
+        index = np.argpartition(values, len(values) - k)[-k:]
+    else:
+        index = np.arange(len(values))
+    return index[np.argsort(values[index])[::-1]]
+
+
+def file_hotspots(out_path, k=10, field='von_mises'):
+    """工作进程：一个.out中各载荷工况的前 k 个节点（位移模）与前 k 个单元（field）
+
+    返回 [{'load_case', 'nodes': [(节点号, 位移模, ux, uy, uz)], 'elements': [(组号, 单元号, 值)]}]
+    """
+    layout, data = cached_columns(out_path)
+    result = []
+    for lcase in np.unique(layout[:, 1]):
+        case = layout[layout[:, 1] == lcase]
+        nodes = []
+        for _, _, _, _, start, stop in case[case[:, 0] == BLOCK_DISPLACEMENT]:
+            u = data[start:stop, 1:]
+            magnitude = np.sqrt(np.einsum('ij,ij->i', u, u))
+            index = top_k(magnitude, k)
+            nodes = [(int(n), float(m), *map(float, d))
+                     for n, m, d in zip(data[start + index, 0], magnitude[index], u[index])]
+
+        # 各单元组的候选合并后再取前 k 个
+        candidates = []
+        for _, _, group, element_type, start, stop in case[case[:, 0] == BLOCK_STRESS]:
+            value = ELEMENT_FIELDS[field](element_type, data[start:stop, 1:])
+            if value is None:
+                continue
+            index = top_k(value, k)
+            candidates += [(int(group), int(e), float(v))
+                           for e, v in zip(data[start + index, 0], value[index])]
+        elements = [candidates[i] for i in top_k(np.array([c[2] for c in candidates]), k)]
+        result.append({'load_case': int(lcase), 'nodes': nodes, 'elements': elements})
+    return result
+
+
+def result_files(paths):
+    """命令行中的目录与文件 -> .out 文件列表（目录中按文件名排序）"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.endswith('.out'))
+        else:
+            files.append(path)
+    return files
+
+
+def sweep_parameters(files):
+    """sweep.py 写出的 sweep_manifest.json 中各结果文件的参数（没有清单时为空）"""
+    parameters = {}
+    for directory in {os.path.dirname(os.path.abspath(f)) for f in files}:
+        manifest_path = os.path.join(directory, "sweep_manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                for record in json.load(f).get('variants', []):
+                    parameters[os.path.abspath(record['output'])] = record['parameters']
+    return parameters
+
+
+def query(files, k=10, field='von_mises', workers=None):
+    """在全部文件上并行查询，返回 {文件: 各工况的前 k 个} 与全部文件合并后的总体前 k 个"""
+    if workers == 1 or len(files) < 2:
+        per_file = [file_hotspots(path, k, field) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_file = list(pool.map(file_hotspots, files, [k] * len(files), [field] * len(files),
+                                     chunksize=max(1, len(files) // (4 * (workers or os.cpu_count())))))
+
+    # 总体前 k 个：(值, 文件, 工况, 编号...) 各文件的候选已按 k 截断，合并量只有 k x 文件数 x 工况数
+    nodes = [(n[1], path, case['load_case'], n) for path, cases in zip(files, per_file)
+             for case in cases for n in case['nodes']]
+    elements = [(e[2], path, case['load_case'], e) for path, cases in zip(files, per_file)
+                for case in cases for e in case['elements']]
+    overall = {
+        'nodes': [nodes[i] for i in top_k(np.array([n[0] for n in nodes]), k)] if nodes else [],
+        'elements': [elements[i] for i in top_k(np.array([e[0] for e in elements]), k)]
+                    if elements else [],
+    }
+    return dict(zip(files, per_file)), overall
+
+
+def describe(path, parameters):
+    """结果文件名（有扫描参数时附上参数）"""
+    params = parameters.get(os.path.abspath(path))
+    name = os.path.basename(path)
+    if params:
+        name += " (" + ", ".join(f"{key}={value:g}" for key, value in params.items()) + ")"
+    return name
+
+
+def print_overall(overall, field, parameters):
+    """打印全部文件中的总体前 k 个"""
+    print("\nLargest displacement magnitude:")
+    print(f"{'Rank':<5} {'|u|':<14} {'Node':<8} {'LC':<4} File")
+    for rank, (value, path, lcase, node) in enumerate(overall['nodes'], start=1):
+        print(f"{rank:<5} {value:<14.5e} {node[0]:<8} {lcase:<4} {describe(path, parameters)}")
+
+    print(f"\nLargest {field}:")
+    print(f"{'Rank':<5} {field:<14} {'Group':<6} {'Element':<8} {'LC':<4} File")
+    for rank, (value, path, lcase, element) in enumerate(overall['elements'], start=1):
+        print(f"{rank:<5} {value:<14.5e} {element[0]:<6} {element[1]:<8} {lcase:<4} "
+              f"{describe(path, parameters)}")
+
+
+def print_per_file(per_file, field):
+    """逐文件、逐工况打印前 k 个"""
+    for path, cases in per_file.items():
+        for case in cases:
+            print(f"\n{os.path.basename(path)}  LOAD CASE {case['load_case']}")
+            print("  " + ", ".join(f"node {n[0]}: {n[1]:.4e}" for n in case['nodes']))
+            print("  " + ", ".join(f"G{e[0]} E{e[1]}: {e[2]:.4e}" for e in case['elements']))
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Top-k displacement and stress hot spots "
+                                                 "across STAPpp result files")
+    parser.add_argument('paths', nargs='+', help=".out files or directories of them")
+    parser.add_argument('-k', type=int, default=10, help="number of hot spots (default: 10)")
+    parser.add_argument('--field', choices=sorted(ELEMENT_FIELDS), default='von_mises',
+                        help="element field to rank (components by absolute value, default: von_mises)")
+    parser.add_argument('--per-file', action='store_true', help="also list the hot spots of every file")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--json', help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    files = result_files(args.paths)
+    missing = [path for path in files if not os.path.exists(path)]
+    if missing or not files:
+        print("Error: No result files found" if not files else f"Error: File {missing[0]} not found!")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    per_file, overall = query(files, args.k, args.field, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    parameters = sweep_parameters(files)
+    if args.per_file:
+        print_per_file(per_file, args.field)
+    print_overall(overall, args.field, parameters)
+    print(f"\n✓ {len(files)} files queried in {elapsed:.3f} s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'field': args.field, 'k': args.k, 'files': per_file,
+                       'overall': {kind: [{'value': v, 'file': p, 'load_case': lc, 'item': item}
+                                          for v, p, lc, item in items]
+                                   for kind, items in overall.items()}},
+                      f, indent=2, ensure_ascii=False)
+        print(f"✓ Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
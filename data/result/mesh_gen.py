@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+STAPpp Structured Mesh Generator
+生成任意加密程度的结构化T3网格（矩形、悬臂梁、Cook膜），按行分块流式写出.dat文件，
+不在内存中保存整份文本，可用于生成 10^7 单元量级的规模测试算例
+节点按行编号（x方向优先），每个四边形单元沿 1-3 对角线剖分为两个T3，逐单元格交替写出；
+cantilever --nx 2 --ny 2 与 data/convergence_tests/cantilever_8.dat 逐行相同（行尾空白除外），
+cantilever_2/32.dat 的数字写法与单元顺序不同（32 每行先写全部下三角），解析后是同一模型
+Usage: python3 mesh_gen.py cantilever --nx 64 --ny 32 -o cantilever_2048.dat
+       python3 mesh_gen.py cook --nx 32 --ny 32 --edge-load right:2:1.0
+"""
+
+import sys
+import argparse
+import numpy as np
+
+from out_writer import write_rows, CHUNK_ROWS
+
+# 预设几何：四个角点按逆时针顺序 (左下, 右下, 右上, 左上)
+PRESETS = {
+    'rectangle': {'corners': [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)],
+                  'clamp': ['left'], 'material': (1.0, 0.3, 1.0)},
+    # 与 cantilever_*.dat 相同：4 x 2，左端固支，右上角 -100
+    'cantilever': {'name': 'Cantilever Beam',
+                   'corners': [(0.0, 0.0), (4.0, 0.0), (4.0, 2.0), (0.0, 2.0)],
+                   'clamp': ['left'], 'material': (100.0, 0.3, 1.0),
+                   'point_loads': [('top-right', 2, -100.0)]},
+    # 与 cook_membrane.dat 相同的梯形
+    'cook': {'corners': [(0.0, 0.0), (48.0, 44.0), (48.0, 60.0), (0.0, 44.0)],
+             'clamp': ['left'], 'material': (1.0, 0.3, 1.0),
+             'edge_loads': [('right', 2, 1.0)]},
+}
+
+EDGES = ('bottom', 'right', 'top', 'left')
+
+
+def node_grid_index(nx, ny, where):
+    """命名位置（角点或边中点）对应的 (i, j) 网格坐标
+    边上单元数为奇数时没有中点节点，*-mid 取中点下方/左侧的节点（单个单元时即为角点）"""
+    positions = {
+        'bottom-left': (0, 0), 'bottom-right': (nx, 0),
+        'top-right': (nx, ny), 'top-left': (0, ny),
+        'bottom-mid': (nx // 2, 0), 'top-mid': (nx // 2, ny),
+        'left-mid': (0, ny // 2), 'right-mid': (nx, ny // 2),
+    }
+    if where not in positions:
+        raise ValueError(f"Unknown node location: {where}")
+    return positions[where]
+
+
+def node_number(nx, i, j):
+    """网格坐标 (i, j) 的节点号（从1开始）"""
+    return j * (nx + 1) + i + 1
+
+
+def edge_nodes(nx, ny, edge):
+    """某条边上的节点号（沿边的参数方向排列）"""
+    if edge == 'bottom':
+        return node_number(nx, np.arange(nx + 1), 0)
+    if edge == 'top':
+        return node_number(nx, np.arange(nx + 1), ny)
+    if edge == 'left':
+        return node_number(nx, 0, np.arange(ny + 1))
+    if edge == 'right':
+        return node_number(nx, nx, np.arange(ny + 1))
+    raise ValueError(f"Unknown edge: {edge}")
+
+
+def map_coordinates(corners, s, t):
+    """双线性映射：单位正方形参数 (s, t) -> 物理坐标"""
+    c = np.asarray(corners, dtype=float)
+    x = ((1 - s) * (1 - t) * c[0, 0] + s * (1 - t) * c[1, 0]
+         + s * t * c[2, 0] + (1 - s) * t * c[3, 0])
+    y = ((1 - s) * (1 - t) * c[0, 1] + s * (1 - t) * c[1, 1]
+         + s * t * c[2, 1] + (1 - s) * t * c[3, 1])
+    return x, y
+
+
+def structured_mesh(corners, nx, ny):
+    """在内存中生成与 write_structured_dat 编号相同的网格，返回 (节点坐标 (N, 3)，T3 连接 (E, 3)，从1开始)"""
+    jj, ii = np.meshgrid(np.arange(ny + 1), np.arange(nx + 1), indexing='ij')
+    x, y = map_coordinates(corners, ii / nx, jj / ny)
+    xyz = np.column_stack([x.ravel(), y.ravel(), np.zeros(x.size)])
+
+    jj, ii = np.meshgrid(np.arange(ny), np.arange(nx), indexing='ij')
+    n1 = node_number(nx, ii, jj).ravel()
+    n2 = n1 + 1
+    n3 = n2 + nx + 1
+    n4 = n1 + nx + 1
+    conn = np.stack([np.column_stack([n1, n2, n3]), np.column_stack([n1, n3, n4])], axis=1)
+    return xyz, conn.reshape(-1, 3).astype(np.int64)
+
+
+def collect_loads(nx, ny, point_loads=(), edge_loads=()):
+    """集中载荷与边载荷（按一致节点力分配到边上节点），返回 (node, dof, load) 数组"""
+    nodes, dofs, loads = [], [], []
+
+    for where, dof, value in point_loads:
+        i, j = node_grid_index(nx, ny, where)
+        nodes.append([node_number(nx, i, j)])
+        dofs.append([dof])
+        loads.append([value])
+
+    for edge, dof, total in edge_loads:
+        ids = edge_nodes(nx, ny, edge)
+        n = len(ids) - 1
+        # 直边上等分的线性单元：两端节点各分一半段长
+        weights = np.full(n + 1, 1.0 / n)
+        weights[[0, -1]] *= 0.5
+        nodes.append(ids)
+        dofs.append(np.full(n + 1, dof))
+        loads.append(total * weights)
+
+    if not nodes:
+        return np.zeros(0, int), np.zeros(0, int), np.zeros(0)
+    return (np.concatenate(nodes).astype(int), np.concatenate(dofs).astype(int),
+            np.concatenate(loads).astype(float))
+
+
+def write_structured_dat(path, corners, nx, ny, material=(1.0, 0.3, 1.0), clamp=('left',),
+                         point_loads=(), edge_loads=(), title=None):
+    """流式写出结构化T3网格的.dat文件，返回 (节点数, 单元数)"""
+    numnp = (nx + 1) * (ny + 1)
+    nume = 2 * nx * ny
+    load_node, load_dof, load_value = collect_loads(nx, ny, point_loads, edge_loads)
+
+    if title is None:
+        title = f"T3 Structured Mesh - {nume} Unit"
+
+    with open(path, 'w') as f:
+        f.write(f"{title}\n")
+        f.write(f"{numnp} 1 1 1\n")
+
+        # 节点：按若干行一块生成坐标
+        rows_per_chunk = max(1, CHUNK_ROWS // (nx + 1))
+        i = np.arange(nx + 1)
+        for j0 in range(0, ny + 1, rows_per_chunk):
+            j = np.arange(j0, min(j0 + rows_per_chunk, ny + 1))
+            jj, ii = np.meshgrid(j, i, indexing='ij')
+            x, y = map_coordinates(corners, ii / nx, jj / ny)
+
+            fixed = np.zeros(ii.shape, dtype=bool)
+            if 'left' in clamp:
+                fixed |= ii == 0
+            if 'right' in clamp:
+                fixed |= ii == nx
+            if 'bottom' in clamp:
+                fixed |= jj == 0
+            if 'top' in clamp:
+                fixed |= jj == ny
+            bc = fixed.astype(int).ravel()
+
+            # 坐标与载荷按 repr 写出（0.0、2.0、-100.0），与手写算例的写法一致且可精确回读
+            write_rows(f, "%d %d %d 1 %r %r 0.0\n",
+                       [node_number(nx, ii, jj).ravel(), bc, bc, x.ravel(), y.ravel()])
+
+        # 载荷工况
+        f.write("1\n")
+        f.write(f"{len(load_node)}\n")
+        write_rows(f, "%d %d %r\n", [load_node, load_dof, load_value])
+
+        # 单元组：T3、一个材料组
+        E, nu, t = material
+        f.write(f"3 {nume} 1\n")
+        f.write(f"1 {E:.15g} {nu:.15g} {t:.15g}\n")
+
+        rows_per_chunk = max(1, CHUNK_ROWS // (2 * nx))
+        i = np.arange(nx)
+        for j0 in range(0, ny, rows_per_chunk):
+            j = np.arange(j0, min(j0 + rows_per_chunk, ny))
+            jj, ii = np.meshgrid(j, i, indexing='ij')
+            n1 = node_number(nx, ii, jj).ravel()
+            n2 = n1 + 1
+            n3 = n2 + nx + 1
+            n4 = n1 + nx + 1
+            first = 2 * (jj * nx + ii).ravel() + 1
+
+            # 每个单元格的两个三角形交替写出：(n1, n2, n3), (n1, n3, n4)
+            ids = np.column_stack([first, first + 1]).ravel()
+            a = np.repeat(n1, 2)
+            b = np.column_stack([n2, n3]).ravel()
+            c = np.column_stack([n3, n4]).ravel()
+            write_rows(f, "%d %d %d %d 1\n", [ids, a, b, c])
+
+    return numnp, nume
+
+
+def write_dat(path, model):
+    """按 stap_model.read_dat 的模型字典写出任意（非结构化）网格的.dat文件"""
+    with open(path, 'w') as f:
+        f.write(f"{model['title']}\n")
+        f.write(f"{model['numnp']} {len(model['groups'])} {len(model['load_cases'])} {model['modex']}\n")
+
+        bcode, xyz = model['bcode'], model['xyz']
+        write_rows(f, "%d %d %d %d %.15g %.15g %.15g\n",
+                   [np.arange(1, len(xyz) + 1), bcode[:, 0], bcode[:, 1], bcode[:, 2],
+                    xyz[:, 0], xyz[:, 1], xyz[:, 2]])
+
+        for lcase, load_data in enumerate(model['load_cases'], start=1):
+            f.write(f"{lcase}\n{len(load_data['node'])}\n")
+            write_rows(f, "%d %d %.15g\n", [load_data['node'], load_data['dof'], load_data['load']])
+
+        for group in model['groups']:
+            materials, conn = group['materials'], group['conn']
+            f.write(f"{group['type']} {len(conn)} {len(materials)}\n")
+            write_rows(f, "%d" + " %.15g" * materials.shape[1] + "\n",
+                       [np.arange(1, len(materials) + 1)] + list(materials.T))
+            write_rows(f, "%d" + " %d" * conn.shape[1] + " %d\n",
+                       [np.arange(1, len(conn) + 1)] + list(conn.T) + [group['mset']])
+
+
+def parse_load(text):
+    """解析 where:dof:value"""
+    where, dof, value = text.split(':')
+    return where, int(dof), float(value)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Structured T3 mesh generator for STAPpp")
+    parser.add_argument('preset', choices=sorted(PRESETS), help="geometry preset")
+    parser.add_argument('--nx', type=int, required=True, help="cells along the first direction")
+    parser.add_argument('--ny', type=int, required=True, help="cells along the second direction")
+    parser.add_argument('-o', '--output', help="output file (default: preset_NUME.dat)")
+    parser.add_argument('--corners', type=float, nargs=8, metavar='XY',
+                        help="override corners: x0 y0 x1 y1 x2 y2 x3 y3 (counter-clockwise)")
+    parser.add_argument('--material', type=float, nargs=3, metavar=('E', 'NU', 'T'))
+    parser.add_argument('--clamp', nargs='*', choices=EDGES, help="clamped edges")
+    parser.add_argument('--point-load', type=parse_load, action='append',
+                        help="point load where:dof:value, e.g. top-right:2:-100")
+    parser.add_argument('--edge-load', type=parse_load, action='append',
+                        help="total edge load edge:dof:value, e.g. right:2:1.0")
+    parser.add_argument('--title', help="title line")
+    args = parser.parse_args()
+
+    preset = PRESETS[args.preset]
+    corners = (np.reshape(args.corners, (4, 2)).tolist() if args.corners else preset['corners'])
+    material = tuple(args.material) if args.material else preset['material']
+    clamp = args.clamp if args.clamp is not None else preset['clamp']
+    custom_loads = args.point_load is not None or args.edge_load is not None
+    point_loads = (args.point_load or []) if custom_loads else preset.get('point_loads', [])
+    edge_loads = (args.edge_load or []) if custom_loads else preset.get('edge_loads', [])
+
+    if args.nx < 1 or args.ny < 1:
+        print("Error: nx and ny must be positive")
+        sys.exit(1)
+
+    output = args.output or f"{args.preset}_{2 * args.nx * args.ny}.dat"
+    name = preset.get('name', args.preset.capitalize())
+    title = args.title or f"T3 {name} - {2 * args.nx * args.ny} Unit"
+
+    numnp, nume = write_structured_dat(output, corners, args.nx, args.ny, material, clamp,
+                                       point_loads, edge_loads, title)
+    print(f"✓ Mesh written to: {output} ({numnp} nodes, {nume} elements)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+STAPpp Output Writer
+按COutputter的格式（setw宽度、科学计数法精度）写出.out文件各部分，
+供Python求解器输出结果，使get.py等工具可以直接解析
+"""
+
+import time
+import numpy as np
+
+from stap_model import (ELEMENT_BAR, ELEMENT_T3, orient_t3, nodal_displacements,
+                        element_stress)
+
+WEEKDAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+# 每次格式化的行数，控制大模型写出时的内存占用
+CHUNK_ROWS = 100000
+
+# 各数据表的行格式（与 COutputter 的 setw 宽度、科学计数法精度一致），synth_out 共用
+NODE_ROW = "%9d%5d%5d%5d%18.5e%15.5e%15.5e\n"
+EQUATION_ROW = "%9d       %5d%5d%5d\n"
+LOAD_ROW = "%7d%13d%19.5e\n"
+BAR_MATERIAL_ROW = "%5d%16.5e%16.5e\n"
+BAR_ELEMENT_ROW = "%5d%11d%9d%12d\n"
+T3_ELEMENT_ROW = "%9d%5d%9d%9d%12d\n"
+DISPLACEMENT_ROW = "%5d        %18.5e%18.5e%18.5e\n"
+BAR_STRESS_ROW = "%5d%22.5e%18.5e\n"
+T3_STRESS_ROW = "%5d%16.5e%16.5e%16.5e\n"
+
+
+def location_row(nd):
+    """位置矩阵的行格式：单元号 + nd 个方程号"""
+    return "%9d" + "%5d" * nd + "\n"
+
+
+def write_rows(f, fmt, columns):
+    """按行格式 fmt 分块写出若干等长列（整数列与浮点列均可）"""
+    columns = [np.asarray(col) for col in columns]
+    n = len(columns[0]) if columns else 0
+    for start in range(0, n, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, n)
+        block = np.empty((stop - start, len(columns)), dtype=object)
+        for j, col in enumerate(columns):
+            block[:, j] = col[start:stop].tolist()
+        f.write((fmt * (stop - start)) % tuple(block.ravel()))
+
+
+def write_heading(f, title, when=None):
+    """标题与时间（COutputter::OutputHeading）；when 为时间戳或 time.struct_time，默认当前时间"""
+    tm = when if isinstance(when, time.struct_time) else time.localtime(when)
+    f.write(f"TITLE : {title}\n")
+    f.write(f"        ({tm.tm_hour}:{tm.tm_min}:{tm.tm_sec} on {MONTHS[tm.tm_mon - 1]} "
+            f"{tm.tm_mday}, {tm.tm_year}, {WEEKDAYS[(tm.tm_wday + 1) % 7]})\n\n")
+
+
+def write_control_info(f, numnp, numeg, nlcase, modex):
+    """控制信息与节点表头（COutputter::OutputNodeInfo 的前半部分）"""
+    f.write("C O N T R O L   I N F O R M A T I O N\n\n")
+    f.write(f"      NUMBER OF NODAL POINTS . . . . . . . . . . (NUMNP)  ={numnp:6d}\n")
+    f.write(f"      NUMBER OF ELEMENT GROUPS . . . . . . . . . (NUMEG)  ={numeg:6d}\n")
+    f.write(f"      NUMBER OF LOAD CASES . . . . . . . . . . . (NLCASE) ={nlcase:6d}\n")
+    f.write(f"      SOLUTION MODE  . . . . . . . . . . . . . . (MODEX)  ={modex:6d}\n")
+    f.write("         EQ.0, DATA CHECK\n"
+            "         EQ.1, EXECUTION\n\n")
+
+    f.write(" N O D A L   P O I N T   D A T A\n\n")
+    f.write("    NODE       BOUNDARY                         NODAL POINT\n"
+            "   NUMBER  CONDITION  CODES                     COORDINATES\n")
+
+
+def write_node_info(f, model):
+    """控制信息与节点数据（COutputter::OutputNodeInfo）"""
+    write_control_info(f, model['numnp'], model['numeg'], model['nlcase'], model['modex'])
+    bcode, xyz = model['bcode'], model['xyz']
+    write_rows(f, NODE_ROW,
+               [np.arange(1, model['numnp'] + 1), bcode[:, 0], bcode[:, 1], bcode[:, 2],
+                xyz[:, 0], xyz[:, 1], xyz[:, 2]])
+    f.write("\n")
+
+
+def write_equation_header(f):
+    """方程号表头（COutputter::OutputEquationNumber）"""
+    f.write(" EQUATION NUMBERS\n\n")
+    f.write("   NODE NUMBER   DEGREES OF FREEDOM\n")
+    f.write("        N           X    Y    Z\n")
+
+
+def write_equation_numbers(f, eqn):
+    """方程号（COutputter::OutputEquationNumber）"""
+    write_equation_header(f)
+    write_rows(f, EQUATION_ROW, [np.arange(1, len(eqn) + 1), eqn[:, 0], eqn[:, 1], eqn[:, 2]])
+    f.write("\n")
+
+
+def write_load_header(f, lcase, count):
+    """一个载荷工况的表头（COutputter::OutputLoadInfo）"""
+    f.write(" L O A D   C A S E   D A T A\n\n")
+    f.write(f"     LOAD CASE NUMBER . . . . . . . ={lcase:6d}\n")
+    f.write(f"     NUMBER OF CONCENTRATED LOADS . ={count:6d}\n\n")
+    f.write("    NODE       DIRECTION      LOAD\n"
+            "   NUMBER                   MAGNITUDE\n")
+
+
+def write_load_info(f, load_cases):
+    """载荷工况数据（COutputter::OutputLoadInfo）"""
+    for lcase, load_data in enumerate(load_cases, start=1):
+        write_load_header(f, lcase, len(load_data['node']))
+        write_rows(f, LOAD_ROW, [load_data['node'], load_data['dof'], load_data['load']])
+        f.write("\n")
+
+
+def write_group_header(f, element_type, nume):
+    """单元组定义的表头（COutputter::OutputElementInfo），Bar 的材料表由 write_bar_materials 接着写出"""
+    f.write(" E L E M E N T   D E F I N I T I O N\n\n")
+    f.write(f" ELEMENT TYPE  . . . . . . . . . . . . .( NPAR(1) ) . . ={element_type:5d}\n")
+    f.write("     EQ.1, TRUSS ELEMENTS\n"
+            "     EQ.2, ELEMENTS CURRENTLY\n"
+            "     EQ.3, T3 ELEMENTS\n"
+            "     EQ.4, NOT AVAILABLE\n\n")
+    f.write(f" NUMBER OF ELEMENTS. . . . . . . . . . .( NPAR(2) ) . . ={nume:5d}\n\n")
+    if element_type == ELEMENT_T3:
+        f.write("    T3 ELEMENT INFORMATION:\n")
+        f.write("    ELEMENT     NODE    NODE    NODE    MATERIAL\n")
+        f.write("    NUMBER      I       J       K      SET NUMBER\n")
+
+
+def write_bar_materials(f, materials):
+    """Bar 单元组的材料表与单元表头"""
+    f.write(" M A T E R I A L   D E F I N I T I O N\n\n")
+    f.write(" NUMBER OF DIFFERENT SETS OF MATERIAL\n")
+    f.write(f" AND CROSS-SECTIONAL  CONSTANTS  . . . .( NPAR(3) ) . . ={len(materials):5d}\n\n")
+    f.write("  SET       YOUNG'S     CROSS-SECTIONAL\n"
+            " NUMBER     MODULUS          AREA\n"
+            "               E              A\n")
+    write_rows(f, BAR_MATERIAL_ROW,
+               [np.arange(1, len(materials) + 1), materials[:, 0], materials[:, 1]])
+    f.write("\n\n E L E M E N T   I N F O R M A T I O N\n")
+    f.write(" ELEMENT     NODE     NODE       MATERIAL\n"
+            " NUMBER-N      I        J       SET NUMBER\n")
+
+
+def write_element_info(f, model):
+    """单元组数据（COutputter::OutputElementInfo）"""
+    f.write(" E L E M E N T   G R O U P   D A T A\n\n\n")
+
+    for group in model['groups']:
+        nume = len(group['conn'])
+        write_group_header(f, group['type'], nume)
+        if group['type'] == ELEMENT_BAR:
+            write_bar_materials(f, group['materials'])
+            conn = group['conn']
+            write_rows(f, BAR_ELEMENT_ROW, [np.arange(1, nume + 1), conn[:, 0], conn[:, 1], group['mset']])
+        elif group['type'] == ELEMENT_T3:
+            # CT3::Read 中已把顺时针单元的节点交换，输出的是交换后的顺序
+            conn = orient_t3(model['xyz'], group['conn'])
+            write_rows(f, T3_ELEMENT_ROW,
+                       [np.arange(1, nume + 1), conn[:, 0], conn[:, 1], conn[:, 2], group['mset']])
+        f.write("\n")
+
+
+def write_location_matrices(f, lms):
+    """位置矩阵（_DEBUG_ 版本的 CDomain::CalculateColumnHeights 输出，get.py 以此定位单元表结尾）"""
+    f.write("   Ele =        Location Matrix\n")
+    for lm in lms:
+        write_rows(f, location_row(lm.shape[1]),
+                   [np.arange(1, len(lm) + 1)] + [lm[:, j] for j in range(lm.shape[1])])
+    f.write("\n")
+
+
+def write_load_case_banner(f, lcase):
+    """载荷工况标记（main.cpp）"""
+    f.write(f" LOAD CASE{lcase:5d}\n\n\n")
+
+
+def write_displacement_header(f):
+    """节点位移表头（COutputter::OutputNodalDisplacement）"""
+    f.write(" D I S P L A C E M E N T S\n\n")
+    f.write("  NODE           X-DISPLACEMENT    Y-DISPLACEMENT    Z-DISPLACEMENT\n")
+
+
+def write_displacements(f, displacements):
+    """节点位移（COutputter::OutputNodalDisplacement）"""
+    write_displacement_header(f)
+    write_rows(f, DISPLACEMENT_ROW,
+               [np.arange(1, len(displacements) + 1),
+                displacements[:, 0], displacements[:, 1], displacements[:, 2]])
+    f.write("\n")
+
+
+def write_stress_header(f, group_index, element_type):
+    """单元应力表头（COutputter::OutputElementStress），group_index 从1开始"""
+    f.write(f" S T R E S S  C A L C U L A T I O N S  F O R  E L E M E N T  G R O U P{group_index:5d}\n\n")
+    if element_type == ELEMENT_BAR:
+        f.write("  ELEMENT             FORCE            STRESS\n"
+                "  NUMBER\n")
+    else:
+        f.write("  ELEMENT       STRESS_XX       STRESS_YY       STRESS_XY\n"
+                "  NUMBER\n")
+
+
+def write_stresses(f, group_index, element_type, values):
+    """单元应力（COutputter::OutputElementStress），group_index 从1开始"""
+    write_stress_header(f, group_index, element_type)
+    ids = np.arange(1, len(values) + 1)
+    if element_type == ELEMENT_BAR:
+        write_rows(f, BAR_STRESS_ROW, [ids, values[:, 0], values[:, 1]])
+    else:
+        write_rows(f, T3_STRESS_ROW, [ids, values[:, 0], values[:, 1], values[:, 2]])
+    f.write("\n")
+
+
+def write_time_log(f, time_input, time_assemble, time_solution):
+    """求解时间记录（main.cpp）"""
+    f.write("\n S O L U T I O N   T I M E   L O G   I N   S E C \n\n")
+    f.write(f"     TIME FOR INPUT PHASE = {time_input:.5e}\n")
+    f.write(f"     TIME FOR CALCULATION OF STIFFNESS MATRIX = {time_assemble - time_input:.5e}\n")
+    f.write(f"     TIME FOR FACTORIZATION AND LOAD CASE SOLUTIONS = {time_solution - time_assemble:.5e}\n\n")
+    f.write(f"     T O T A L   S O L U T I O N   T I M E = {time_solution:.5e}\n\n")
+
+
+def write_solution(out_path, model, eqn, lms, displacements, times):
+    """写出完整的.out：模型数据、位置矩阵、各工况位移与应力、时间记录
+    displacements 为各工况的求解向量 (NEQ,)，times 为 (输入, 组装, 求解) 的累计时间"""
+    with open(out_path, 'w') as f:
+        write_heading(f, model['title'])
+        write_node_info(f, model)
+        write_equation_numbers(f, eqn)
+        write_load_info(f, model['load_cases'])
+        write_element_info(f, model)
+        write_location_matrices(f, lms)
+
+        for lcase, u in enumerate(displacements, start=1):
+            write_load_case_banner(f, lcase)
+            write_displacements(f, nodal_displacements(eqn, u))
+            for index, (group, lm) in enumerate(zip(model['groups'], lms), start=1):
+                write_stresses(f, index, group['type'], element_stress(model['xyz'], group, lm, u))
+
+        write_time_log(f, *times)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+STAPpp Patch Test Harness
+对 data/patch_tests 下所有.dat算例并行求解（stap++ 或 Python 求解器，或直接使用已有的.out），
+经 get.py 解析结果后做三项检查：
+- 平衡：K u 与外载荷的相对残差（所有算例）
+- 常应力：外载荷若与某一常应力状态的一致节点力相符，各单元应力须等于该应力
+- 位移场：常应力算例的节点位移须为线性场，且其应变与 D^-1 sigma 一致
+最后输出汇总表，任一检查失败时退出码为1
+Usage: python3 patch_harness.py [DIR] [--solver stap|python|existing] [-j WORKERS]
+"""
+
+import sys
+import os
+import glob
+import shutil
+import tempfile
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import stap_model
+import get
+from pcg_solver import ElementOperator
+from convergence_study import solve_direct, DEFAULT_STAP
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "patch_tests")
+
+# 默认容差：.out 中为6位有效数字
+TOLERANCES = {'stress': 1e-4, 'displacement': 1e-4, 'residual': 1e-3}
+
+
+def constant_stress_load(model, operator):
+    """常应力状态的一致节点力 G sigma（G: NEQ x 3），按最小二乘反求与外载荷相符的常应力
+
+    返回 (sigma, 相对残差)；残差很小说明该算例是常应力分片试验
+    """
+    G = np.zeros((operator.neq + 1, 3))
+    for group, lm in zip(model['groups'], operator.lm):
+        conn = stap_model.orient_t3(model['xyz'], group['conn'])
+        b, c, area = stap_model.t3_geometry(model['xyz'], conn)
+        B = stap_model.t3_strain_matrix(b, c, area)
+        thickness = group['materials'][group['mset'] - 1, 2]
+        Bt = B.transpose(0, 2, 1) * (thickness * area)[:, None, None]   # (E, 6, 3)
+        for k in range(3):
+            G[:, k] += np.bincount(lm.ravel(), weights=Bt[:, :, k].ravel(), minlength=operator.neq + 1)
+    G = G[1:]
+
+    force = stap_model.assemble_force(model, operator.eqn, operator.neq, 1)
+    sigma = np.linalg.lstsq(G, force, rcond=None)[0]
+    norm = np.linalg.norm(force)
+    residual = np.linalg.norm(G @ sigma - force) / norm if norm > 0 else 0.0
+    return sigma, residual
+
+
+def result_arrays(parsed, numnp):
+    """get.py 的解析结果 -> 节点位移 (N, 3) 与单元应力 (E, 3)，按编号排序"""
+    displacements = np.zeros((numnp, 3))
+    for key, d in parsed['displacements'].items():
+        displacements[int(key) - 1] = [d['ux'], d['uy'], d['uz']]
+    ids = sorted(parsed['stresses'], key=int)
+    stresses = np.array([[parsed['stresses'][k][c] for c in ('sxx', 'syy', 'sxy')] for k in ids])
+    return displacements, stresses.reshape(-1, 3)
+
+
+def produce_output(dat_path, solver, stap_exe, workdir):
+    """得到算例的.out：运行 stap++ / Python 求解器，或使用已有文件"""
+    name = os.path.splitext(os.path.basename(dat_path))[0]
+    if solver == 'existing':
+        out_path = os.path.splitext(dat_path)[0] + ".out"
+        return out_path if os.path.exists(out_path) else None
+
+    local_dat = os.path.join(workdir, name + ".dat")
+    shutil.copyfile(dat_path, local_dat)
+    out_path = os.path.join(workdir, name + ".out")
+    if solver == 'stap':
+        subprocess.run([stap_exe, local_dat], cwd=workdir, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
+    else:
+        solve_direct(local_dat, out_path)
+    return out_path
+
+
+def check_case(dat_path, solver, stap_exe, tolerances):
+    """工作进程：求解并检查一个算例"""
+    name = os.path.splitext(os.path.basename(dat_path))[0]
+    record = {'case': name, 'elements': 0, 'kind': '-', 'residual': None,
+              'stress_error': None, 'displacement_error': None, 'status': 'ERROR', 'message': ''}
+
+    model = stap_model.read_dat(dat_path)
+    if model is None or any(g['type'] != stap_model.ELEMENT_T3 for g in model['groups']):
+        record['message'] = 'not a T3 deck'
+        return record
+    record['elements'] = sum(len(g['conn']) for g in model['groups'])
+
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            out_path = produce_output(dat_path, solver, stap_exe, workdir)
+        except (subprocess.SubprocessError, OSError, np.linalg.LinAlgError, RuntimeError) as e:
+            record['message'] = f"solver failed: {e}"
+            return record
+        if out_path is None or not os.path.exists(out_path):
+            record['message'] = 'no output'
+            return record
+        parsed = get.parse_stappp_output(out_path)
+
+    displacements, stresses = result_arrays(parsed, model['numnp'])
+    if len(stresses) != record['elements']:
+        record['message'] = f"{len(stresses)} stresses for {record['elements']} elements"
+        return record
+
+    operator = ElementOperator(model)
+    force = stap_model.assemble_force(model, operator.eqn, operator.neq, 1)
+    free = operator.eqn > 0
+    u = np.zeros(operator.neq)
+    u[operator.eqn[free] - 1] = displacements[free]
+
+    # 平衡残差：按 K 的量级归一化，避免小载荷放大舍入误差
+    scale = max(np.linalg.norm(force), np.abs(operator.diagonal()).max() * np.abs(u).max(), 1e-300)
+    record['residual'] = float(np.linalg.norm(operator.matvec(u) - force) / scale)
+    passed = record['residual'] <= tolerances['residual']
+
+    sigma, load_fit = constant_stress_load(model, operator)
+    if load_fit <= 1e-8:
+        record['kind'] = 'constant'
+
+        # 常应力：逐单元与 sigma 比较
+        stress_scale = max(np.abs(sigma).max(), 1e-300)
+        record['stress_error'] = float(np.abs(stresses - sigma).max() / stress_scale)
+
+        # 位移场：拟合 u = a + b x + c y，检查线性残差与应变
+        xy = model['xyz'][:, :2]
+        basis = np.column_stack([np.ones(len(xy)), xy])
+        coef, *_ = np.linalg.lstsq(basis, displacements[:, :2], rcond=None)
+        linear = np.abs(basis @ coef - displacements[:, :2]).max()
+        strain = np.array([coef[1, 0], coef[2, 1], coef[2, 0] + coef[1, 1]])
+        mat = model['groups'][0]['materials'][0]
+        expected = np.linalg.solve(stap_model.plane_stress_matrix(mat[0], mat[1]), sigma)
+        disp_scale = max(np.abs(displacements).max(), 1e-300)
+        strain_error = np.abs(strain - expected).max() / max(np.abs(expected).max(), 1e-300)
+        record['displacement_error'] = float(max(linear / disp_scale, strain_error))
+
+        passed &= record['stress_error'] <= tolerances['stress']
+        passed &= record['displacement_error'] <= tolerances['displacement']
+    else:
+        record['kind'] = 'general'
+
+    record['status'] = 'PASS' if passed else 'FAIL'
+    return record
+
+
+def run_harness(directory=DEFAULT_DIR, solver='stap', stap_exe=DEFAULT_STAP, workers=None,
+                tolerances=TOLERANCES):
+    """并行检查目录下的全部算例，返回按名称排序的记录"""
+    decks = sorted(glob.glob(os.path.join(directory, "*.dat")))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(check_case, dat, solver, stap_exe, tolerances) for dat in decks]
+        return [future.result() for future in futures]
+
+
+def print_summary(records):
+    """打印汇总表"""
+    def fmt(value):
+        return f"{value:.2e}" if value is not None else "-"
+
+    print("=" * 96)
+    print(f"{'Case':<32} {'Elem':>5} {'Load':<9} {'Residual':>10} {'Stress err':>11} "
+          f"{'Disp err':>10}  {'Status':<6}")
+    print("-" * 96)
+    for r in records:
+        print(f"{r['case']:<32} {r['elements']:>5} {r['kind']:<9} {fmt(r['residual']):>10} "
+              f"{fmt(r['stress_error']):>11} {fmt(r['displacement_error']):>10}  {r['status']:<6}"
+              + (f" {r['message']}" if r['message'] else ""))
+    print("-" * 96)
+    passed = sum(r['status'] == 'PASS' for r in records)
+    print(f"{passed}/{len(records)} cases passed "
+          f"({sum(r['kind'] == 'constant' for r in records)} constant-stress patches)")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Run and check every T3 patch test deck")
+    parser.add_argument('directory', nargs='?', default=DEFAULT_DIR, help="directory of .dat decks")
+    parser.add_argument('--solver', choices=['stap', 'python', 'existing'], default='stap',
+                        help="run stap++, the Python solver, or check the .out files already present")
+    parser.add_argument('--stap', default=DEFAULT_STAP, help="path of the stap++ executable")
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--stress-tol', type=float, default=TOLERANCES['stress'])
+    parser.add_argument('--disp-tol', type=float, default=TOLERANCES['displacement'])
+    parser.add_argument('--residual-tol', type=float, default=TOLERANCES['residual'])
+    args = parser.parse_args()
+
+    tolerances = {'stress': args.stress_tol, 'displacement': args.disp_tol,
+                  'residual': args.residual_tol}
+    records = run_harness(args.directory, args.solver, args.stap, args.workers, tolerances)
+    if not records:
+        print(f"Error: No .dat files found in {args.directory}")
+        sys.exit(1)
+
+    print_summary(records)
+    if any(r['status'] != 'PASS' for r in records):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
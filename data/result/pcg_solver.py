@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+STAPpp Matrix-Free PCG Solver
+不组装总刚度矩阵的预条件共轭梯度求解器：按单元堆叠刚度矩阵做逐单元矩阵-向量乘，
+内存随单元数线性增长（Skyline存储为 NEQ x 半带宽）
+Usage: python3 pcg_solver.py xxx.dat [--precond jacobi|ic|none] [--tol 1e-10]
+                             [--maxiter N] [--log-every N]
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+import stap_model
+import out_writer
+
+
+class ElementOperator:
+    """逐单元(EBE)刚度算子: 保存堆叠的单元刚度 Ke 与位置矩阵 LM，不形成总刚"""
+
+    def __init__(self, model):
+        self.model = model
+        self.eqn, self.neq = stap_model.equation_numbers(model['bcode'])
+
+        xyz = model['xyz']
+        self.lm = [stap_model.location_matrix(xyz, group, self.eqn) for group in model['groups']]
+
+        # 单元刚度按 (ND, ND, NUME) 的转置布局连续存放，使矩阵-向量乘沿单元维向量化，
+        # self.ke 是同一块内存上 (NUME, ND, ND) 的视图
+        self.kt = [np.ascontiguousarray(stap_model.element_stiffness(xyz, group).transpose(2, 1, 0))
+                   for group in model['groups']]
+        self.ke = [kt.transpose(2, 1, 0) for kt in self.kt]
+        self.lm_t = [np.ascontiguousarray(lm.T) for lm in self.lm]
+
+    def matvec(self, u):
+        """y = K u，LM 中的0（约束自由度）映射到补零的第0个分量"""
+        u_ext = np.concatenate([[0.0], u])
+        y = np.zeros(self.neq + 1)
+        for lm_t, kt in zip(self.lm_t, self.kt):
+            ye = np.einsum('jie,je->ie', kt, u_ext[lm_t])
+            y += np.bincount(lm_t.ravel(), weights=ye.ravel(), minlength=self.neq + 1)
+        return y[1:]
+
+    def diagonal(self):
+        """总刚对角元（逐单元累加）"""
+        d = np.zeros(self.neq + 1)
+        for lm, ke in zip(self.lm, self.ke):
+            d += np.bincount(lm.ravel(), weights=np.einsum('eii->ei', ke).ravel(),
+                             minlength=self.neq + 1)
+        return d[1:]
+
+    def to_sparse(self):
+        """按非零结构组装稀疏总刚（CSC），存储量与单元数成正比"""
+        from scipy import sparse
+
+        rows, cols, vals = [], [], []
+        for lm, ke in zip(self.lm, self.ke):
+            nd = lm.shape[1]
+            r = np.repeat(lm, nd, axis=1).ravel()
+            c = np.tile(lm, (1, nd)).ravel()
+            keep = (r > 0) & (c > 0)
+            rows.append(r[keep] - 1)
+            cols.append(c[keep] - 1)
+            vals.append(ke.reshape(len(ke), -1).ravel()[keep])
+
+        K = sparse.coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                              shape=(self.neq, self.neq))
+        return K.tocsc()
+
+
+def jacobi_preconditioner(operator):
+    """Jacobi预条件: M^-1 r = r / diag(K)"""
+    inv_diag = 1.0 / operator.diagonal()
+    return lambda r: inv_diag * r
+
+
+def ic_preconditioner(operator, drop_tol=1e-4, fill_factor=10):
+    """不完全分解预条件：对稀疏总刚做带阈值的不完全分解 (scipy spilu)"""
+    from scipy.sparse.linalg import spilu
+
+    factor = spilu(operator.to_sparse(), drop_tol=drop_tol, fill_factor=fill_factor,
+                   permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0)
+    return factor.solve
+
+
+def build_preconditioner(operator, kind):
+    """按名称构造预条件算子"""
+    if kind == 'jacobi':
+        return jacobi_preconditioner(operator)
+    if kind == 'ic':
+        return ic_preconditioner(operator)
+    if kind == 'none':
+        return lambda r: r
+    raise ValueError(f"Unknown preconditioner: {kind}")
+
+
+def pcg(matvec, b, precond, tol=1e-10, maxiter=None, log_every=0):
+    """预条件共轭梯度法，收敛判据 ||r|| <= tol * ||b||，返回 (x, 迭代次数, 相对残差)"""
+    n = len(b)
+    maxiter = maxiter or 10 * n
+    x = np.zeros(n)
+
+    b_norm = np.linalg.norm(b)
+    if b_norm == 0.0:
+        return x, 0, 0.0
+
+    r = b.copy()
+    z = precond(r)
+    p = z.copy()
+    rz = r @ z
+
+    rel = 1.0
+    for it in range(1, maxiter + 1):
+        q = matvec(p)
+        alpha = rz / (p @ q)
+        x += alpha * p
+        r -= alpha * q
+
+        rel = np.linalg.norm(r) / b_norm
+        if log_every and it % log_every == 0:
+            print(f"  iter {it:8d}   |r|/|b| = {rel:.6e}")
+        if rel <= tol:
+            return x, it, rel
+
+        z = precond(r)
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+
+    print(f"Warning: PCG did not converge in {maxiter} iterations (|r|/|b| = {rel:.3e})")
+    return x, maxiter, rel
+
+
+def solve(dat_path, out_path=None, precond='jacobi', tol=1e-10, maxiter=None, log_every=0):
+    """读取.dat，逐工况PCG求解，并按COutputter格式写出.out"""
+
+    t0 = time.perf_counter()
+    model = stap_model.read_dat(dat_path)
+    if model is None:
+        return None
+    time_input = time.perf_counter() - t0
+
+    operator = ElementOperator(model)
+    apply_precond = build_preconditioner(operator, precond)
+    time_assemble = time.perf_counter() - t0
+
+    print(f"NEQ = {operator.neq}, elements = {sum(len(lm) for lm in operator.lm)}, "
+          f"preconditioner = {precond}")
+
+    if out_path is None:
+        out_path = os.path.splitext(dat_path)[0] + "_pcg.out"
+
+    with open(out_path, 'w') as f:
+        out_writer.write_heading(f, model['title'])
+        out_writer.write_node_info(f, model)
+        out_writer.write_equation_numbers(f, operator.eqn)
+        out_writer.write_load_info(f, model['load_cases'])
+        out_writer.write_element_info(f, model)
+        out_writer.write_location_matrices(f, operator.lm)
+
+        for lcase in range(1, model['nlcase'] + 1):
+            force = stap_model.assemble_force(model, operator.eqn, operator.neq, lcase)
+            u, iterations, rel = pcg(operator.matvec, force, apply_precond,
+                                     tol=tol, maxiter=maxiter, log_every=log_every)
+            print(f"Load case {lcase}: {iterations} iterations, |r|/|b| = {rel:.3e}")
+
+            out_writer.write_load_case_banner(f, lcase)
+            out_writer.write_displacements(f, stap_model.nodal_displacements(operator.eqn, u))
+            for index, (group, lm) in enumerate(zip(model['groups'], operator.lm), start=1):
+                stresses = stap_model.element_stress(model['xyz'], group, lm, u)
+                out_writer.write_stresses(f, index, group['type'], stresses)
+
+        time_solution = time.perf_counter() - t0
+        out_writer.write_time_log(f, time_input, time_assemble, time_solution)
+
+    print(f"✓ Results saved to: {out_path}")
+    return out_path
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Matrix-free PCG solver for STAPpp input files")
+    parser.add_argument('input', help="STAPpp input file (.dat)")
+    parser.add_argument('-o', '--output', help="output file (default: xxx_pcg.out)")
+    parser.add_argument('--precond', choices=['jacobi', 'ic', 'none'], default='jacobi')
+    parser.add_argument('--tol', type=float, default=1e-10, help="relative residual tolerance")
+    parser.add_argument('--maxiter', type=int, default=None)
+    parser.add_argument('--log-every', type=int, default=0,
+                        help="print the residual every N iterations (0 = off)")
+    args = parser.parse_args()
+
+    if not args.input.endswith('.dat'):
+        print("Error: Input file must be a .dat file")
+        sys.exit(1)
+
+    if solve(args.input, args.output, args.precond, args.tol, args.maxiter, args.log_every) is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
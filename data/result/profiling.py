@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+STAPpp Stage Profiling
+按阶段计量墙钟时间、CPU 时间与峰值内存（tracemalloc，numpy 数组的分配也计入）：
+- measure：计量一次调用，供 benchmark.py 等在同一口径下比较各处理阶段
+- StageProfiler：把模块中按名称选出的函数（parse_*、plot_* 等）包装为阶段，
+  嵌套调用按调用路径分别统计；默认只计时，可选统计峰值内存，也可同时用 cProfile 记录全过程，
+  并转换为 flamegraph.pl / speedscope 可读的折叠栈（collapsed stack）格式
+tracemalloc 会使纯 Python 代码慢数倍，开启内存统计时的时间只宜与同样开启时比较，
+真实耗时应取自不测内存的一次运行
+"""
+
+import os
+import json
+import time
+import fnmatch
+import inspect
+import pstats
+import cProfile
+import tracemalloc
+from functools import wraps
+from contextlib import contextmanager
+from collections import defaultdict
+
+# 折叠栈中累计时间低于此值（秒）的调用路径不再展开
+MIN_STACK_TIME = 1e-4
+
+
+def measure(function, *args, memory=False, **kwargs):
+    """调用 function(*args, **kwargs)，返回 (结果, {'wall', 'cpu', 'peak'})
+
+    memory 为真时记录调用期间相对调用开始时的峰值内存（字节），否则 peak 为 None；
+    tracemalloc 会使纯 Python 代码慢数倍，计时与测内存应分开调用
+    """
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak = tracemalloc.get_traced_memory()[1] - base if memory else None
+        if started:
+            tracemalloc.stop()
+    return result, {'wall': wall, 'cpu': cpu, 'peak': peak}
+
+
+def frame_label(func):
+    """pstats 的函数键 (文件, 行号, 函数名) -> 折叠栈中的帧名"""
+    filename, line, name = func
+    label = name if filename == '~' else f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(';', ',')
+
+
+def collapsed_stacks(stats, min_time=MIN_STACK_TIME):
+    """由 pstats 的调用图展开折叠栈 {'a;b;c': 自身时间(秒)}
+
+    cProfile 只记录调用边而不记录完整调用栈：从没有调用者的函数出发向下展开，
+    被调函数的时间按各调用边的累计时间比例分摊到各条路径上（近似）；递归调用不再展开，
+    其时间已计入路径上第一次出现的同一函数
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+    roots = [func for func, entry in stats.items() if not any(c in stats for c in entry[4])]
+
+    stacks = defaultdict(float)
+
+    def walk(func, path, labels, scale):
+        tt, ct = stats[func][2], stats[func][3]
+        if tt * scale > 0:
+            stacks[';'.join(labels)] += tt * scale
+        for child, edge_time in callees[func].items():
+            child_total = stats[child][3]
+            if child in path or child_total <= 0 or edge_time * scale < min_time:
+                continue
+            walk(child, path | {child}, labels + [frame_label(child)],
+                 scale * min(1.0, edge_time / child_total))
+
+    for root in roots:
+        if stats[root][3] >= min_time:
+            walk(root, {root}, [frame_label(root)], 1.0)
+    return dict(stacks)
+
+
+def write_collapsed(stats, path, min_time=MIN_STACK_TIME):
+    """写出折叠栈文件：每行 '帧;帧;帧 微秒数'"""
+    stacks = collapsed_stacks(stats, min_time)
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, seconds in sorted(stacks.items()):
+            micros = int(round(seconds * 1e6))
+            if micros > 0:
+                f.write(f"{stack} {micros}\n")
+
+
+class StageProfiler:
+    """按阶段统计墙钟/CPU 时间，可选 tracemalloc 峰值与 cProfile
+
+    memory 默认关闭：tracemalloc 运行时各阶段的时间会高出数倍；阶段以调用路径（'parse_stappp_output/parse_nodal_data'）为键，同一路径多次调用时
+    时间累加、峰值取最大；峰值为相对进入阶段时的增量，嵌套阶段的峰值也计入外层
+    """
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.profile = cProfile.Profile() if cprofile else None
+        self.stages = {}
+        self.total = None
+        self._stack = []
+        self._started = None
+        self._tracing = False
+        self._base = self._peak = 0
+
+    def instrument(self, module, *patterns):
+        """把 module 中名称匹配 patterns 的函数替换为阶段包装，返回被包装的函数名
+
+        模块内部按全局名调用这些函数，因此 parse_stappp_output 调用的 parse_* 也被计入
+        """
+        names = [name for name, value in vars(module).items()
+                 if inspect.isfunction(value) and value.__module__ == module.__name__
+                 and any(fnmatch.fnmatch(name, p) for p in patterns)]
+        for name in names:
+            setattr(module, name, self.wrap(getattr(module, name), name))
+        return names
+
+    def wrap(self, function, name):
+        """函数 -> 在阶段 name 中调用它的包装"""
+        profiler = self
+
+        def stage(*args, **kwargs):
+            with profiler.stage(name):
+                return function(*args, **kwargs)
+
+        # 每个包装使用独立命名的代码对象，在 cProfile 和折叠栈中显示为各自的阶段帧
+        stage.__code__ = stage.__code__.replace(co_name=f"<stage {name}>")
+        return wraps(function)(stage)
+
+    @contextmanager
+    def stage(self, name):
+        """统计一个阶段；未 start 时直接执行"""
+        if self._started is None:
+            yield
+            return
+        path = '/'.join([frame['path'] for frame in self._stack[-1:]] + [name])
+        record = self.stages.setdefault(path, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'peak': None})
+        frame = {'path': path}
+        if self.memory:
+            current, peak = self._reset_peak()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            frame.update(base=current, peak=current)
+        self._stack.append(frame)
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record['calls'] += 1
+            record['wall'] += time.perf_counter() - wall
+            record['cpu'] += time.process_time() - cpu
+            self._stack.pop()
+            if self.memory:
+                peak = max(frame['peak'], self._reset_peak()[1])
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+                record['peak'] = max(record['peak'] or 0, peak - frame['base'])
+
+    def _reset_peak(self):
+        """读出 tracemalloc 的 (当前, 峰值) 后重置峰值；全过程的峰值另行保留"""
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self._peak = max(self._peak, peak)
+        return current, peak
+
+    def start(self):
+        """开始统计（内存追踪、cProfile 与总时间）"""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._base = self._peak = tracemalloc.get_traced_memory()[0]
+        self._started = (time.perf_counter(), time.process_time())
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self):
+        """结束统计，记录总时间与总峰值"""
+        if self.profile is not None:
+            self.profile.disable()
+        wall, cpu = self._started
+        self.total = {'wall': time.perf_counter() - wall, 'cpu': time.process_time() - cpu,
+                      'peak': None}
+        if self.memory:
+            self._reset_peak()
+            self.total['peak'] = self._peak - self._base
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+        self._started = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def report(self):
+        """阶段表（按首次进入的顺序，嵌套阶段缩进）"""
+        lines = [f"{'Stage':<48}{'Calls':>7}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak (MiB)':>12}"]
+        rows = list(self.stages.items())
+        if self.total is not None:
+            rows.append(('total', dict(self.total, calls=1)))
+        for path, r in rows:
+            name = '  ' * path.count('/') + path.rsplit('/', 1)[-1]
+            peak = f"{r['peak'] / 2**20:.1f}" if r['peak'] is not None else '-'
+            lines.append(f"{name:<48}{r['calls']:>7}{r['wall']:>10.3f}{r['cpu']:>10.3f}{peak:>12}")
+        return '\n'.join(lines)
+
+    def save(self, prefix):
+        """写出 prefix.json（阶段统计），启用 cProfile 时另写 prefix.prof 与 prefix.collapsed，
+        返回写出的文件"""
+        paths = [f"{prefix}.json"]
+        with open(paths[0], 'w', encoding='utf-8') as f:
+            json.dump({'stages': [dict(stage=path, **r) for path, r in self.stages.items()],
+                       'total': self.total}, f, indent=2)
+        if self.profile is not None:
+            paths.append(f"{prefix}.prof")
+            self.profile.dump_stats(paths[-1])
+            paths.append(f"{prefix}.collapsed")
+            write_collapsed(pstats.Stats(self.profile).stats, paths[-1])
+        return paths
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+STAPpp Reactions and Equilibrium Check
+stap++ 不输出约束自由度上的支反力。本脚本用逐单元刚度（pcg_solver.ElementOperator）
+在包含约束自由度的全部自由度上计算各载荷工况的 K u（不组装总刚），然后给出：
+- 各支座节点的支反力 R = K u - F（约束自由度）
+- 外载荷与支反力的合力、对原点的合力矩（整体平衡）
+- 自由自由度上的残差范数（按 K 的量级归一化，与 patch_harness 一致）
+可作为每个结果的自动检查，任一工况超出容差时退出码为1
+Usage: python3 reactions.py xxx.dat [xxx.out] [--tol 1e-3] [--json reactions.json] [-q]
+"""
+
+import sys
+import os
+import json
+import argparse
+
+import numpy as np
+
+import stap_model
+from pcg_solver import ElementOperator
+
+# 残差与不平衡量的默认容差：.out 中的位移只有6位有效数字
+RESIDUAL_TOL = 1e-3
+
+COMPONENTS = ('X', 'Y', 'Z')
+
+
+def full_operator(model):
+    """包含约束自由度的逐单元算子：全部自由度都编方程号，第 i 个节点第 d 个自由度为 3 i + d"""
+    return ElementOperator(dict(model, bcode=np.zeros_like(model['bcode'])))
+
+
+def full_loads(model):
+    """各工况的外载荷 (NUMNP * 3, 工况数)"""
+    size = stap_model.NDF * model['numnp']
+    columns = [np.bincount((case['node'] - 1) * stap_model.NDF + case['dof'] - 1,
+                           weights=case['load'], minlength=size)
+               for case in model['load_cases']]
+    return np.column_stack(columns) if columns else np.zeros((size, 0))
+
+
+def displacements_from_out(out_path, numnp):
+    """.out 中各工况的节点位移 (NUMNP * 3, 工况数)，经 hotspots 的按列读取（带缓存）"""
+    from hotspots import cached_columns, BLOCK_DISPLACEMENT
+
+    layout, data = cached_columns(out_path)
+    columns = []
+    for _, _, _, _, start, stop in layout[layout[:, 0] == BLOCK_DISPLACEMENT]:
+        u = np.zeros((numnp, stap_model.NDF))
+        u[data[start:stop, 0].astype(np.int64) - 1] = data[start:stop, 1:]
+        columns.append(u.ravel())
+    return np.column_stack(columns)
+
+
+def displacements_from_solution(model):
+    """用稀疏直接法求解全部工况，返回 (NUMNP * 3, 工况数)"""
+    from convergence_study import direct_solution
+
+    operator, solutions = direct_solution(model)
+    return np.column_stack([stap_model.nodal_displacements(operator.eqn, u).ravel()
+                            for u in solutions])
+
+
+def equilibrium(model, U):
+    """各工况的支反力与平衡检查
+
+    U: 全部自由度上的位移 (NUMNP * 3, 工况数)
+    返回 [{'load_case', 'reactions': [(节点, Rx, Ry, Rz)], 'applied', 'reaction',
+           'force_balance', 'moment_balance', 'residual', 'imbalance'}]
+    """
+    operator = full_operator(model)
+    F = full_loads(model)
+    KU = np.column_stack([operator.matvec(U[:, lcase]) for lcase in range(U.shape[1])])
+
+    # 参与单元的自由度（T3 节点的 z 方向不参与）；其中约束的为支座自由度
+    active = np.zeros(operator.neq, dtype=bool)
+    for lm in operator.lm:
+        active[lm.ravel() - 1] = True
+    fixed = (model['bcode'].ravel() != 0) & active
+    free = (model['bcode'].ravel() == 0) & active
+    support_nodes = np.flatnonzero(fixed.reshape(-1, stap_model.NDF).any(axis=1))
+
+    xyz = model['xyz']
+    k_scale = np.abs(operator.diagonal()).max() if operator.neq else 0.0
+    records = []
+    for lcase in range(U.shape[1]):
+        f = F[:, lcase]
+        r = np.where(fixed, KU[:, lcase] - f, 0.0)   # 支反力只在支座自由度上
+        residual = np.where(free, KU[:, lcase] - f, 0.0)
+
+        scale = max(np.linalg.norm(f), k_scale * np.abs(U[:, lcase]).max(), 1e-300)
+        applied = f.reshape(-1, stap_model.NDF)
+        reaction = r.reshape(-1, stap_model.NDF)
+        total = applied + reaction
+        force_balance = total.sum(axis=0)
+        moment_balance = np.cross(xyz, total).sum(axis=0)
+        load_scale = max(np.abs(applied).sum(), np.abs(reaction).sum(), 1e-300)
+
+        records.append({
+            'load_case': lcase + 1,
+            'reactions': [(int(n) + 1, *map(float, reaction[n])) for n in support_nodes],
+            'applied': applied.sum(axis=0).tolist(),
+            'reaction': reaction.sum(axis=0).tolist(),
+            'force_balance': force_balance.tolist(),
+            'moment_balance': moment_balance.tolist(),
+            'residual': float(np.linalg.norm(residual) / scale),
+            'imbalance': float(np.abs(force_balance).max() / load_scale),
+        })
+    return records
+
+
+def print_report(title, records, tol, quiet=False):
+    """打印各工况的支反力与平衡检查，返回是否全部通过"""
+    passed = True
+    print(f"Title: {title}")
+    for record in records:
+        ok = record['residual'] <= tol and record['imbalance'] <= tol
+        passed &= ok
+        print(f"\nLOAD CASE {record['load_case']}: {'PASS' if ok else 'FAIL'}  "
+              f"residual = {record['residual']:.3e}, force imbalance = {record['imbalance']:.3e}")
+        if not quiet:
+            print(f"  {'NODE':>6} {'RX':>14} {'RY':>14} {'RZ':>14}")
+            for node, rx, ry, rz in record['reactions']:
+                print(f"  {node:>6} {rx:14.5e} {ry:14.5e} {rz:14.5e}")
+        print("  " + "  ".join(f"Sum F{c}: {a:.5e} + {r:.5e} = {b:.3e}"
+                               for c, a, r, b in zip(COMPONENTS, record['applied'], record['reaction'],
+                                                     record['force_balance'])))
+        print("  " + "  ".join(f"Sum M{c}: {m:.3e}"
+                               for c, m in zip(COMPONENTS, record['moment_balance'])))
+    return passed
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Support reactions and equilibrium check "
+                                                 "for a STAPpp result")
+    parser.add_argument('dat', help="input file (.dat)")
+    parser.add_argument('out', nargs='?', help="result file (.out); solved here when omitted")
+    parser.add_argument('--tol', type=float, default=RESIDUAL_TOL,
+                        help=f"relative residual and force imbalance tolerance (default: {RESIDUAL_TOL:g})")
+    parser.add_argument('--json', help="write the reactions and checks to this JSON file")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only print the checks")
+    args = parser.parse_args()
+
+    model = stap_model.read_dat(args.dat)
+    if model is None:
+        sys.exit(1)
+
+    if args.out:
+        if not os.path.exists(args.out):
+            print(f"Error: File {args.out} not found!")
+            sys.exit(1)
+        U = displacements_from_out(args.out, model['numnp'])
+        if U.shape[1] != model['nlcase']:
+            print(f"Error: {args.out} has {U.shape[1]} load cases, {args.dat} has {model['nlcase']}")
+            sys.exit(1)
+    else:
+        U = displacements_from_solution(model)
+
+    records = equilibrium(model, U)
+    passed = print_report(model['title'], records, args.tol, args.quiet)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'dat': args.dat, 'out': args.out, 'tol': args.tol, 'load_cases': records},
+                      f, indent=2, ensure_ascii=False)
+        print(f"\n✓ Results saved to: {args.json}")
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
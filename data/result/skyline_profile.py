@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+STAPpp Skyline Profile
+CSkylineMatrix 的NumPy向量化实现：直接由.dat的位置矩阵计算列高、对角元地址、NWK、MK、MM，
+并估算LDLT分解的浮点运算量和峰值内存，供调度器在运行stap++之前判断作业规模
+Usage: python3 skyline_profile.py xxx.dat [--json] [--max-bytes N]
+"""
+
+import sys
+import json
+import argparse
+import numpy as np
+
+import stap_model
+
+# CSkylineMatrix 中 NWK、对角元地址均为 unsigned int
+UINT_MAX = 2**32 - 1
+
+# stap++ 中每个对象的近似字节数（64位，含new[]开销），用于估算非矩阵部分的内存
+BYTES_PER_NODE = 64            # CNode: XYZ[3] + bcode[3] + NodeNumber
+BYTES_PER_ELEMENT = {
+    stap_model.ELEMENT_BAR: 112,   # CBar: vtable + nodes_ + LocationMatrix_[6]
+    stap_model.ELEMENT_T3: 208,    # CT3: 另有 a[3], b[3], c[3], thickness, area
+}
+BYTES_PER_LOAD = 16
+
+
+def column_heights(lms, neq):
+    """列高（CSkylineMatrix::CalculateColumnHeight，对所有单元一次完成）"""
+    heights = np.zeros(neq, dtype=np.int64)
+    for lm in lms:
+        lm = np.asarray(lm, dtype=np.int64)
+        active = lm > 0
+        # 每个单元中最小的非零方程号
+        first = np.where(active, lm, np.iinfo(np.int64).max).min(axis=1)
+        has_dof = active.any(axis=1)
+        lm, active, first = lm[has_dof], active[has_dof], first[has_dof]
+
+        cols = lm[active] - 1
+        h = (lm - first[:, None])[active]
+        np.maximum.at(heights, cols, h)
+    return heights
+
+
+def maximum_half_bandwidth(heights):
+    """最大半带宽 MK = max(ColumnHeights) + 1（CSkylineMatrix::CalculateMaximumHalfBandwidth）"""
+    return int(heights.max()) + 1 if len(heights) else 0
+
+
+def diagonal_address(heights):
+    """对角元地址，从1开始编号（CSkylineMatrix::CalculateDiagnoalAddress）"""
+    address = np.empty(len(heights) + 1, dtype=np.int64)
+    address[0] = 1
+    np.cumsum(heights + 1, out=address[1:])
+    address[1:] += 1
+    return address
+
+
+def factorization_flops(heights):
+    """LDLT分解的浮点运算量上界（按满列剖面计，乘加各算一次）"""
+    h = heights.astype(np.float64)
+    return float(np.sum(h * (h - 1.0) + 3.0 * h))
+
+
+def solution_flops(heights):
+    """每个载荷工况的前代、对角缩放和回代运算量"""
+    return float(4.0 * heights.sum() + len(heights))
+
+
+def profile_model(model):
+    """计算模型的Skyline剖面与规模估计，返回字典"""
+    eqn, neq = stap_model.equation_numbers(model['bcode'])
+    xyz = model['xyz']
+    lms = [stap_model.location_matrix(xyz, group, eqn) for group in model['groups']]
+
+    heights = column_heights(lms, neq)
+    address = diagonal_address(heights)
+    nwk = int(address[-1] - address[0])
+
+    skyline_bytes = 8 * nwk + 4 * neq + 4 * (neq + 1)
+    vector_bytes = 8 * neq
+    model_bytes = (BYTES_PER_NODE * model['numnp']
+                   + sum(BYTES_PER_ELEMENT[g['type']] * len(g['conn']) for g in model['groups'])
+                   + BYTES_PER_LOAD * sum(len(lc['node']) for lc in model['load_cases']))
+
+    return {
+        'title': model['title'],
+        'neq': neq,
+        'nwk': nwk,
+        'mk': maximum_half_bandwidth(heights),
+        'mm': nwk // neq if neq else 0,
+        'factorization_flops': factorization_flops(heights),
+        'solution_flops_per_load_case': solution_flops(heights),
+        'skyline_bytes': skyline_bytes,
+        'peak_bytes': skyline_bytes + vector_bytes + model_bytes,
+        # stap++ 用 unsigned int 保存 NWK 与对角元地址，超过即溢出
+        'fits_uint32': bool(address[-1] <= UINT_MAX),
+        'column_heights': heights,
+        'diagonal_address': address
+    }
+
+
+def format_bytes(n):
+    """以 KiB/MiB/GiB 显示字节数"""
+    for unit in ['B', 'KiB', 'MiB', 'GiB', 'TiB']:
+        if n < 1024 or unit == 'TiB':
+            return f"{n:.1f} {unit}"
+        n /= 1024.0
+
+
+def print_profile(profile):
+    """按 COutputter::OutputTotalSystemData 的样式打印"""
+    print(f"TITLE : {profile['title']}")
+    print()
+    print("     NUMBER OF EQUATIONS . . . . . . . . . . . . . .(NEQ) = "
+          f"{profile['neq']}")
+    print("     NUMBER OF MATRIX ELEMENTS . . . . . . . . . . .(NWK) = "
+          f"{profile['nwk']}")
+    print("     MAXIMUM HALF BANDWIDTH  . . . . . . . . . . . .(MK ) = "
+          f"{profile['mk']}")
+    print("     MEAN HALF BANDWIDTH . . . . . . . . . . . . . .(MM ) = "
+          f"{profile['mm']}")
+    print()
+    print(f"     FACTORIZATION FLOPS (upper bound) . . . . . . . . = {profile['factorization_flops']:.3e}")
+    print(f"     SOLUTION FLOPS PER LOAD CASE  . . . . . . . . . . = {profile['solution_flops_per_load_case']:.3e}")
+    print(f"     SKYLINE STORAGE . . . . . . . . . . . . . . . . . = {format_bytes(profile['skyline_bytes'])}")
+    print(f"     ESTIMATED PEAK MEMORY . . . . . . . . . . . . . . = {format_bytes(profile['peak_bytes'])}")
+    if not profile['fits_uint32']:
+        print("     *** Warning *** NWK exceeds the unsigned int range used by stap++")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Skyline profile and memory estimate for a STAPpp input file")
+    parser.add_argument('input', help="STAPpp input file (.dat)")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    parser.add_argument('--max-bytes', type=float, default=None,
+                        help="exit with status 2 if the estimated peak memory exceeds this limit")
+    args = parser.parse_args()
+
+    model = stap_model.read_dat(args.input)
+    if model is None:
+        sys.exit(1)
+
+    profile = profile_model(model)
+
+    if args.json:
+        summary = {k: v for k, v in profile.items() if not isinstance(v, np.ndarray)}
+        print(json.dumps(summary, indent=2))
+    else:
+        print_profile(profile)
+
+    too_big = args.max_bytes is not None and profile['peak_bytes'] > args.max_bytes
+    if too_big or not profile['fits_uint32']:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
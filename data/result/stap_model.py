@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+STAPpp Input Model
+读取STAPpp输入(.dat)文件，生成与CDomain一致的数组化模型（节点、方程号、载荷、单元组），
+并提供按单元堆叠的T3/Bar刚度矩阵和应力计算
+Usage: python3 stap_model.py xxx.dat
+"""
+
+import sys
+import os
+import numpy as np
+
+# 与 ElementGroup.h 中的 ElementTypes 枚举保持一致
+ELEMENT_BAR = 1
+ELEMENT_T3 = 3
+
+# 每种单元: (节点数, 每节点自由度数, 材料参数个数(含nset), 单元行参数个数(含单元号))
+ELEMENT_LAYOUT = {
+    ELEMENT_BAR: (2, 3, 3, 4),
+    ELEMENT_T3: (3, 2, 4, 5),
+}
+
+NDF = 3  # 与 CNode::NDF 一致
+
+
+def read_dat(filepath):
+    """读取.dat文件，返回数组化的模型字典"""
+
+    if not os.path.exists(filepath):
+        print(f"Error: File {filepath} not found!")
+        return None
+
+    with open(filepath, 'r') as f:
+        title = f.readline().strip()
+        # 其余部分是纯数字的记号流（与 ifstream >> 的读法一致），一次性交给numpy解析
+        tokens = np.fromstring(f.read(), sep=' ')
+
+    pos = 0
+
+    def take(count):
+        nonlocal pos
+        block = tokens[pos:pos + count]
+        if len(block) != count:
+            raise ValueError(f"Unexpected end of file in {filepath}")
+        pos += count
+        return block
+
+    numnp, numeg, nlcase, modex = take(4).astype(int)
+
+    # 节点数据: NODE BC_X BC_Y BC_Z X Y Z
+    node_block = take(7 * numnp).reshape(numnp, 7)
+    node_ids = node_block[:, 0].astype(int)
+    if not np.array_equal(node_ids, np.arange(1, numnp + 1)):
+        raise ValueError("Nodes must be inputted in order !")
+
+    # 载荷工况: LL NL, 然后 NL 行 NODE DIRECTION LOAD
+    load_cases = []
+    for lcase in range(nlcase):
+        ll, nl = take(2).astype(int)
+        if ll != lcase + 1:
+            raise ValueError("Load case must be inputted in order !")
+        load_block = take(3 * nl).reshape(nl, 3)
+        load_cases.append({
+            'node': load_block[:, 0].astype(int),
+            'dof': load_block[:, 1].astype(int),
+            'load': load_block[:, 2].copy()
+        })
+
+    # 单元组: TYPE NUME NUMMAT, 材料行, 单元行
+    groups = []
+    for _ in range(numeg):
+        element_type, nume, nummat = take(3).astype(int)
+        if element_type not in ELEMENT_LAYOUT:
+            raise ValueError(f"Element type {element_type} is not supported")
+        nen, _, mat_width, ele_width = ELEMENT_LAYOUT[element_type]
+
+        materials = take(mat_width * nummat).reshape(nummat, mat_width)
+        if not np.array_equal(materials[:, 0].astype(int), np.arange(1, nummat + 1)):
+            raise ValueError("Material sets must be inputted in order !")
+
+        ele_block = take(ele_width * nume).reshape(nume, ele_width)
+        if not np.array_equal(ele_block[:, 0].astype(int), np.arange(1, nume + 1)):
+            raise ValueError("Elements must be inputted in order !")
+
+        groups.append({
+            'type': int(element_type),
+            'materials': materials[:, 1:].copy(),   # Bar: E, A;  T3: E, nu, t
+            'conn': ele_block[:, 1:1 + nen].astype(np.int64),
+            'mset': ele_block[:, 1 + nen].astype(np.int64)
+        })
+
+    return {
+        'title': title,
+        'numnp': int(numnp),
+        'numeg': int(numeg),
+        'nlcase': int(nlcase),
+        'modex': int(modex),
+        'bcode': node_block[:, 1:4].astype(int),
+        'xyz': node_block[:, 4:7].copy(),
+        'load_cases': load_cases,
+        'groups': groups
+    }
+
+
+def equation_numbers(bcode):
+    """计算方程号（与 CDomain::CalculateEquationNumber 一致，0表示约束自由度）"""
+    free = (np.asarray(bcode) == 0).ravel()
+    eqn = np.cumsum(free) * free
+    return eqn.reshape(-1, NDF).astype(np.int64), int(free.sum())
+
+
+def orient_t3(xyz, conn):
+    """将顺时针T3单元的第2、3节点交换（与 CT3::CalculateShapeFuncCoef 一致）"""
+    p = xyz[conn - 1]
+    det = ((p[:, 1, 0] - p[:, 0, 0]) * (p[:, 2, 1] - p[:, 0, 1])
+           - (p[:, 2, 0] - p[:, 0, 0]) * (p[:, 1, 1] - p[:, 0, 1]))
+    conn = conn.copy()
+    swap = det < 0
+    conn[swap] = conn[swap][:, [0, 2, 1]]
+    return conn
+
+
+def location_matrix(xyz, group, eqn):
+    """生成单元组的位置矩阵 (NUME, ND)，T3只取x、y自由度"""
+    conn = group['conn']
+    if group['type'] == ELEMENT_T3:
+        conn = orient_t3(xyz, conn)
+        return eqn[conn - 1][:, :, :2].reshape(len(conn), 6)
+    return eqn[conn - 1].reshape(len(conn), -1)
+
+
+def t3_geometry(xyz, conn):
+    """T3形函数系数 b、c 和面积（conn 须已为逆时针顺序）"""
+    p = xyz[conn - 1]
+    x, y = p[:, :, 0], p[:, :, 1]
+    b = np.stack([y[:, 1] - y[:, 2], y[:, 2] - y[:, 0], y[:, 0] - y[:, 1]], axis=1)
+    c = np.stack([x[:, 2] - x[:, 1], x[:, 0] - x[:, 2], x[:, 1] - x[:, 0]], axis=1)
+    area = 0.5 * (x[:, 1] * b[:, 1] + x[:, 0] * b[:, 0] + x[:, 2] * b[:, 2])
+    return b, c, area
+
+
+def t3_strain_matrix(b, c, area):
+    """堆叠的应变矩阵 B (NUME, 3, 6)"""
+    inv_2a = 1.0 / (2.0 * area)
+    B = np.zeros((len(area), 3, 6))
+    B[:, 0, 0::2] = b * inv_2a[:, None]
+    B[:, 1, 1::2] = c * inv_2a[:, None]
+    B[:, 2, 0::2] = c * inv_2a[:, None]
+    B[:, 2, 1::2] = b * inv_2a[:, None]
+    return B
+
+
+def plane_stress_matrix(E, nu):
+    """平面应力弹性矩阵 D，E、nu 可为数组，返回 (..., 3, 3)"""
+    E = np.asarray(E, dtype=float)
+    nu = np.asarray(nu, dtype=float)
+    factor = E / (1.0 - nu * nu)
+    D = np.zeros(E.shape + (3, 3))
+    D[..., 0, 0] = factor
+    D[..., 0, 1] = factor * nu
+    D[..., 1, 0] = factor * nu
+    D[..., 1, 1] = factor
+    D[..., 2, 2] = factor * (1.0 - nu) / 2.0
+    return D
+
+
+def t3_stiffness(xyz, group):
+    """堆叠的T3单元刚度矩阵 (NUME, 6, 6)，与 CT3::ElementStiffness 一致"""
+    conn = orient_t3(xyz, group['conn'])
+    b, c, area = t3_geometry(xyz, conn)
+    B = t3_strain_matrix(b, c, area)
+
+    mat = group['materials'][group['mset'] - 1]
+    D = plane_stress_matrix(mat[:, 0], mat[:, 1])
+    volume = mat[:, 2] * area
+
+    DB = np.einsum('eij,ejk->eik', D, B)
+    return np.einsum('eji,ejk->eik', B, DB) * volume[:, None, None]
+
+
+def bar_stiffness(xyz, group):
+    """堆叠的Bar单元刚度矩阵 (NUME, 6, 6)，与 CBar::ElementStiffness 一致"""
+    conn = group['conn']
+    dx = xyz[conn[:, 1] - 1] - xyz[conn[:, 0] - 1]
+    L2 = np.einsum('ei,ei->e', dx, dx)
+    mat = group['materials'][group['mset'] - 1]
+    k = mat[:, 0] * mat[:, 1] / np.sqrt(L2) / L2
+
+    A = k[:, None, None] * dx[:, :, None] * dx[:, None, :]
+    return np.block([[A, -A], [-A, A]])
+
+
+def element_stiffness(xyz, group):
+    """按单元类型返回堆叠刚度矩阵"""
+    if group['type'] == ELEMENT_T3:
+        return t3_stiffness(xyz, group)
+    return bar_stiffness(xyz, group)
+
+
+def element_stress(xyz, group, lm, displacement):
+    """计算单元组应力：T3返回 (NUME, 3) [xx, yy, xy]，Bar返回 (NUME, 2) [force, stress]"""
+    u = np.concatenate([[0.0], displacement])[lm]
+    mat = group['materials'][group['mset'] - 1]
+
+    if group['type'] == ELEMENT_T3:
+        conn = orient_t3(xyz, group['conn'])
+        b, c, area = t3_geometry(xyz, conn)
+        B = t3_strain_matrix(b, c, area)
+        D = plane_stress_matrix(mat[:, 0], mat[:, 1])
+        strain = np.einsum('eij,ej->ei', B, u)
+        return np.einsum('eij,ej->ei', D, strain)
+
+    conn = group['conn']
+    dx = xyz[conn[:, 1] - 1] - xyz[conn[:, 0] - 1]
+    L2 = np.einsum('ei,ei->e', dx, dx)
+    S = -dx * (mat[:, 0] / L2)[:, None]
+    stress = np.einsum('ei,ei->e', np.hstack([S, -S]), u)
+    return np.column_stack([stress * mat[:, 1], stress])
+
+
+def assemble_force(model, eqn, neq, lcase):
+    """组装第 lcase 个载荷工况（从1开始）的节点力向量"""
+    load_data = model['load_cases'][lcase - 1]
+    dof = eqn[load_data['node'] - 1, load_data['dof'] - 1]
+    force = np.bincount(dof, weights=load_data['load'], minlength=neq + 1)
+    return force[1:]
+
+
+def nodal_displacements(eqn, displacement):
+    """将方程解展开为节点位移 (NUMNP, 3)，约束自由度为0"""
+    return np.concatenate([[0.0], displacement])[eqn]
+
+
+def main():
+    """主函数"""
+    if len(sys.argv) != 2:
+        print("Usage: python3 stap_model.py xxx.dat")
+        sys.exit(1)
+
+    model = read_dat(sys.argv[1])
+    if model is None:
+        sys.exit(1)
+
+    eqn, neq = equation_numbers(model['bcode'])
+
+    print(f"Title: {model['title']}")
+    print(f"Nodes: {model['numnp']}")
+    print(f"Equations: {neq}")
+    print(f"Load Cases: {model['nlcase']}")
+    for i, group in enumerate(model['groups']):
+        print(f"Element group {i + 1}: type {group['type']}, "
+              f"{len(group['conn'])} elements, {len(group['materials'])} material sets")
+
+
+if __name__ == "__main__":
+    main()
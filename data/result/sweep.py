@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+STAPpp Parametric Sweep
+以一个.dat为模板，按参数网格（载荷、材料 E/nu/t 等）生成变体，在进程池中求解：
+- 只有载荷不同的变体共用一次稀疏LU分解
+- 单一材料模型中仅 E 成比例变化的变体，由参考解按线性比例导出，不再重新求解
+每个变体的结果按COutputter格式写出，耗时记录在 sweep_manifest.json 中
+Usage: python3 sweep.py template.dat grid.json [-o OUTDIR] [-j WORKERS]
+       python3 sweep.py template.dat --param load_scale=0.5,1,2 --param E=1e5,2e5
+"""
+
+import sys
+import os
+import json
+import time
+import itertools
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import stap_model
+import out_writer
+from pcg_solver import ElementOperator
+
+# 材料参数列名（与 stap_model.read_dat 中 materials 的列顺序一致）
+MATERIAL_COLUMNS = {
+    stap_model.ELEMENT_BAR: ['E', 'A'],
+    stap_model.ELEMENT_T3: ['E', 'nu', 't'],
+}
+
+
+def expand_grid(grid):
+    """参数网格的笛卡尔积，返回变体参数字典列表"""
+    keys = list(grid.keys())
+    values = [v if isinstance(v, list) else [v] for v in grid.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def apply_parameters(model, params):
+    """返回应用了参数的模型副本（只复制会被修改的数组）
+
+    支持的参数:
+      load_scale          所有集中载荷乘以该系数
+      load.<lc>.<i>       第 lc 个工况第 i 个集中载荷的大小（均从1开始）
+      E / nu / t / A      所有单元组、所有材料组的该项参数
+      E.<g>.<s>           第 g 个单元组第 s 个材料组的该项参数（均从1开始）
+    """
+    variant = dict(model)
+    variant['load_cases'] = [dict(lc, load=lc['load'].copy()) for lc in model['load_cases']]
+    variant['groups'] = [dict(g, materials=g['materials'].copy()) for g in model['groups']]
+
+    for key, value in params.items():
+        parts = key.split('.')
+        if parts[0] == 'load_scale':
+            for lc in variant['load_cases']:
+                lc['load'] *= value
+        elif parts[0] == 'load':
+            lcase, index = int(parts[1]), int(parts[2])
+            variant['load_cases'][lcase - 1]['load'][index - 1] = value
+        else:
+            name = parts[0]
+            targets = range(len(variant['groups'])) if len(parts) == 1 else [int(parts[1]) - 1]
+            matched = False
+            for g in targets:
+                group = variant['groups'][g]
+                columns = MATERIAL_COLUMNS[group['type']]
+                if name not in columns:
+                    continue
+                sets = slice(None) if len(parts) == 1 else int(parts[2]) - 1
+                group['materials'][sets, columns.index(name)] = value
+                matched = True
+            if not matched:
+                raise ValueError(f"Unknown sweep parameter: {key}")
+
+    return variant
+
+
+def material_key(model):
+    """刚度矩阵只依赖于材料参数（几何与边界条件在扫描中不变）"""
+    return tuple(np.concatenate([g['materials'].ravel() for g in model['groups']]).tolist())
+
+
+def single_material(model):
+    """整个模型只有一个材料组"""
+    return sum(len(g['materials']) for g in model['groups']) == 1
+
+
+def scaling_key(model):
+    """单一材料模型中去掉 E 之后的材料参数：该键相同的变体刚度只差一个 E 的比例"""
+    group = model['groups'][0]
+    return tuple(group['materials'][0, 1:].tolist())
+
+
+def plan_sweep(model, variants):
+    """把变体划分为分解组：每组一次分解，组内记录需要按E比例导出的变体"""
+    models = [apply_parameters(model, params) for params in variants]
+
+    tasks = {}
+    for index, variant in enumerate(models):
+        if single_material(model):
+            key = ('scaled', scaling_key(variant))
+        else:
+            key = ('exact', material_key(variant))
+        tasks.setdefault(key, []).append(index)
+
+    return list(tasks.values())
+
+
+def run_task(template, variants, indices, outdir):
+    """工作进程：对一组变体做一次分解，逐变体求解/导出并写出结果"""
+    from scipy.sparse.linalg import splu
+
+    model = stap_model.read_dat(template)
+    records = []
+
+    t0 = time.perf_counter()
+    reference = apply_parameters(model, variants[indices[0]])
+    t_assemble = time.perf_counter()
+    operator = ElementOperator(reference)
+    matrix = operator.to_sparse()
+    t_factor = time.perf_counter()
+    lu = splu(matrix, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0)
+    factor_time = time.perf_counter() - t0
+    assemble_time, lu_time = t_factor - t_assemble, time.perf_counter() - t_factor
+    e_ref = reference['groups'][0]['materials'][0, 0]
+
+    solutions = {}  # 载荷向量 -> 参考刚度下的解，相同载荷不重复回代
+    for position, index in enumerate(indices):
+        t1 = time.perf_counter()
+        variant = apply_parameters(model, variants[index])
+        input_time = time.perf_counter() - t1
+        e_ratio = e_ref / variant['groups'][0]['materials'][0, 0]
+        derived = not np.isclose(e_ratio, 1.0)
+
+        displacements = []
+        reused = True
+        for lcase in range(1, variant['nlcase'] + 1):
+            force = stap_model.assemble_force(variant, operator.eqn, operator.neq, lcase)
+            key = force.tobytes()
+            if key not in solutions:
+                solutions[key] = lu.solve(force)
+                reused = False
+            displacements.append(solutions[key] * e_ratio)
+        solve_time = time.perf_counter() - t1
+
+        # 时间记录：组装与分解只计入首个变体，其余变体只有各自的回代/导出
+        stiffness_time = assemble_time if position == 0 else 0.0
+        solution_time = solve_time - input_time + (lu_time if position == 0 else 0.0)
+        out_path = os.path.join(outdir, f"variant_{index + 1:04d}.out")
+        out_writer.write_solution(out_path, variant, operator.eqn, operator.lm, displacements,
+                                  (input_time, input_time + stiffness_time,
+                                   input_time + stiffness_time + solution_time))
+        total_time = time.perf_counter() - t1
+
+        if position == 0:
+            method = 'factorized'
+        elif derived:
+            method = 'scaled'
+        else:
+            method = 'reused-solution' if reused else 'reused-factorization'
+
+        records.append({
+            'variant': index + 1,
+            'parameters': variants[index],
+            'method': method,
+            'neq': operator.neq,
+            'factor_time': factor_time if position == 0 else 0.0,
+            'solve_time': solve_time,
+            'output_time': total_time - solve_time,
+            'output': out_path
+        })
+
+    return records
+
+
+def run_sweep(template, grid, outdir=None, workers=None):
+    """执行参数扫描，返回按变体编号排序的耗时记录"""
+    model = stap_model.read_dat(template)
+    if model is None:
+        return None
+
+    if outdir is None:
+        outdir = os.path.splitext(template)[0] + "_sweep"
+    os.makedirs(outdir, exist_ok=True)
+
+    variants = expand_grid(grid)
+    tasks = plan_sweep(model, variants)
+    print(f"{len(variants)} variants, {len(tasks)} factorizations")
+
+    t0 = time.perf_counter()
+    records = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_task, template, variants, indices, outdir) for indices in tasks]
+        for future in futures:
+            records.extend(future.result())
+    records.sort(key=lambda r: r['variant'])
+    wall_time = time.perf_counter() - t0
+
+    manifest_path = os.path.join(outdir, "sweep_manifest.json")
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'template': template, 'grid': grid, 'wall_time': wall_time,
+                   'variants': records}, f, indent=2, ensure_ascii=False)
+
+    print(f"{'Variant':<8} {'Method':<22} {'Factor(s)':<10} {'Solve(s)':<10} {'Output(s)':<10}")
+    print("-" * 64)
+    for r in records:
+        print(f"{r['variant']:<8} {r['method']:<22} {r['factor_time']:<10.4f} "
+              f"{r['solve_time']:<10.4f} {r['output_time']:<10.4f}")
+    print(f"\n✓ Sweep finished in {wall_time:.2f} s")
+    print(f"✓ Manifest saved to: {manifest_path}")
+
+    return records
+
+
+def parse_param(text):
+    """解析 --param name=v1,v2,..."""
+    name, _, values = text.partition('=')
+    if not values:
+        raise argparse.ArgumentTypeError(f"Expected name=v1,v2,... but got {text}")
+    return name, [float(v) for v in values.split(',')]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Parametric sweep over a STAPpp template deck")
+    parser.add_argument('template', help="template input file (.dat)")
+    parser.add_argument('grid', nargs='?', help="JSON file mapping parameter names to value lists")
+    parser.add_argument('--param', type=parse_param, action='append', default=[],
+                        help="parameter values, e.g. load_scale=0.5,1,2 (repeatable)")
+    parser.add_argument('-o', '--outdir', help="output directory (default: template_sweep)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, 'r', encoding='utf-8') as f:
+            grid.update(json.load(f))
+    grid.update(dict(args.param))
+
+    if not grid:
+        print("Error: No sweep parameters given")
+        sys.exit(1)
+
+    if run_sweep(args.template, grid, args.outdir, args.workers) is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
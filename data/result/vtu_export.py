@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+STAPpp VTU Exporter
+把模型与结果导出为 ParaView 可读的 VTK UnstructuredGrid (.vtu) 文件：
+- 输入为.dat时读取模型并用稀疏直接法求解全部载荷工况（--mesh-only 时不求解）；
+  输入为.out时经 get.py 解析（第一个工况，T3）
+- 点数据：各工况的节点位移；单元数据：各工况的 Sxx/Syy/Sxy/von Mises（Bar 为轴向应力），材料号和单元组号
+- T3 写为三角形单元，Bar 写为线单元
+- 数组以 appended 二进制（raw 或 base64）分块流式写出，不在内存中拼接整个文件
+Usage: python3 vtu_export.py xxx.dat|xxx.out [-o xxx.vtu] [--encoding raw|base64] [--mesh-only]
+"""
+
+import sys
+import os
+import base64
+import argparse
+import numpy as np
+
+import stap_model
+import derived_fields
+from out_writer import CHUNK_ROWS
+
+# VTK 单元类型
+VTK_LINE = 3
+VTK_TRIANGLE = 5
+VTK_CELL_TYPES = {stap_model.ELEMENT_BAR: VTK_LINE, stap_model.ELEMENT_T3: VTK_TRIANGLE}
+
+VTK_TYPE_NAMES = {np.dtype('<f8'): 'Float64', np.dtype('<i8'): 'Int64',
+                  np.dtype('<i4'): 'Int32', np.dtype('u1'): 'UInt8'}
+
+HEADER_DTYPE = np.dtype('<u8')   # header_type="UInt64"：每个数组前的字节数
+
+
+def cell_stress_fields(group_type, stress):
+    """一个单元组的应力 -> {字段名: (NUME,)}；T3 无轴向应力，Bar 无平面应力分量（均记为 NaN）"""
+    n = len(stress)
+    nan = np.full(n, np.nan)
+    if group_type == stap_model.ELEMENT_T3:
+        return {'Sxx': stress[:, 0], 'Syy': stress[:, 1], 'Sxy': stress[:, 2],
+                'von Mises': derived_fields.von_mises(*stress.T), 'Axial Stress': nan}
+    axial = stress[:, 1]
+    return {'Sxx': nan, 'Syy': nan, 'Sxy': nan, 'von Mises': np.abs(axial), 'Axial Stress': axial}
+
+
+def export_from_dat(dat_path, solve=True):
+    """读取.dat并求解全部工况，返回导出数据（见 write_vtu）；solve=False 时只导出网格与材料号"""
+    from convergence_study import direct_solution
+
+    model = stap_model.read_dat(dat_path)
+    if model is None:
+        return None
+    operator, solutions = direct_solution(model) if solve else (None, [])
+    xyz = model['xyz']
+
+    point_data = []
+    cell_data = []
+    for lcase, u in enumerate(solutions, start=1):
+        point_data.append((f"Displacement LC{lcase}", stap_model.nodal_displacements(operator.eqn, u)))
+        per_group = [cell_stress_fields(group['type'], stap_model.element_stress(xyz, group, lm, u))
+                     for group, lm in zip(model['groups'], operator.lm)]
+        for name in per_group[0] if per_group else ():
+            cell_data.append((f"{name} LC{lcase}", [fields[name] for fields in per_group]))
+
+    return {
+        'points': xyz,
+        'cells': [(VTK_CELL_TYPES[group['type']], group['conn'] - 1) for group in model['groups']],
+        'point_data': point_data,
+        'cell_data': cell_data + [
+            ('Material Set', [group['mset'].astype('<i4') for group in model['groups']]),
+            ('Element Group', [np.full(len(group['conn']), g, dtype='<i4')
+                               for g, group in enumerate(model['groups'], start=1)]),
+        ],
+    }
+
+
+def export_from_parsed(parsed):
+    """get.py 的解析结果（第一个工况，T3单元）-> 导出数据"""
+    node_ids = np.array(sorted(int(k) for k in parsed['nodes']), dtype=np.int64)
+    keys = [str(k) for k in node_ids]
+    nodes = parsed['nodes']
+    points = np.array([[nodes[k]['x'], nodes[k]['y'], nodes[k]['z']] for k in keys], dtype=float)
+    zero = {'ux': 0.0, 'uy': 0.0, 'uz': 0.0}
+    disp = np.array([[d['ux'], d['uy'], d['uz']]
+                     for d in (parsed['displacements'].get(k, zero) for k in keys)], dtype=float)
+
+    elements = parsed['elements']
+    elem_ids = sorted(elements, key=int)
+    conn = np.searchsorted(node_ids, np.array([elements[k]['nodes'] for k in elem_ids],
+                                              dtype=np.int64).reshape(-1, 3))
+    mset = np.array([elements[k].get('material_set', 1) for k in elem_ids], dtype='<i4')
+    zero = {'sxx': 0.0, 'syy': 0.0, 'sxy': 0.0}
+    stress = np.array([[s['sxx'], s['syy'], s['sxy']]
+                       for s in (parsed['stresses'].get(k, zero) for k in elem_ids)],
+                      dtype=float).reshape(-1, 3)
+
+    fields = cell_stress_fields(stap_model.ELEMENT_T3, stress)
+    return {
+        'points': points.reshape(-1, 3),
+        'cells': [(VTK_TRIANGLE, conn)],
+        'point_data': [("Displacement LC1", disp.reshape(-1, 3))],
+        'cell_data': [(f"{name} LC1", [values]) for name, values in fields.items()]
+                     + [('Material Set', [mset])],
+    }
+
+
+def data_arrays(export):
+    """按写出顺序列出全部数组：(所在节, 名称, 分量数, dtype, 数据块列表)"""
+    cells = export['cells']
+    arrays = [('Points', 'Points', 3, np.dtype('<f8'), [export['points']])]
+    arrays += [('PointData', name, 3, np.dtype('<f8'), [values])
+               for name, values in export['point_data']]
+    for name, pieces in export['cell_data']:
+        dtype = np.dtype('<i4') if pieces and pieces[0].dtype.kind in 'iu' else np.dtype('<f8')
+        arrays.append(('CellData', name, 1, dtype, pieces))
+
+    # 连接表、偏移（每个单元最后一个节点之后的位置）与单元类型
+    offsets = []
+    start = 0
+    for _, conn in cells:
+        offsets.append(start + conn.shape[1] * np.arange(1, len(conn) + 1, dtype=np.int64))
+        start += conn.size
+    arrays += [('Cells', 'connectivity', 1, np.dtype('<i8'), [conn for _, conn in cells]),
+               ('Cells', 'offsets', 1, np.dtype('<i8'), offsets),
+               ('Cells', 'types', 1, np.dtype('u1'), [np.full(len(conn), cell_type, dtype='u1')
+                                                        for cell_type, conn in cells])]
+    return arrays
+
+
+def chunks(pieces, dtype):
+    """把各数据块按 CHUNK_ROWS 行切分并转为小端字节"""
+    for piece in pieces:
+        piece = np.asarray(piece)
+        for start in range(0, len(piece), CHUNK_ROWS):
+            yield np.ascontiguousarray(piece[start:start + CHUNK_ROWS], dtype=dtype).tobytes()
+
+
+def base64_size(nbytes):
+    """nbytes 字节的 base64 编码长度"""
+    return 4 * ((nbytes + 2) // 3)
+
+
+def write_base64(f, blocks):
+    """流式 base64 编码：只对 3 字节整数倍的前缀编码，余下的并入下一块"""
+    pending = b''
+    for block in blocks:
+        block = pending + block
+        cut = len(block) - len(block) % 3
+        f.write(base64.b64encode(block[:cut]))
+        pending = block[cut:]
+    f.write(base64.b64encode(pending))
+
+
+def write_vtu(path, export, encoding='raw'):
+    """写出 .vtu 文件
+
+    export: {'points': (N, 3), 'cells': [(VTK类型, 从0开始的连接 (E, k))],
+             'point_data': [(名称, (N, 3))], 'cell_data': [(名称, [各单元组的 (E,) 数组])]}
+    encoding: 'raw'（紧凑）或 'base64'（纯文本，可放入 XML 工具链）
+    """
+    arrays = data_arrays(export)
+    num_points = len(export['points'])
+    num_cells = sum(len(conn) for _, conn in export['cells'])
+
+    # 各数组（含 UInt64 字节数头）在 appended 区内的偏移
+    offsets = []
+    position = 0
+    for _, _, _, dtype, pieces in arrays:
+        nbytes = sum(np.asarray(p).size for p in pieces) * dtype.itemsize
+        offsets.append((position, nbytes))
+        if encoding == 'raw':
+            position += HEADER_DTYPE.itemsize + nbytes
+        else:
+            position += base64_size(HEADER_DTYPE.itemsize) + base64_size(nbytes)
+
+    def data_array(index, indent):
+        _, name, ncomp, dtype, _ = arrays[index]
+        components = f' NumberOfComponents="{ncomp}"' if ncomp > 1 else ''
+        return (f'{indent}<DataArray type="{VTK_TYPE_NAMES[dtype]}" Name="{name}"{components} '
+                f'format="appended" offset="{offsets[index][0]}"/>\n')
+
+    with open(path, 'wb') as f:
+        xml = ['<?xml version="1.0"?>\n',
+               '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" '
+               'header_type="UInt64">\n',
+               '  <UnstructuredGrid>\n',
+               f'    <Piece NumberOfPoints="{num_points}" NumberOfCells="{num_cells}">\n']
+        for section in ('PointData', 'CellData', 'Points', 'Cells'):
+            xml.append(f'      <{section}>\n')
+            xml += [data_array(i, '        ') for i, a in enumerate(arrays) if a[0] == section]
+            xml.append(f'      </{section}>\n')
+        xml += ['    </Piece>\n', '  </UnstructuredGrid>\n',
+                f'  <AppendedData encoding="{encoding}">\n   _']
+        f.write(''.join(xml).encode())
+
+        for (_, _, _, dtype, pieces), (_, nbytes) in zip(arrays, offsets):
+            header = np.array([nbytes], dtype=HEADER_DTYPE).tobytes()
+            if encoding == 'raw':
+                f.write(header)
+                for block in chunks(pieces, dtype):
+                    f.write(block)
+            else:
+                f.write(base64.b64encode(header))
+                write_base64(f, chunks(pieces, dtype))
+
+        f.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+    return num_points, num_cells
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Export a STAPpp model and its results to VTU")
+    parser.add_argument('input', help=".dat (solved here, all load cases) or .out (parsed by get.py)")
+    parser.add_argument('-o', '--output', help="output file (default: input name with .vtu)")
+    parser.add_argument('--encoding', choices=['raw', 'base64'], default='raw',
+                        help="appended data encoding (default: raw)")
+    parser.add_argument('--mesh-only', action='store_true',
+                        help="for a .dat input, export the mesh and material sets without solving")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Error: File {args.input} not found!")
+        sys.exit(1)
+
+    if args.input.endswith('.out'):
+        import get
+        parsed = get.parse_stappp_output(args.input)
+        export = export_from_parsed(parsed) if parsed else None
+    else:
+        export = export_from_dat(args.input, solve=not args.mesh_only)
+
+    if export is None:
+        print(f"Error: Failed to read {args.input}")
+        sys.exit(1)
+
+    output = args.output or os.path.splitext(args.input)[0] + ".vtu"
+    num_points, num_cells = write_vtu(output, export, args.encoding)
+    print(f"✓ VTU written to: {output} ({num_points} points, {num_cells} cells, {args.encoding})")
+
+
+if __name__ == "__main__":
+    main()
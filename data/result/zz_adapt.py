@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+STAPpp ZZ Error Estimator and Adaptive Refinement
+Zienkiewicz-Zhu 误差估计：以面积加权平均恢复节点应力，与单元常应力之差在能量范数下积分，
+得到逐单元误差指标；按 Dörfler 准则标记单元，用最新顶点二分 (newest-vertex bisection)
+加密并保持网格协调，写出新的.dat，重新求解，直到相对误差达到目标
+--theta 1 时所有单元均被标记，等价于一致加密（每个三角形分为4个），可作对比
+Usage: python3 zz_adapt.py xxx.dat [--target 0.05] [--theta 0.5] [--max-iter 20]
+                           [--max-dofs N] [-o OUTDIR]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+import stap_model
+import out_writer
+import mesh_gen
+from convergence_study import timed_direct_solution
+
+# 三角形的三条局部边：第0条 (a, b) 为加密边，与最新顶点 c 相对
+LOCAL_EDGES = np.array([[0, 1], [1, 2], [2, 0]])
+
+
+def recovered_nodal_stress(conn, area, stress, numnp):
+    """节点应力恢复：相邻单元常应力的面积加权平均，返回 (NUMNP, 3)"""
+    index = (conn - 1).ravel()
+    weight = np.repeat(area, 3)
+    total = np.bincount(index, weights=weight, minlength=numnp)
+    nodal = np.column_stack([np.bincount(index, weights=weight * np.repeat(stress[:, k], 3),
+                                         minlength=numnp) for k in range(3)])
+    return nodal / np.maximum(total, np.finfo(float).tiny)[:, None]
+
+
+def zz_error(xyz, group, stress):
+    """ZZ误差指标，返回 (逐单元误差 eta_e, 有限元解的能量范数平方)
+
+    恢复应力在单元内线性插值，与单元常应力之差 d = sum N_i d_i，
+    由 int N_i N_j dA = A (1 + delta_ij) / 12 精确积分 eta_e^2 = int d^T D^-1 d t dA
+    """
+    conn = group['conn']
+    _, _, area = stap_model.t3_geometry(xyz, conn)
+    area = np.abs(area)
+    mat = group['materials']
+    compliance = np.linalg.inv(stap_model.plane_stress_matrix(mat[:, 0], mat[:, 1]))[group['mset'] - 1]
+    thickness = mat[group['mset'] - 1, 2]
+
+    nodal = recovered_nodal_stress(conn, area, stress, len(xyz))
+    d = nodal[conn - 1] - stress[:, None, :]          # (E, 3节点, 3分量)
+    s = d.sum(axis=1)
+    quad = (np.einsum('eni,eij,enj->e', d, compliance, d)
+            + np.einsum('ei,eij,ej->e', s, compliance, s))
+    eta2 = thickness * area / 12.0 * quad
+
+    energy = np.sum(thickness * area * np.einsum('ei,eij,ej->e', stress, compliance, stress))
+    return np.sqrt(np.maximum(eta2, 0.0)), float(energy)
+
+
+def relative_error(eta, energy):
+    """全局相对误差 eta / sqrt(||u||^2 + eta^2)"""
+    eta2 = float(np.sum(eta**2))
+    return np.sqrt(eta2 / (energy + eta2)) if energy + eta2 > 0 else 0.0
+
+
+def dorfler_mark(eta, theta):
+    """Dörfler 标记：误差最大的若干单元，其误差平方和不小于总量的 theta 倍"""
+    eta2 = eta**2
+    order = np.argsort(eta2)[::-1]
+    cumulative = np.cumsum(eta2[order])
+    count = int(np.searchsorted(cumulative, theta * cumulative[-1])) + 1
+    marked = np.zeros(len(eta), dtype=bool)
+    marked[order[:min(count, len(eta))]] = True
+    return marked
+
+
+def initial_refinement_edge(xyz, conn):
+    """初始网格：单元改为逆时针，并轮换节点使最长边成为加密边 (a, b)"""
+    conn = stap_model.orient_t3(xyz, conn)
+    p = xyz[conn - 1, :2]
+    lengths = np.stack([np.sum((p[:, j] - p[:, i])**2, axis=1) for i, j in LOCAL_EDGES], axis=1)
+    shift = np.argmax(lengths, axis=1)
+    rows = np.arange(len(conn))[:, None]
+    return conn[rows, (shift[:, None] + np.arange(3)) % 3]
+
+
+def edge_table(conn, numnp):
+    """单元的三条边编号 (E, 3)、各边端点 (M, 2) 与各边相邻单元数"""
+    pairs = conn[:, LOCAL_EDGES]                       # (E, 3, 2)
+    lo, hi = pairs.min(axis=2), pairs.max(axis=2)
+    keys = lo.astype(np.int64) * (numnp + 1) + hi
+    unique, inverse, counts = np.unique(keys.ravel(), return_inverse=True, return_counts=True)
+    ends = np.column_stack([unique // (numnp + 1), unique % (numnp + 1)])
+    return inverse.reshape(-1, 3), ends, counts
+
+
+def bisect(xyz, bcode, conn, mset, marked):
+    """最新顶点二分加密，返回 (xyz, bcode, conn, mset, 边中点映射 (ends, mid))
+
+    标记单元的加密边先被标记；凡有被标记边的单元，其加密边也须标记（闭包迭代），
+    于是每个单元按被标记边数分为 2、3 或 4 个子单元，网格保持协调
+    """
+    numnp = len(xyz)
+    edges, ends, _ = edge_table(conn, numnp)
+
+    split = np.zeros(len(ends), dtype=bool)
+    split[edges[marked, 0]] = True
+    while True:
+        needed = split[edges].any(axis=1) & ~split[edges[:, 0]]
+        if not needed.any():
+            break
+        split[edges[needed, 0]] = True
+
+    # 新节点：被标记边的中点，约束取两端点约束的交集
+    mid = np.zeros(len(ends), dtype=np.int64)
+    mid[split] = numnp + 1 + np.arange(np.count_nonzero(split))
+    a, b = ends[split, 0] - 1, ends[split, 1] - 1
+    xyz = np.vstack([xyz, 0.5 * (xyz[a] + xyz[b])])
+    bcode = np.vstack([bcode, bcode[a] & bcode[b]])
+
+    na, nb, nc = conn[:, 0], conn[:, 1], conn[:, 2]
+    s0, s1, s2 = split[edges[:, 0]], split[edges[:, 1]], split[edges[:, 2]]
+    m0, m1, m2 = mid[edges[:, 0]], mid[edges[:, 1]], mid[edges[:, 2]]
+
+    # 第一次二分: (a, b, c) -> (c, a, m0), (b, c, m0)
+    # 左子单元 (c, a, m0) 的加密边为 (c, a)，右子单元 (b, c, m0) 的加密边为 (b, c)
+    left_split, right_split = s0 & s2, s0 & s1
+    parts = [
+        (~s0, np.column_stack([na, nb, nc])),
+        (s0 & ~s2, np.column_stack([nc, na, m0])),
+        (left_split, np.column_stack([m0, nc, m2])),
+        (left_split, np.column_stack([na, m0, m2])),
+        (s0 & ~s1, np.column_stack([nb, nc, m0])),
+        (right_split, np.column_stack([m0, nb, m1])),
+        (right_split, np.column_stack([nc, m0, m1])),
+    ]
+    new_conn = np.vstack([c[mask] for mask, c in parts])
+    new_mset = np.concatenate([mset[mask] for mask, _ in parts])
+    return xyz, bcode, new_conn, new_mset, (ends[split], mid[split])
+
+
+def extract_tractions(model, conn, point_only=False):
+    """把每个工况的载荷拆为集中力与边界分布力
+
+    边界边两端在同一方向上都有载荷时，视为逐边均布的分布力，按一致节点力
+    f_i = sum q_e L_e / 2 由最小二乘反求每条边的集度 q_e；不满足该关系的仍作集中力
+    返回每个工况 {'points': (node, dof, load), 'edges': (a, b, dof, q)}
+    """
+    xyz = model['xyz']
+    numnp = len(xyz)
+    _, ends, counts = edge_table(conn, numnp)
+    boundary = ends[counts == 1]
+    lengths = np.linalg.norm(xyz[boundary[:, 1] - 1] - xyz[boundary[:, 0] - 1], axis=1)
+
+    result = []
+    for load_data in model['load_cases']:
+        nodes, dofs, loads = load_data['node'], load_data['dof'], load_data['load']
+        keep = np.ones(len(nodes), dtype=bool)
+        edge_parts = []
+
+        for dof in ([] if point_only else np.unique(dofs)):
+            f = np.zeros(numnp + 1)
+            np.add.at(f, nodes[dofs == dof], loads[dofs == dof])
+            loaded = f != 0.0
+            on_edge = loaded[boundary[:, 0]] & loaded[boundary[:, 1]]
+            if not on_edge.any():
+                continue
+
+            chain = boundary[on_edge]
+            touched = np.unique(chain)
+            A = np.zeros((len(touched), len(chain)))
+            rows = np.searchsorted(touched, chain)
+            A[rows[:, 0], np.arange(len(chain))] = 0.5 * lengths[on_edge]
+            A[rows[:, 1], np.arange(len(chain))] = 0.5 * lengths[on_edge]
+            q = np.linalg.lstsq(A, f[touched], rcond=None)[0]
+
+            if np.allclose(A @ q, f[touched], rtol=1e-8, atol=1e-12 * np.abs(f).max()):
+                edge_parts.append(np.column_stack([chain, np.full(len(chain), dof), q]))
+                keep &= ~((dofs == dof) & np.isin(nodes, touched))
+
+        result.append({
+            'points': (nodes[keep], dofs[keep], loads[keep]),
+            'edges': np.vstack(edge_parts) if edge_parts else np.zeros((0, 4))
+        })
+    return result
+
+
+def split_tractions(loads, split_ends, split_mid, numnp):
+    """分布力所在的边被二分时，拆成两段，集度不变"""
+    if not len(split_ends):
+        return loads
+    keys = split_ends[:, 0].astype(np.int64) * (numnp + 1) + split_ends[:, 1]
+    for lc in loads:
+        edges = lc['edges']
+        if not len(edges):
+            continue
+        a, b = edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64)
+        query = np.minimum(a, b) * (numnp + 1) + np.maximum(a, b)
+        pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+        hit = keys[pos] == query
+        m = split_mid[pos[hit]]
+        halves = [edges[~hit],
+                  np.column_stack([a[hit], m, edges[hit, 2], edges[hit, 3]]),
+                  np.column_stack([m, b[hit], edges[hit, 2], edges[hit, 3]])]
+        lc['edges'] = np.vstack(halves)
+    return loads
+
+
+def load_cases_from(xyz, loads):
+    """由集中力与分布力生成.dat中的集中载荷（同一节点同一方向合并）"""
+    numnp = len(xyz)
+    cases = []
+    for lc in loads:
+        nodes, dofs, values = lc['points']
+        edges = lc['edges']
+        if len(edges):
+            a, b = edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64)
+            half = 0.5 * edges[:, 3] * np.linalg.norm(xyz[b - 1] - xyz[a - 1], axis=1)
+            edge_dof = edges[:, 2].astype(np.int64)
+            nodes = np.concatenate([nodes, a, b])
+            dofs = np.concatenate([dofs, edge_dof, edge_dof])
+            values = np.concatenate([values, half, half])
+
+        keys = (nodes.astype(np.int64) - 1) * stap_model.NDF + dofs - 1
+        unique, inverse = np.unique(keys, return_inverse=True)
+        total = np.bincount(inverse, weights=values, minlength=len(unique))
+        cases.append({'node': unique // stap_model.NDF + 1, 'dof': unique % stap_model.NDF + 1,
+                      'load': total})
+    return cases
+
+
+def adapt(dat_path, target=0.05, theta=0.5, max_iter=20, max_dofs=None, outdir=None,
+          point_loads=False, lcase=1):
+    """自适应循环：求解 -> ZZ估计 -> 标记 -> 二分 -> 写出.dat，返回各轮记录"""
+    model = stap_model.read_dat(dat_path)
+    if model is None:
+        return None
+    if len(model['groups']) != 1 or model['groups'][0]['type'] != stap_model.ELEMENT_T3:
+        print("Error: Adaptive refinement supports meshes with a single T3 element group")
+        return None
+
+    name = os.path.splitext(os.path.basename(dat_path))[0]
+    if outdir is None:
+        outdir = os.path.splitext(dat_path)[0] + "_adapt"
+    os.makedirs(outdir, exist_ok=True)
+
+    group = model['groups'][0]
+    xyz, bcode = model['xyz'], model['bcode']
+    conn = initial_refinement_edge(xyz, group['conn'])
+    mset = group['mset']
+    loads = extract_tractions(model, conn, point_only=point_loads)
+
+    records = []
+    for iteration in range(max_iter + 1):
+        t0 = time.perf_counter()
+
+        # 写出本轮网格并从.dat重新读入求解
+        step = dict(model, numnp=len(xyz), xyz=xyz, bcode=bcode,
+                    title=f"{model['title']} - adaptive step {iteration}",
+                    load_cases=load_cases_from(xyz, loads),
+                    groups=[dict(group, conn=conn, mset=mset)])
+        step_dat = os.path.join(outdir, f"{name}_adapt_{iteration:02d}.dat")
+        mesh_gen.write_dat(step_dat, step)
+        step = stap_model.read_dat(step_dat)
+        time_input = time.perf_counter() - t0
+
+        operator, displacements, (time_assemble, time_solve) = timed_direct_solution(step)
+        out_writer.write_solution(os.path.splitext(step_dat)[0] + ".out", step, operator.eqn,
+                                  operator.lm, displacements,
+                                  (time_input, time_input + time_assemble,
+                                   time_input + time_assemble + time_solve))
+
+        step_group = step['groups'][0]
+        stress = stap_model.element_stress(step['xyz'], step_group, operator.lm[0],
+                                           displacements[lcase - 1])
+        eta, energy = zz_error(step['xyz'], step_group, stress)
+        error = relative_error(eta, energy)
+
+        records.append({
+            'iteration': iteration,
+            'nodes': len(xyz),
+            'elements': len(conn),
+            'dofs': operator.neq,
+            'relative_error': error,
+            'energy_norm': float(np.sqrt(energy)),
+            'time': time.perf_counter() - t0,
+            'input': step_dat
+        })
+        print(f"  step {iteration:3d}: {len(conn):9d} elements, {operator.neq:9d} DOFs, "
+              f"ZZ error = {100 * error:.3f}%")
+
+        if error <= target or iteration == max_iter:
+            break
+        if max_dofs is not None and operator.neq >= max_dofs:
+            print("  DOF limit reached")
+            break
+
+        marked = dorfler_mark(eta, theta)
+        numnp = len(xyz)
+        xyz, bcode, conn, mset, (split_ends, split_mid) = bisect(xyz, bcode, conn, mset, marked)
+        loads = split_tractions(loads, split_ends, split_mid, numnp)
+
+    return records
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="ZZ error estimation and adaptive T3 refinement")
+    parser.add_argument('input', help="STAPpp input file with one T3 element group (.dat)")
+    parser.add_argument('--target', type=float, default=0.05,
+                        help="target relative error in the energy norm (default: 0.05)")
+    parser.add_argument('--theta', type=float, default=0.5,
+                        help="Dörfler marking fraction (1.0 = uniform refinement)")
+    parser.add_argument('--max-iter', type=int, default=20)
+    parser.add_argument('--max-dofs', type=int, default=None, help="stop once the mesh has this many DOFs")
+    parser.add_argument('--lcase', type=int, default=1, help="load case used by the estimator")
+    parser.add_argument('--point-loads', action='store_true',
+                        help="keep every nodal load concentrated instead of detecting edge tractions")
+    parser.add_argument('-o', '--outdir', help="output directory (default: xxx_adapt)")
+    args = parser.parse_args()
+
+    if not args.input.endswith('.dat'):
+        print("Error: Input file must be a .dat file")
+        sys.exit(1)
+    if not 0.0 < args.theta <= 1.0:
+        print("Error: theta must be in (0, 1]")
+        sys.exit(1)
+
+    records = adapt(args.input, args.target, args.theta, args.max_iter, args.max_dofs,
+                    args.outdir, args.point_loads, args.lcase)
+    if records is None:
+        sys.exit(1)
+
+    outdir = args.outdir or os.path.splitext(args.input)[0] + "_adapt"
+    history_path = os.path.join(outdir, "adapt_history.json")
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2)
+
+    final = records[-1]
+    status = "reached" if final['relative_error'] <= args.target else "not reached"
+    print(f"\n✓ Target {100 * args.target:.2f}% {status}: {final['dofs']} DOFs, "
+          f"ZZ error = {100 * final['relative_error']:.3f}%")
+    print(f"✓ History saved to: {history_path}")
+
+
+if __name__ == "__main__":
+    main()
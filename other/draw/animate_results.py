@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+STAPpp Result Animation
+变形动画：位移放大系数从0增长到自动缩放值（scale），或在各载荷工况之间插值过渡（loadcases）
+网格、着色单元和变形线框只创建一次，每帧只更新顶点坐标和颜色数据：
+- 坐标轴范围与颜色范围固定（默认）时使用 blitting，每帧只重绘动画 artist
+- --follow 时坐标轴与颜色范围逐帧变化，无法 blitting，改为多个工作进程并行渲染
+输出 GIF（Pillow）或 PNG 序列
+Usage: python3 animate_results.py xxx.out [--frames 30] [--field displacement|von_mises] [-o xxx.gif]
+       python3 animate_results.py xxx.dat --mode loadcases [--tween 10] [--png-dir frames/] [--follow -j 4]
+"""
+
+import sys
+import os
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.colors import Normalize
+from PIL import Image
+
+import visualize_results as vr
+from mesh_cache import MeshCache
+
+FIELDS = {'displacement': 'Displacement Magnitude', 'von_mises': 'von Mises Stress (Pa)'}
+
+
+def load_source(input_file):
+    """读取网格与各工况结果：{'title', 'mesh': MeshCache, 'cases': [{'u': (N, 2), 'stress': (E, 3)}]}
+
+    .out 经 get.py 解析（第一个工况）；.dat 用稀疏直接法求解全部工况（只取T3单元组）
+    """
+    if input_file.endswith('.out'):
+        vr.ensure_parsed(input_file)
+        data = vr.load_parsed_data(input_file)
+        if data is None:
+            return None
+        mesh = vr.build_mesh_arrays(data)
+        cache = MeshCache.from_mesh(mesh)
+        return {'title': data['title'], 'mesh': cache,
+                'cases': [{'u': np.column_stack([mesh['ux'], mesh['uy']]),
+                           'stress': vr.element_stress_arrays(data['stresses'], mesh['elem_ids'])}]}
+
+    import stap_model
+    from convergence_study import direct_solution
+
+    model = stap_model.read_dat(input_file)
+    if model is None:
+        return None
+    operator, solutions = direct_solution(model)
+    xyz = model['xyz']
+    t3 = [(group, lm) for group, lm in zip(model['groups'], operator.lm)
+          if group['type'] == stap_model.ELEMENT_T3]
+    triangles = np.concatenate([stap_model.orient_t3(xyz, group['conn']) - 1 for group, _ in t3])
+    cache = MeshCache(xyz[:, 0], xyz[:, 1], triangles, np.arange(1, len(xyz) + 1),
+                      np.arange(1, len(triangles) + 1))
+
+    cases = []
+    for u in solutions:
+        stress = np.concatenate([stap_model.element_stress(xyz, group, lm, u) for group, lm in t3])
+        cases.append({'u': stap_model.nodal_displacements(operator.eqn, u)[:, :2], 'stress': stress})
+    return {'title': model['title'], 'mesh': cache, 'cases': cases}
+
+
+def frame_plan(num_cases, mode, frames, tween):
+    """每帧的 (工况a, 工况b, 插值参数t, 幅值系数)：scale 模式幅值从0增长到1，
+    loadcases 模式依次在相邻工况之间插值"""
+    if mode == 'scale':
+        return [(0, 0, 0.0, k / max(frames - 1, 1)) for k in range(frames)]
+    plan = []
+    for a in range(num_cases - 1):
+        plan += [(a, a + 1, k / tween, 1.0) for k in range(tween)]
+    plan.append((num_cases - 1, num_cases - 1, 0.0, 1.0))
+    return plan
+
+
+def frame_state(source, step, field):
+    """一帧的节点位移 (N, 2)、单元颜色数据 (E,) 与标题"""
+    a, b, t, amplitude = step
+    case_a, case_b = source['cases'][a], source['cases'][b]
+    u = amplitude * ((1 - t) * case_a['u'] + t * case_b['u'])
+    if field == 'von_mises':
+        stress = amplitude * ((1 - t) * case_a['stress'] + t * case_b['stress'])
+        values = vr.stress_fields(stress)['von_mises']
+    else:
+        values = np.linalg.norm(u, axis=1)[source['mesh'].triangles].mean(axis=1)
+    label = f"Load case {a + 1}" if t == 0 else f"Load case {a + 1} → {b + 1} ({t:.0%})"
+    return u, values, f"{label}, amplitude {amplitude:.0%}"
+
+
+class AnimationFigure:
+    """动画图：artist 只创建一次，render 时原地更新顶点与颜色"""
+
+    def __init__(self, source, field, scale, limits, norm, blit, figsize=(10, 6), dpi=100):
+        mesh = source['mesh']
+        self.mesh = mesh
+        self.scale = scale
+        self.blit = blit
+
+        self.fig, self.ax = plt.subplots(figsize=figsize, dpi=dpi)
+        ax = self.ax
+        ax.set_title(f"{source['title']} - Deformation (×{scale:.3g})", fontweight='bold')
+        ax.set_xlabel('X Coordinate (m)')
+        ax.set_ylabel('Y Coordinate (m)')
+        ax.set_aspect('equal')
+        ax.set_xlim(limits[0], limits[1])
+        ax.set_ylim(limits[2], limits[3])
+
+        # 静态：原网格
+        vr.mesh_lines(ax, mesh.triangulation, '0.6', 1, alpha=0.6)
+
+        # 动画：按单元着色的三角形与变形线框
+        self.faces = ax.tripcolor(mesh.triangulation, facecolors=np.zeros(len(mesh.triangles)),
+                                  cmap='jet', norm=norm, edgecolors='none')
+        self.colorbar = self.fig.colorbar(self.faces, ax=ax)
+        self.colorbar.set_label(FIELDS[field])
+        edges = mesh.edges
+        self.edge_start, self.edge_end = edges[:, 0], edges[:, 1]
+        self.line_x = np.full(3 * len(edges), np.nan)
+        self.line_y = np.full(3 * len(edges), np.nan)
+        self.wire, = ax.plot(self.line_x, self.line_y, 'k-', alpha=0.5,
+                             linewidth=vr.detail_scale(len(edges)))
+        self.label = ax.text(0.02, 0.98, '', transform=ax.transAxes, ha='left', va='top',
+                             bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        self.animated = [self.faces, self.wire, self.label]
+
+        self.fig.tight_layout()
+        if blit:
+            # 背景（坐标轴、原网格、色标）只绘制一次，之后每帧恢复背景再画动画 artist
+            for artist in self.animated:
+                artist.set_animated(True)
+            self.fig.canvas.draw()
+            self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    def update(self, u, values, text, limits=None, norm=None):
+        """原地更新顶点、颜色与标注"""
+        mesh = self.mesh
+        x = mesh.x + u[:, 0] * self.scale
+        y = mesh.y + u[:, 1] * self.scale
+        tris = mesh.triangles
+        self.faces.set_verts(np.stack([x[tris], y[tris]], axis=-1))
+        self.faces.set_array(values)
+        self.line_x[0::3], self.line_x[1::3] = x[self.edge_start], x[self.edge_end]
+        self.line_y[0::3], self.line_y[1::3] = y[self.edge_start], y[self.edge_end]
+        self.wire.set_data(self.line_x, self.line_y)
+        self.label.set_text(text)
+        if limits is not None:
+            self.ax.set_xlim(limits[0], limits[1])
+            self.ax.set_ylim(limits[2], limits[3])
+        if norm is not None:
+            self.faces.set_norm(norm)
+
+    def render(self):
+        """绘制当前帧，返回 RGB 图像"""
+        canvas = self.fig.canvas
+        if self.blit:
+            canvas.restore_region(self.background)
+            for artist in self.animated:
+                self.ax.draw_artist(artist)
+        else:
+            canvas.draw()
+        return Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(),
+                                'raw', 'RGBA', 0, 1).convert('RGB')
+
+
+def frame_limits(mesh, u, scale, margin=0.05):
+    """变形后网格的坐标轴范围（含边距）"""
+    x = mesh.x + u[:, 0] * scale
+    y = mesh.y + u[:, 1] * scale
+    pad = margin * max(np.ptp(x), np.ptp(y), 1e-300)
+    return (x.min() - pad, x.max() + pad, y.min() - pad, y.max() + pad)
+
+
+def envelope(source, plan, field, scale):
+    """所有帧的坐标范围与颜色范围的包络（固定范围时使用）"""
+    limits = [np.inf, -np.inf, np.inf, -np.inf]
+    vmin, vmax = np.inf, -np.inf
+    for step in plan:
+        u, values, _ = frame_state(source, step, field)
+        lim = frame_limits(source['mesh'], u, scale)
+        limits = [min(limits[0], lim[0]), max(limits[1], lim[1]),
+                  min(limits[2], lim[2]), max(limits[3], lim[3])]
+        vmin, vmax = min(vmin, values.min()), max(vmax, values.max())
+    return limits, Normalize(vmin, vmax if vmax > vmin else vmin + 1.0)
+
+
+# 工作进程中的动画图（由 init_worker 创建一次，之后渲染分给该进程的全部帧）
+_worker = {}
+
+
+def init_worker(source, field, scale, options):
+    """工作进程初始化：创建一份动画图"""
+    _worker['source'] = source
+    _worker['field'] = field
+    _worker['figure'] = AnimationFigure(source, field, scale, (0, 1, 0, 1), Normalize(0, 1),
+                                        blit=False, **options)
+
+
+def render_follow_frame(index, step, frame_dir):
+    """工作进程：坐标轴与颜色范围跟随本帧，渲染并写出 PNG"""
+    figure = _worker['figure']
+    u, values, text = frame_state(_worker['source'], step, _worker['field'])
+    vmax = values.max() if values.max() > values.min() else values.min() + 1.0
+    figure.update(u, values, text, frame_limits(figure.mesh, u, figure.scale),
+                  Normalize(values.min(), vmax))
+    path = Path(frame_dir) / f"frame_{index:04d}.png"
+    figure.render().save(path)
+    return str(path)
+
+
+def animate(source, mode='scale', field='displacement', frames=30, tween=10, follow=False,
+            workers=None, frame_dir=None, scale=None, figsize=(10, 6), dpi=100):
+    """渲染全部帧；返回 (PIL 图像列表或 PNG 路径列表, 每帧耗时秒)；scale 为空时自动计算放大系数"""
+    plan = frame_plan(len(source['cases']), mode, frames, tween)
+    mesh = source['mesh']
+    if scale is None:
+        max_u = max(np.linalg.norm(case['u'], axis=1).max() for case in source['cases'])
+        scale = vr.auto_scale_factor(mesh.size, max_u, 0.0)
+    options = {'figsize': figsize, 'dpi': dpi}
+
+    start = time.perf_counter()
+    if follow:
+        # 每帧背景不同，无法 blitting：多进程并行，每个进程只建一次图
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(source, field, scale, options)) as pool:
+            futures = [pool.submit(render_follow_frame, i, step, frame_dir)
+                       for i, step in enumerate(plan)]
+            images = [future.result() for future in futures]
+    else:
+        limits, norm = envelope(source, plan, field, scale)
+        figure = AnimationFigure(source, field, scale, limits, norm, blit=True, **options)
+        images = []
+        for step in plan:
+            figure.update(*frame_state(source, step, field))
+            images.append(figure.render())
+        plt.close(figure.fig)
+    return images, (time.perf_counter() - start) / max(len(plan), 1)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Animate STAPpp deformation or load-case sweeps")
+    parser.add_argument('input', help=".out (parsed via get.py, first load case) or .dat (solved)")
+    parser.add_argument('--mode', choices=['scale', 'loadcases'], default='scale',
+                        help="grow the deformation scale, or sweep through the load cases")
+    parser.add_argument('--field', choices=sorted(FIELDS), default='displacement',
+                        help="element colour data")
+    parser.add_argument('--frames', type=int, default=30, help="frames in scale mode")
+    parser.add_argument('--tween', type=int, default=10, help="frames between load cases")
+    parser.add_argument('-o', '--output', help="GIF file (default: <input>_<mode>.gif)")
+    parser.add_argument('--png-dir', help="write a PNG sequence into this directory instead of a GIF")
+    parser.add_argument('--scale', type=float, default=None,
+                        help="deformation scale factor (default: automatic)")
+    parser.add_argument('--fps', type=float, default=15)
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--follow', action='store_true',
+                        help="per-frame axis and colour limits (no blitting; frames render in parallel)")
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Error: File {args.input} not found!")
+        sys.exit(1)
+
+    source = load_source(args.input)
+    if source is None or len(source['mesh'].triangles) == 0:
+        print(f"Error: No T3 mesh found in {args.input}")
+        sys.exit(1)
+    if args.mode == 'loadcases' and len(source['cases']) < 2:
+        print("Error: Load-case mode needs a .dat with at least two load cases")
+        sys.exit(1)
+
+    base = os.path.splitext(args.input)[0]
+    output = args.output or f"{base}_{args.mode}.gif"
+    frame_dir = Path(args.png_dir) if args.png_dir else None
+    scratch = None
+    if args.follow and frame_dir is None:
+        import tempfile
+        scratch = tempfile.TemporaryDirectory()
+        frame_dir = Path(scratch.name)
+    if frame_dir is not None:
+        frame_dir.mkdir(parents=True, exist_ok=True)
+
+    images, per_frame = animate(source, args.mode, args.field, args.frames, args.tween,
+                                args.follow, args.workers, frame_dir, args.scale, dpi=args.dpi)
+    print(f"✓ Rendered {len(images)} frames ({per_frame * 1000:.1f} ms/frame, "
+          f"{'parallel' if args.follow else 'blitted'})")
+
+    if args.png_dir:
+        if not args.follow:
+            for i, image in enumerate(images):
+                image.save(frame_dir / f"frame_{i:04d}.png")
+        print(f"✓ PNG sequence written to: {frame_dir}")
+    else:
+        if args.follow:
+            images = [Image.open(path) for path in images]
+        images[0].save(output, save_all=True, append_images=images[1:],
+                       duration=int(1000 / args.fps), loop=0)
+        print(f"✓ Animation saved: {output}")
+    if scratch is not None:
+        scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+STAPpp Pipeline Benchmark
+对结果处理流水线逐阶段计时并测峰值内存：.dat 读入、.out 读入与各数据表解析、
+JSON/列缓存的写入与加载、网格数组、派生量、各类图和报告，
+输入为 synth_out / mesh_gen 生成的一组规模（节点数）的合成算例；
+结果追加到 JSON 历史文件，与其中保存的基线逐 (规模, 阶段) 比较，
+墙钟时间或峰值内存超出阈值即报告回退并以状态 1 退出
+每个阶段先不开 tracemalloc 计时 --repeat 次取最小值，再单独运行一次测内存
+Usage: python3 benchmark.py [--sizes 1000 10000 100000] [--repeat 3] [--threshold 0.25]
+       python3 benchmark.py --update-baseline --history bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import platform
+import argparse
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR.parent.parent / "data" / "result"))
+
+import visualize_results as vr
+from mesh_cache import MeshCache
+
+import get
+import hotspots
+import mesh_gen
+import stap_model
+import synth_out
+from derived_fields import DerivedFields, DISPLACEMENT_FIELDS, STRESS_FIELDS
+from profiling import measure
+
+HISTORY_FILE = SCRIPT_DIR / "benchmark_history.json"
+HISTORY_VERSION = 1
+
+SIZES = (1000, 10000, 100000)
+
+# 回退阈值（相对基线的增长比例）；低于绝对下限的变化视为噪声
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.25
+TIME_FLOOR = 0.02               # s
+MEMORY_FLOOR = 1 << 20          # bytes
+
+
+def stage_dat_read(ctx):
+    return stap_model.read_dat(ctx['dat'])
+
+
+def stage_out_read(ctx):
+    with open(ctx['out'], 'r') as f:
+        return f.read()
+
+
+def stage_out_nodes(ctx):
+    return get.parse_nodal_data(ctx['out.read'], ctx['num_nodes'])
+
+
+def stage_out_loads(ctx):
+    return get.parse_load_data(ctx['out.read'])
+
+
+def stage_out_elements(ctx):
+    return get.parse_element_data(ctx['out.read'])
+
+
+def stage_out_displacements(ctx):
+    return get.parse_displacement_results(ctx['out.read'], ctx['num_nodes'])
+
+
+def stage_out_stresses(ctx):
+    return get.parse_stress_results(ctx['out.read'])
+
+
+def stage_json_write(ctx):
+    """与 get.save_parsed_data 写出的 JSON 相同（不含摘要）"""
+    data = {'title': ctx['title'],
+            'control_info': {'num_nodes': ctx['num_nodes'], 'num_element_groups': 1,
+                             'num_load_cases': 1},
+            'nodes': ctx['out.nodes'], 'loads': ctx['out.loads'], 'elements': ctx['out.elements'],
+            'displacements': ctx['out.displacements'], 'stresses': ctx['out.stresses']}
+    with open(ctx['json'], 'w', encoding='utf-8') as f:
+        json.dump(get.convert_to_serializable(data), f, indent=2, ensure_ascii=False)
+
+
+def stage_json_load(ctx):
+    return vr.load_parsed_data(ctx['out'])
+
+
+def stage_columns_write(ctx):
+    shutil.rmtree(os.path.join(ctx['workdir'], hotspots.CACHE_DIR), ignore_errors=True)
+    return hotspots.cached_columns(ctx['out'])
+
+
+def stage_columns_load(ctx):
+    return hotspots.cached_columns(ctx['out'])
+
+
+def stage_mesh_build(ctx):
+    mesh = vr.build_mesh_arrays(ctx['cache.json_load'])
+    MeshCache.from_mesh(mesh).triangulation
+    return mesh
+
+
+def stage_derived_fields(ctx):
+    """报告和绘图所用的派生量：应力由解析字典取成数组，再算全部字段"""
+    data, mesh = ctx['cache.json_load'], ctx['mesh.build']
+    u = np.column_stack([mesh['ux'], mesh['uy'], mesh['uz']])
+    stress = vr.element_stress_arrays(data['stresses'], mesh['elem_ids'])
+    fields = DerivedFields.single(u, stress)
+    return {name: fields[name] for name in DISPLACEMENT_FIELDS + STRESS_FIELDS
+            if name != 'energy_density'}
+
+
+def stage_figure_analysis(ctx):
+    # 每次新建 MeshCache，使三角剖分和等值线都计入（重复计时不命中上一次的缓存）
+    mesh = ctx['mesh.build']
+    fig = vr.create_analysis_figure(ctx['cache.json_load'], mesh, MeshCache.from_mesh(mesh))
+    vr.save_figure(fig, ctx['workdir'], f"{ctx['prefix']}_analysis", ctx['formats'], ctx['dpi'])
+    plt.close(fig)
+
+
+def stage_figure_stress(ctx):
+    vr.create_stress_analysis(ctx['cache.json_load'], ctx['prefix'],
+                              MeshCache.from_mesh(ctx['mesh.build']), formats=ctx['formats'],
+                              dpi=ctx['dpi'], show=False, output_dir=ctx['workdir'])
+
+
+def stage_report_summary(ctx):
+    get.generate_summary(ctx['cache.json_load'],
+                         os.path.join(ctx['workdir'], f"{ctx['prefix']}_summary.txt"))
+
+
+def stage_report_analysis(ctx):
+    vr.generate_analysis_report(ctx['cache.json_load'], ctx['prefix'], ctx['workdir'])
+
+
+# 按执行顺序排列；后面的阶段从 ctx 中取前面阶段的结果（键为阶段名）
+STAGES = (
+    ('dat.read', stage_dat_read),
+    ('out.read', stage_out_read),
+    ('out.nodes', stage_out_nodes),
+    ('out.loads', stage_out_loads),
+    ('out.elements', stage_out_elements),
+    ('out.displacements', stage_out_displacements),
+    ('out.stresses', stage_out_stresses),
+    ('cache.json_write', stage_json_write),
+    ('cache.json_load', stage_json_load),
+    ('cache.columns_write', stage_columns_write),
+    ('cache.columns_load', stage_columns_load),
+    ('mesh.build', stage_mesh_build),
+    ('fields.derived', stage_derived_fields),
+    ('figure.analysis', stage_figure_analysis),
+    ('figure.stress', stage_figure_stress),
+    ('report.summary', stage_report_summary),
+    ('report.analysis', stage_report_analysis),
+)
+
+
+def write_inputs(workdir, nodes, seed=0):
+    """写出一个规模的合成 .out（一个 T3 组、一个工况）与节点数相同的结构化 .dat"""
+    model = synth_out.SyntheticModel(nodes, seed=seed)
+    prefix = f"bench_{nodes}"
+    out = os.path.join(workdir, f"{prefix}.out")
+    dat = os.path.join(workdir, f"{prefix}.dat")
+    title = f"Benchmark - {nodes} Nodes"
+    synth_out.write_synthetic(out, model, title)
+    mesh_gen.write_structured_dat(dat, mesh_gen.PRESETS['rectangle']['corners'],
+                                  model.nx - 1, model.nodes // model.nx - 1)
+    return {'out': out, 'dat': dat, 'json': os.path.join(workdir, f"{prefix}_parsed.json"),
+            'prefix': prefix, 'title': title, 'num_nodes': model.nodes, 'workdir': workdir}
+
+
+def run_size(ctx, stages, repeat=3, memory=True, skip=()):
+    """按顺序运行各阶段，返回 {阶段: {'wall', 'cpu', 'peak'}}；skip 中的阶段只运行不记录"""
+    results = {}
+    for name, stage in stages:
+        timings = []
+        # 各阶段自身的进度输出（如 "✓ Summary saved"）不混入结果表
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            for _ in range(repeat):
+                ctx[name], timing = measure(stage, ctx)
+                timings.append(timing)
+            best = min(timings, key=lambda t: t['wall'])
+            if memory:
+                best['peak'] = measure(stage, ctx, memory=True)[1]['peak']
+        if name not in skip:
+            results[name] = best
+    return results
+
+
+def compare(results, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """与基线逐 (规模, 阶段) 比较，返回回退列表 [(规模, 阶段, 指标, 基线, 本次)]"""
+    regressions = []
+    for size, stages in results.items():
+        for name, now in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            if (now['wall'] > base['wall'] * (1 + time_threshold)
+                    and now['wall'] - base['wall'] > TIME_FLOOR):
+                regressions.append((size, name, 'wall', base['wall'], now['wall']))
+            if (now['peak'] is not None and base.get('peak') is not None
+                    and now['peak'] > base['peak'] * (1 + memory_threshold)
+                    and now['peak'] - base['peak'] > MEMORY_FLOOR):
+                regressions.append((size, name, 'peak', base['peak'], now['peak']))
+    return regressions
+
+
+def load_history(path):
+    """读取历史文件 {'version', 'baseline', 'runs'}，不存在时返回空历史"""
+    if not os.path.exists(path):
+        return {'version': HISTORY_VERSION, 'baseline': None, 'runs': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        history = json.load(f)
+    if history.get('version') != HISTORY_VERSION:
+        raise ValueError(f"{path}: unsupported history version {history.get('version')}")
+    return history
+
+
+def save_history(history, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+
+
+def git_commit():
+    """当前提交（不在 git 仓库中时为 None）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(size, results, baseline):
+    print(f"\n{size} nodes")
+    print(f"  {'Stage':<22}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak (MiB)':>12}{'vs base':>10}")
+    for name, r in results.items():
+        base = baseline.get(size, {}).get(name)
+        ratio = f"{r['wall'] / base['wall']:.2f}x" if base and base['wall'] > 0 else '-'
+        peak = f"{r['peak'] / 2**20:.1f}" if r['peak'] is not None else '-'
+        print(f"  {name:<22}{r['wall']:>10.3f}{r['cpu']:>10.3f}{peak:>12}{ratio:>10}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Benchmark the STAPpp result pipeline stage by stage")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES),
+                        help=f"node counts of the synthetic models (default: {' '.join(map(str, SIZES))})")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage, best kept (default: 3)")
+    parser.add_argument('--stages', nargs='+', default=['*'], metavar='PATTERN',
+                        help="stages to record, glob patterns such as 'out.*' (default: all); "
+                             "stages the recorded ones depend on still run")
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--formats', nargs='+', default=['png'], help="figure formats (default: png)")
+    parser.add_argument('--dpi', type=int, default=100, help="figure resolution (default: 100)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic results")
+    parser.add_argument('--history', default=str(HISTORY_FILE),
+                        help="JSON history holding the baseline and past runs")
+    parser.add_argument('--threshold', type=float, default=TIME_THRESHOLD,
+                        help=f"allowed wall-time growth over the baseline (default: {TIME_THRESHOLD})")
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD,
+                        help=f"allowed peak-memory growth over the baseline (default: {MEMORY_THRESHOLD})")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store this run as the new baseline (the first run always is)")
+    parser.add_argument('--no-save', action='store_true', help="do not append this run to the history")
+    parser.add_argument('--workdir', help="keep the synthetic inputs and outputs here (default: temporary)")
+    args = parser.parse_args()
+
+    if args.repeat < 1 or min(args.sizes) < 4:
+        print("Error: --repeat must be positive and every size at least 4 nodes")
+        sys.exit(1)
+
+    names = [name for name, _ in STAGES]
+    recorded = {name for name in names if any(fnmatch.fnmatch(name, p) for p in args.stages)}
+    if not recorded:
+        print(f"Error: No stage matches {' '.join(args.stages)}; stages: {' '.join(names)}")
+        sys.exit(1)
+    # 只运行到最后一个要记录的阶段
+    last = max(names.index(name) for name in recorded)
+    stages = STAGES[:last + 1]
+
+    try:
+        history = load_history(args.history)
+    except (OSError, ValueError) as e:
+        print(f"Error: Cannot read history: {e}")
+        sys.exit(1)
+    base_run = history['baseline']
+    baseline = (base_run or {}).get('results', {})
+
+    vr.logger.setLevel('WARNING')
+    workdir = args.workdir or tempfile.mkdtemp(prefix='stap_bench_')
+    os.makedirs(workdir, exist_ok=True)
+
+    results = {}
+    try:
+        for nodes in args.sizes:
+            ctx = write_inputs(workdir, nodes, args.seed)
+            ctx.update(formats=args.formats, dpi=args.dpi)
+            size = str(ctx['num_nodes'])
+            results[size] = run_size(ctx, stages, args.repeat, not args.no_memory,
+                                     skip=set(names) - recorded)
+            print_results(size, results[size], baseline)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    run = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': git_commit(),
+           'python': platform.python_version(), 'numpy': np.__version__,
+           'matplotlib': matplotlib.__version__, 'machine': platform.machine(),
+           'repeat': args.repeat, 'results': results}
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+
+    if not args.no_save:
+        history['runs'].append(run)
+        if history['baseline'] is None or args.update_baseline:
+            history['baseline'] = run
+        save_history(history, args.history)
+        print(f"\n✓ Results appended to: {args.history}")
+
+    if not baseline:
+        print("No baseline to compare against" + ("" if args.no_save else "; this run is the baseline"))
+        return
+    if regressions:
+        print(f"\n{len(regressions)} regressions against the baseline "
+              f"({base_run['commit']}, {base_run['timestamp']}):")
+        for size, name, metric, base, now in regressions:
+            if metric == 'wall':
+                print(f"  {size:>8} {name:<22} wall {base:.3f} s -> {now:.3f} s ({now / base:.2f}x)")
+            else:
+                print(f"  {size:>8} {name:<22} peak {base / 2**20:.1f} -> {now / 2**20:.1f} MiB "
+                      f"({now / base:.2f}x)")
+        sys.exit(1)
+    print(f"✓ No stage regressed beyond +{args.threshold:.0%} time / +{args.memory_threshold:.0%} memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Report Figure Build
+Make-like build of the figures in other/writing/img. Each target declares the
+script that draws it, the script arguments and every input it depends on
+(.dat/.out decks, imported modules). Each build also records the repository
+modules the script actually imported, and these join the declared inputs from
+then on. Inputs are hashed; a target is rebuilt only when its stamp changed or
+an output is missing, and independent targets are built in parallel, each in its
+own scratch directory with the Agg backend.
+Usage: python3 build_figures.py [TARGET ...] [-j 4] [--force] [--dry-run] [--output-dir DIR]
+"""
+
+import os
+import sys
+import glob
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPT_DIR.parent.parent
+DEFAULT_OUTPUT_DIR = REPO_DIR / "other" / "writing" / "img"
+STATE_FILE = SCRIPT_DIR / ".build_state.json"
+
+# Bump to force every figure to rebuild (e.g. after a matplotlib style change)
+BUILD_VERSION = 1
+
+# Solver and parser modules the convergence pipeline imports
+PIPELINE_MODULES = ["data/result/convergence_study.py", "data/result/mesh_gen.py",
+                    "data/result/stap_model.py", "data/result/out_writer.py",
+                    "data/result/pcg_solver.py", "data/result/get.py",
+                    "data/result/derived_fields.py", "data/result/error_norms.py",
+                    "data/result/profiling.py"]
+
+# Modules the declarative figure engine draws with
+ENGINE_MODULES = ["other/draw/figure_specs.py", "other/draw/visualize_results.py",
+                  "other/draw/mesh_cache.py", "other/draw/contour_cache.py",
+                  "data/result/get.py", "data/result/stap_model.py",
+                  "data/result/derived_fields.py", "data/result/profiling.py"]
+
+# Runs a target script as __main__ and, at exit, writes the files of every loaded
+# module to $BUILD_IMPORTS; the script sees the same argv and sys.path[0] as when run directly
+RECORD_IMPORTS = """
+import os, sys, json, atexit, runpy
+script = sys.argv[1]
+sys.argv = sys.argv[1:]
+sys.path[0] = os.path.dirname(script)
+
+@atexit.register
+def record():
+    files = {os.path.realpath(m.__file__) for m in list(sys.modules.values())
+             if getattr(m, '__file__', None)}
+    with open(os.environ['BUILD_IMPORTS'], 'w') as f:
+        json.dump(sorted(files), f)
+
+runpy.run_path(script, run_name='__main__')
+"""
+
+# name -> script, arguments, inputs (repo-relative paths or globs), outputs copied to the image dir
+TARGETS = {
+    'convergence': {
+        'script': "other/draw/conv.py",
+        'args': ["--levels", "6", "--workdir", str(SCRIPT_DIR / "convergence_cache")],
+        'inputs': PIPELINE_MODULES,
+        'outputs': ["convergence_analysis.png"],
+    },
+    'patch_test': {
+        'script': "other/draw/figure_engine.py",
+        'args': ["patch_test", "--formats", "png"],
+        'inputs': ENGINE_MODULES + ["data/patch_tests/test.dat", "data/patch_tests/test.out"],
+        'outputs': ["t3_patch_geometry.png", "t3_patch_results.png",
+                    "t3_displacement_stress_analysis.png"],
+    },
+    'wzy': {
+        'script': "other/draw/figure_engine.py",
+        'args': ["wzy", "--formats", "png"],
+        'inputs': ENGINE_MODULES + ["data/validation_tests/wzy.dat",
+                                    "data/validation_tests/wzy.out"],
+        'outputs': ["wzy_geometry_model.png", "wzy_t3_analysis.png",
+                    "wzy_displacement_analysis.png", "wzy_stress_analysis.png"],
+    },
+}
+
+
+def file_digest(path, block=1 << 20):
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(block), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def expand_inputs(target):
+    """Script plus declared inputs as sorted repo-relative paths (globs expanded)"""
+    paths = {target['script']}
+    for pattern in target['inputs']:
+        matches = glob.glob(str(REPO_DIR / pattern))
+        if not matches:
+            raise FileNotFoundError(f"input {pattern} not found")
+        paths.update(os.path.relpath(m, REPO_DIR) for m in matches)
+    return sorted(paths)
+
+
+def target_stamp(name, target, imports=()):
+    """Hash over the build version, script arguments and every input's contents,
+    including the modules recorded by the last build (a vanished one changes the stamp)"""
+    h = hashlib.sha256()
+    h.update(json.dumps([BUILD_VERSION, name, target['args'], target['outputs']]).encode())
+    for path in sorted(set(expand_inputs(target)) | set(imports)):
+        h.update(path.encode())
+        full = REPO_DIR / path
+        h.update(file_digest(full).encode() if full.exists() else b"missing")
+    return h.hexdigest()
+
+
+def recorded_imports(entry):
+    """Imports recorded in a state entry (entries of older builds are bare stamps)"""
+    return entry.get('imports', []) if isinstance(entry, dict) else []
+
+
+def repo_modules(files):
+    """Repo-relative paths of the loaded module files that belong to the repository"""
+    repo = str(REPO_DIR.resolve()) + os.sep
+    return sorted(os.path.relpath(f, REPO_DIR.resolve()) for f in files
+                  if f.startswith(repo) and f.endswith('.py'))
+
+
+def load_state():
+    """Last successful builds: {output dir: {target: {'stamp', 'imports'}}}"""
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    """Write the stamps atomically"""
+    tmp = STATE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_FILE)
+
+
+def plan(names, state, output_dir, force=False):
+    """Stamp every requested target and return [(name, stamp, reason)] for those to rebuild"""
+    todo = []
+    for name in names:
+        target = TARGETS[name]
+        entry = state.get(name)
+        stamp = target_stamp(name, target, recorded_imports(entry))
+        missing = [o for o in target['outputs'] if not (output_dir / o).exists()]
+        if force:
+            todo.append((name, stamp, "forced"))
+        elif missing:
+            todo.append((name, stamp, f"missing {missing[0]}"))
+        elif not isinstance(entry, dict) or entry.get('stamp') != stamp:
+            todo.append((name, stamp, "inputs changed" if name in state else "no previous build"))
+    return todo
+
+
+def build_target(name, output_dir):
+    """Run the target's script in a scratch directory, copy its outputs into place and
+    return the repository modules it imported"""
+    target = TARGETS[name]
+    with tempfile.TemporaryDirectory(prefix=f"fig-{name}-") as workdir:
+        imports_file = os.path.join(workdir, ".imports.json")
+        env = dict(os.environ, MPLBACKEND='Agg', BUILD_IMPORTS=imports_file)
+        result = subprocess.run([sys.executable, "-c", RECORD_IMPORTS,
+                                 str(REPO_DIR / target['script'])] + target['args'],
+                                cwd=workdir, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{target['script']} exited with {result.returncode}:\n"
+                               f"{result.stderr.strip()[-2000:]}")
+        for output in target['outputs']:
+            produced = Path(workdir) / output
+            if not produced.exists():
+                raise RuntimeError(f"{target['script']} did not produce {output}")
+            shutil.copyfile(produced, output_dir / output)
+        try:
+            with open(imports_file) as f:
+                return repo_modules(json.load(f))
+        except (OSError, ValueError):
+            return []
+
+
+def build(names, output_dir=DEFAULT_OUTPUT_DIR, workers=None, force=False, dry_run=False):
+    """Rebuild out-of-date targets in parallel; returns (rebuilt, failed) name lists"""
+    output_dir = Path(output_dir).resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    all_state = load_state()
+    state = all_state.setdefault(str(output_dir), {})
+    todo = plan(names, state, output_dir, force)
+
+    for name in names:
+        if name not in {n for n, _, _ in todo}:
+            print(f"  {name:<20} up to date")
+    if dry_run:
+        for name, _, reason in todo:
+            print(f"  {name:<20} would rebuild ({reason})")
+        return [n for n, _, _ in todo], []
+
+    rebuilt, failed = [], []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(build_target, name, output_dir): (name, stamp, reason)
+                   for name, stamp, reason in todo}
+        for future in as_completed(futures):
+            name, stamp, reason = futures[future]
+            try:
+                imports = future.result()
+            except (RuntimeError, OSError) as e:
+                print(f"✗ {name:<20} failed ({reason}): {e}")
+                state.pop(name, None)
+                failed.append(name)
+                continue
+            print(f"✓ {name:<20} rebuilt ({reason})")
+            # restamp with the imports just recorded, so the next plan hashes the same set
+            if imports != recorded_imports(state.get(name)):
+                stamp = target_stamp(name, TARGETS[name], imports)
+            state[name] = {'stamp': stamp, 'imports': imports}
+            rebuilt.append(name)
+
+    save_state(all_state)
+    return rebuilt, failed
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Incremental build of the report figures")
+    parser.add_argument('targets', nargs='*', metavar='TARGET',
+                        help=f"targets to build (default: all of {', '.join(TARGETS)})")
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="rebuild even if up to date")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would be rebuilt")
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR))
+    args = parser.parse_args()
+
+    names = args.targets or list(TARGETS)
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        print(f"Error: Unknown target {unknown[0]} (choose from {', '.join(TARGETS)})")
+        sys.exit(1)
+
+    try:
+        rebuilt, failed = build(names, args.output_dir, args.workers, args.force, args.dry_run)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"{len(rebuilt)} {'to rebuild' if args.dry_run else 'rebuilt'}, "
+          f"{len(names) - len(rebuilt) - len(failed)} up to date, {len(failed)} failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
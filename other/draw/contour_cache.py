@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+STAPpp Contour Cache
+填充等值线的缓存：细分三角剖分（UniformTriRefiner）每个网格只算一次，三次插值器与细分后的场值、
+等值线级别和等值线多边形按字段缓存，由各图、各载荷工况共用；
+等值线多边形可在工作进程中计算，以 (顶点, 路径码) 数组返回主进程，再组装成 ContourSet
+缓存键包含场值的摘要，同一键换了数据会重新计算；
+用到的 matplotlib 私有接口（_tri.TriContourGenerator、_interpolate_multikeys）不可用时
+退回公开的 tricontourf / UniformTriRefiner.refine_field，结果相同，只是慢一些
+"""
+
+import hashlib
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib.tri as tri
+from matplotlib import ticker
+from matplotlib.contour import ContourSet
+from matplotlib.figure import Figure
+from matplotlib.path import Path
+
+# 默认等值线级数（与 tricontourf(levels=20) 一致）
+CONTOUR_LEVELS = 20
+
+
+def contour_levels(vmin, vmax, n=CONTOUR_LEVELS):
+    """与 tricontourf(levels=n) 相同的级别：MaxNLocator 取整，再去掉数据范围外多余的级别"""
+    levels = ticker.MaxNLocator(n + 1, min_n_ticks=1).tick_values(vmin, vmax)
+    under = np.nonzero(levels < vmin)[0]
+    over = np.nonzero(levels > vmax)[0]
+    i0 = under[-1] if len(under) else 0
+    i1 = over[0] + 1 if len(over) else len(levels)
+    if i1 - i0 < 3:
+        i0, i1 = 0, len(levels)
+    return levels[i0:i1]
+
+
+def field_digest(*arrays):
+    """场值数组的摘要，作为缓存键的一部分"""
+    digest = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        digest.update(np.ascontiguousarray(a, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def contour_generator(triang, z):
+    """matplotlib 内部的三角网格等值线生成器；私有接口不可用时返回 None"""
+    try:
+        from matplotlib import _tri
+        return _tri.TriContourGenerator(triang.get_cpp_triangulation(), np.asarray(z, dtype=float))
+    except (ImportError, AttributeError, TypeError):
+        return None
+
+
+def public_filled_bands(triang, z, levels):
+    """filled_bands 的公开接口实现：在不显示的 Figure 上 tricontourf，取出每个区间的路径"""
+    ax = Figure().add_subplot()
+    bands = []
+    for path in ax.tricontourf(triang, z, levels=levels).get_paths():
+        vertices = np.asarray(path.vertices, dtype=float).reshape(-1, 2)
+        codes = path.codes
+        if codes is None:
+            codes = np.full(len(vertices), Path.LINETO, dtype=np.uint8)
+            codes[:1] = Path.MOVETO
+        bands.append((vertices, np.asarray(codes, dtype=np.uint8)))
+    return bands
+
+
+def filled_bands(triang, z, levels):
+    """各相邻级别之间的填充区域：[(顶点 (K, 2), 路径码 (K,))]，可在工作进程中调用"""
+    generator = contour_generator(triang, z)
+    if generator is None:
+        return public_filled_bands(triang, z, levels)
+    lowers = np.array(levels[:-1], dtype=float)
+    if lowers[0] == np.min(z):
+        lowers[0] -= 1   # 与 ContourSet 一致：最小值落在第一个区间内
+    bands = []
+    for lower, upper in zip(lowers, levels[1:]):
+        vertices, codes = generator.create_filled_contour(lower, upper)
+        if len(vertices):
+            bands.append((np.concatenate(vertices), np.concatenate(codes)))
+        else:
+            bands.append((np.empty((0, 2)), np.empty(0, dtype=np.uint8)))
+    return bands
+
+
+def draw_filled(ax, levels, bands, cmap, **kwargs):
+    """由预先计算的多边形创建填充等值线（可用于 colorbar）"""
+    return ContourSet(ax, levels, [[v] for v, _ in bands], [[c] for _, c in bands],
+                      filled=True, cmap=cmap, **kwargs)
+
+
+class ContourCache:
+    """一个网格上的等值线缓存；subdiv > 0 时在细分网格上用三次插值得到光滑等值线
+
+    插值结果与多边形按 (key, 场值摘要[, 级别]) 缓存，级别按 (name, 各数组摘要) 缓存
+    """
+
+    def __init__(self, mesh, subdiv=0, kind='geom'):
+        self.mesh = mesh
+        self.subdiv = subdiv
+        self.kind = kind           # CubicTriInterpolator 的梯度估计方式：'geom'（快）或 'min_E'
+        self._values = {}
+        self._levels = {}
+        self._bands = {}
+
+    @cached_property
+    def refined(self):
+        """(细分三角剖分, 细分节点所在的原单元)；不细分时为原三角剖分"""
+        if self.subdiv == 0:
+            return self.mesh.triangulation, None
+        return self.refiner.refine_triangulation(return_tri_index=True, subdiv=self.subdiv)
+
+    @cached_property
+    def refiner(self):
+        return tri.UniformTriRefiner(self.mesh.triangulation)
+
+    def band_key(self, key, z, levels=None):
+        """多边形的缓存键"""
+        return (key, field_digest(z), None if levels is None else tuple(np.asarray(levels, float)))
+
+    def values(self, key, z):
+        """节点场值 -> 细分网格上的场值（按 key 与场值摘要缓存插值结果）"""
+        if self.subdiv == 0:
+            return np.asarray(z, dtype=float)
+        cache_key = (key, field_digest(z))
+        if cache_key not in self._values:
+            triang, tri_index = self.refined
+            interpolator = tri.CubicTriInterpolator(self.mesh.triangulation, z, kind=self.kind)
+            try:
+                # 细分节点所在单元已知，跳过点定位
+                values = interpolator._interpolate_multikeys(triang.x, triang.y, tri_index=tri_index)[0]
+            except (AttributeError, TypeError):
+                values = self.refiner.refine_field(z, interpolator, self.subdiv)[1]
+            self._values[cache_key] = np.asarray(values, dtype=float)
+        return self._values[cache_key]
+
+    def levels(self, name, *arrays, n=CONTOUR_LEVELS):
+        """字段 name 的等值线级别，按给出的全部数组（例如各载荷工况）的范围只计算一次"""
+        cache_key = (name, field_digest(*arrays), n)
+        if cache_key not in self._levels:
+            vmin = min(float(np.min(a)) for a in arrays)
+            vmax = max(float(np.max(a)) for a in arrays)
+            self._levels[cache_key] = contour_levels(vmin, vmax, n)
+        return self._levels[cache_key]
+
+    def bands(self, key, z, levels=None):
+        """(级别, 填充多边形)，按 key、场值与给定级别缓存；levels 为空时按本场的范围计算"""
+        cache_key = self.band_key(key, z, levels)
+        if cache_key not in self._bands:
+            values = self.values(key, z)
+            if levels is None:
+                levels = self.levels(key, values)
+            self._bands[cache_key] = (levels, filled_bands(self.refined[0], values, levels))
+        return self._bands[cache_key]
+
+    def draw(self, ax, key, z, cmap, levels=None, **kwargs):
+        """在 ax 上绘制字段的填充等值线，返回 ContourSet"""
+        levels, bands = self.bands(key, z, levels)
+        return draw_filled(ax, levels, bands, cmap, **kwargs)
+
+    def prefetch(self, fields, workers=None):
+        """在进程池中计算 {key: (节点场值, 级别或 None)} 的等值线，结果存入缓存"""
+        todo = {self.band_key(key, z, levels): (key, z, levels)
+                for key, (z, levels) in fields.items()}
+        todo = {cache_key: item for cache_key, item in todo.items() if cache_key not in self._bands}
+        if not todo:
+            return
+        mesh = self.mesh
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(mesh.x, mesh.y, mesh.triangles, self.subdiv,
+                                           self.kind)) as pool:
+            futures = {cache_key: pool.submit(worker_bands, key, z, levels)
+                       for cache_key, (key, z, levels) in todo.items()}
+            for cache_key, future in futures.items():
+                self._bands[cache_key] = future.result()
+
+
+# 工作进程中的等值线缓存（由 init_worker 创建，细分网格每个进程只算一次）
+_worker = {}
+
+
+def init_worker(x, y, triangles, subdiv, kind):
+    """工作进程初始化"""
+    from mesh_cache import MeshCache
+    _worker['contours'] = ContourCache(MeshCache(x, y, triangles), subdiv, kind)
+
+
+def worker_bands(key, z, levels):
+    """工作进程：计算一个字段的 (级别, 填充多边形)"""
+    return _worker['contours'].bands(key, z, levels)
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Declarative Figure Engine
+Renders report figures from a parsed STAPpp result and a figure spec instead of
+one hand-written script per case. A case names its .out file (and optionally the
+.dat, for material properties); every figure of the case is drawn from a single
+parse and one shared MeshCache. Figures are lists of panels (geometry, deformed,
+contour, element, vectors) with fields, units and annotations; the paper cases
+live in figure_specs.py, and any other case can be given as a JSON file.
+Usage: python3 figure_engine.py [CASE ...] [--spec case.json] [--output-dir DIR]
+                                [--formats png pdf] [--dpi 300]
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import Normalize
+from matplotlib.collections import PolyCollection
+
+import visualize_results as vr
+from mesh_cache import MeshCache
+import get
+import stap_model
+import derived_fields
+from figure_specs import CASES
+
+REPO_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Unit -> factor applied to values stored in SI units
+UNITS = {'m': 1.0, 'mm': 1e3, 'μm': 1e6, 'Pa': 1.0, 'kPa': 1e-3, 'MPa': 1e-6, 'deg': 1.0,
+         'J/m³': 1.0, 'kJ/m³': 1e-3}
+DEFAULT_UNITS = {'length': 'm', 'stress': 'Pa', 'angle': 'deg', 'energy': 'J/m³'}
+
+# Field name -> (location, label, quantity)
+FIELDS = {
+    'ux': ('node', 'X-Displacement', 'length'),
+    'uy': ('node', 'Y-Displacement', 'length'),
+    'umag': ('node', 'Displacement Magnitude', 'length'),
+    'sxx': ('element', 'σxx Stress', 'stress'),
+    'syy': ('element', 'σyy Stress', 'stress'),
+    'sxy': ('element', 'τxy Stress', 'stress'),
+    'von_mises': ('element', 'von Mises Stress', 'stress'),
+    's1': ('element', 'Max Principal Stress', 'stress'),
+    's2': ('element', 'Min Principal Stress', 'stress'),
+    'principal_angle': ('element', 'Principal Direction', 'angle'),
+    'max_shear': ('element', 'Max In-plane Shear', 'stress'),
+    'energy_density': ('element', 'Strain Energy Density', 'energy'),
+}
+
+AXIS_LABELS = ('X Coordinate (m)', 'Y Coordinate (m)')
+
+# Supports drawn at full size up to this many; beyond it symbols shrink with the count
+SUPPORT_LIMIT = 20
+
+
+# ---------------------------------------------------------------- model
+
+def load_model(out_path, dat_path=None):
+    """Parse a .out once and build the shared model: mesh cache, BCs, loads and results"""
+    parsed = get.parse_stappp_output(str(out_path))
+    if parsed is None:
+        raise ValueError(f"failed to parse {out_path}")
+    mesh = vr.build_mesh_arrays(parsed)
+    cache = MeshCache.from_mesh(mesh)
+    node_ids = mesh['node_ids']
+
+    nodes = parsed['nodes']
+    bc = np.array([[nodes[str(n)].get('bc_x', 0), nodes[str(n)].get('bc_y', 0)] for n in node_ids],
+                  dtype=int).reshape(-1, 2)
+    loads = [(int(node), int(dof), float(value))
+             for node, by_dof in parsed.get('loads', {}).items()
+             for dof, value in by_dof.items()]
+    load_node = np.searchsorted(node_ids, [node for node, _, _ in loads]).astype(int)
+    load_dof = np.array([dof for _, dof, _ in loads], dtype=int)
+    load_value = np.array([value for _, _, value in loads], dtype=float)
+
+    fx = load_value[load_dof == 1].sum()
+    fy = load_value[load_dof == 2].sum()
+    info = {'title': parsed['title'], 'numnp': len(node_ids), 'nume': len(mesh['elem_ids']),
+            'neq': int((bc == 0).sum()), 'Fx': fx, 'Fy': fy, 'load_total': float(np.hypot(fx, fy))}
+    materials = None
+    if dat_path is not None:
+        # Material properties are not echoed in the .out; take the first T3 group from the .dat
+        dat = stap_model.read_dat(str(dat_path))
+        for group in dat['groups'] if dat else []:
+            if group['type'] == stap_model.ELEMENT_T3:
+                info.update(zip(('E', 'nu', 't'), group['materials'][0].tolist()))
+                if len(group['conn']) == len(mesh['elem_ids']):
+                    materials = group['materials'][group['mset'] - 1][:, :2]
+                break
+    stress = vr.element_stress_arrays(parsed['stresses'], mesh['elem_ids'])
+
+    return {
+        'mesh': cache,
+        'ux': mesh['ux'], 'uy': mesh['uy'],
+        'stress': stress,
+        'bc': bc,
+        'loads': (load_node, load_dof, load_value),
+        'info': info,
+        'fields': derived_fields.DerivedFields.single(np.column_stack([mesh['ux'], mesh['uy']]),
+                                                      stress, materials),
+    }
+
+
+def field_values(model, name):
+    """Field values in SI units, computed once per model (derived_fields.DerivedFields)"""
+    return model['fields'][name]
+
+
+def scaled_field(model, name, units):
+    """(values in the requested unit, location, colour bar label)"""
+    location, label, quantity = FIELDS[name]
+    unit = units.get(quantity, DEFAULT_UNITS[quantity])
+    return field_values(model, name) * UNITS[unit], location, f"{label} ({unit})"
+
+
+def deformation_scale(model, panel):
+    """Explicit panel scale, or the automatic one used by visualize_results"""
+    scale = panel.get('scale', 'auto')
+    if scale == 'auto':
+        return vr.auto_scale_factor(model['mesh'].size, model['ux'], model['uy'])
+    return float(scale)
+
+
+# ---------------------------------------------------------------- layers
+
+def draw_edges(ax, cache, color='k', linewidth=1.0, alpha=1.0, linestyle='-', label=None):
+    """Mesh wireframe as a single artist"""
+    return vr.mesh_lines(ax, cache.triangulation, color, linewidth, alpha, linestyle, label)
+
+
+def draw_nodes(ax, cache, style='ko', markersize=6):
+    """Node markers; left out on large meshes, where they would only hide the field"""
+    if len(cache.x) <= vr.DETAIL_LIMIT:
+        ax.plot(cache.x, cache.y, style, markersize=markersize)
+
+
+def draw_outline(ax, cache, style):
+    """Filled model region with its boundary edges"""
+    tris = cache.triangles
+    ax.add_collection(PolyCollection(np.stack([cache.x[tris], cache.y[tris]], axis=-1),
+                                     facecolors=style.get('facecolor', 'lightblue'),
+                                     alpha=style.get('alpha', 0.2), edgecolors='none'))
+    if style.get('edgecolor'):
+        triang = cache.triangulation
+        boundary = np.argwhere(triang.neighbors == -1)
+        tri_index, corner = boundary[:, 0], boundary[:, 1]
+        start = tris[tri_index, corner]
+        end = tris[tri_index, (corner + 1) % 3]
+        xs = np.column_stack([cache.x[start], cache.x[end], np.full(len(start), np.nan)]).ravel()
+        ys = np.column_stack([cache.y[start], cache.y[end], np.full(len(start), np.nan)]).ravel()
+        ax.plot(xs, ys, color=style['edgecolor'], linewidth=1)
+
+
+def draw_supports(ax, model, size):
+    """Fully fixed nodes: red square with hatching; one direction fixed: orange triangle"""
+    cache = model['mesh']
+    fixed = model['bc'].sum(axis=1)
+    size = size * vr.detail_scale(np.count_nonzero(fixed), SUPPORT_LIMIT)
+    h = 0.04 * cache.size * size
+    # Hatching of all fixed nodes as one NaN-separated line
+    x = cache.x[fixed == 2][:, None] + h * (np.arange(5) * 0.4 - 1.0)
+    y = cache.y[fixed == 2][:, None] + np.zeros(5)
+    xs = np.stack([x, x - 0.2 * h, np.full_like(x, np.nan)], axis=-1).ravel()
+    ys = np.stack([y - h, y + h, np.full_like(y, np.nan)], axis=-1).ravel()
+    ax.plot(xs, ys, 'k-', linewidth=2 * size)
+    ax.plot(cache.x[fixed == 2], cache.y[fixed == 2], 's', color='red', markersize=12 * size)
+    ax.plot(cache.x[fixed == 1], cache.y[fixed == 1], '^', color='orange', markersize=12 * size)
+
+
+def draw_loads(ax, model, style):
+    """Nodal loads as arrows, length proportional to magnitude; anchor 'head' ends the
+    arrow at the node (pushing), 'tail' starts it there (pulling)"""
+    cache = model['mesh']
+    node, dof, value = model['loads']
+    if not len(value):
+        return
+    length = style.get('length', 0.15) * cache.size
+    color = style.get('color', 'green')
+    scale = length / np.abs(value).max()
+    pad = 0.02 * cache.size
+    for n, d, v in zip(node, dof, value):
+        direction = np.array([1.0, 0.0]) if d == 1 else np.array([0.0, 1.0])
+        vec = direction * v * scale
+        point = np.array([cache.x[n], cache.y[n]])
+        if style.get('anchor', 'head') == 'tail':
+            tail, head = point + np.sign(v) * direction * pad, point + vec
+        else:
+            tail, head = point - vec, point
+        ax.annotate('', xy=tuple(head), xytext=tuple(tail),
+                    arrowprops=dict(arrowstyle='-|>', color=color, lw=2.5, mutation_scale=20))
+        # Label beside the middle of the arrow
+        middle = (tail + head) / 2 + direction[::-1] * 2 * pad
+        ax.text(middle[0], middle[1], f'{abs(v):g}N', fontsize=11, color=color, fontweight='bold',
+                ha='center' if d == 1 else 'left', va='bottom' if d == 1 else 'center')
+
+
+NODE_LABEL_STYLES = {
+    'plain': dict(fontsize=12, fontweight='bold', ha='left'),
+    'circle': dict(fontsize=12, fontweight='bold', ha='center', va='center',
+                   bbox=dict(boxstyle="circle,pad=0.2", facecolor='yellow', alpha=0.8)),
+    'box': dict(fontsize=12, fontweight='bold', ha='center', va='center',
+                bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.9,
+                          edgecolor='black')),
+}
+
+
+def draw_node_labels(ax, cache, style, label_limit):
+    """Node numbers ('plain', 'circle' or 'box'); 'coords' adds the coordinates below"""
+    if isinstance(style, str):
+        style = {'style': style}
+    kind = style.get('style', 'plain')
+    fmt = style.get('format', 'Node {id}' if kind == 'box' else '{id}')
+    dx, dy = (np.array(style.get('offset', (-0.05, 0.05))) * cache.size)
+    for i in vr.select_labels(ax, cache.x, cache.y, label_limit):
+        x, y = cache.x[i], cache.y[i]
+        ax.text(x + dx, y + dy, fmt.format(id=cache.node_ids[i]), **NODE_LABEL_STYLES[kind])
+        if style.get('coords'):
+            ax.text(x, y - 0.07 * cache.size, f'({x:.1f},{y:.1f})', fontsize=9,
+                    ha='center', va='center', style='italic')
+
+
+def draw_element_labels(ax, cache, style, label_limit):
+    """Element numbers at the centroids"""
+    if isinstance(style, str):
+        style = {'format': style}
+    cx, cy = cache.centroids.T
+    for i in vr.select_labels(ax, cx, cy, label_limit):
+        ax.text(cx[i], cy[i], style.get('format', 'T3-{id}').format(id=cache.elem_ids[i]),
+                ha='center', va='center', fontsize=12, fontweight='bold',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor=style.get('facecolor', 'white'),
+                          alpha=0.9))
+
+
+VALUE_BOXES = {
+    'dark': dict(color='white', bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.8)),
+    'light': dict(color='black', bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8)),
+}
+
+
+def label_value(value, scale):
+    """Round values that are numerical noise relative to the field to zero"""
+    return 0.0 if abs(value) <= 1e-9 * scale else value
+
+
+def draw_annotation(ax, info, note):
+    """Free annotations: text (with {info} placeholders), dimension lines, coordinate triad"""
+    kind = note['type']
+    if kind == 'text':
+        options = {k: v for k, v in note.items() if k not in ('type', 'xy', 'text', 'box')}
+        if 'box' in note:
+            options['bbox'] = dict(boxstyle="round,pad=0.5", alpha=0.9, **note['box'])
+        ax.text(*note['xy'], note['text'].format(**info), **options)
+    elif kind == 'dimension':
+        (x0, y0), (x1, y1) = note['from'], note['to']
+        ax.annotate('', xy=(x0, y0), xytext=(x1, y1),
+                    arrowprops=dict(arrowstyle='<->', color='black', lw=note.get('lw', 2)))
+        vertical = abs(x1 - x0) < abs(y1 - y0)
+        dx, dy = note.get('offset', (-0.15, 0) if vertical else (0, -0.15))
+        ax.text((x0 + x1) / 2 + dx, (y0 + y1) / 2 + dy, note['text'], ha='center', va='center',
+                fontsize=note.get('fontsize', 13), fontweight='bold',
+                rotation=90 if vertical else 0)
+    elif kind == 'triad':
+        x, y = note['xy']
+        length = note.get('length', 0.15)
+        head = length / 5
+        for dx, dy, name in ((length, 0, 'X'), (0, length, 'Y')):
+            ax.arrow(x, y, dx, dy, head_width=head, head_length=head, fc='black', ec='black',
+                     linewidth=2)
+            ax.text(x + dx * 1.3 - (head if dy else 0), y + dy * 1.3 - (head if dx else 0),
+                    name, fontsize=12, fontweight='bold', ha='center', va='center')
+    else:
+        raise ValueError(f"unknown annotation type {kind!r}")
+
+
+# ---------------------------------------------------------------- panels
+
+def panel_geometry(ax, model, panel, units, label_limit):
+    """Undeformed mesh with BC-coloured nodes (or plain nodes when supports are off)"""
+    cache = model['mesh']
+    draw_edges(ax, cache, panel.get('color', 'b'), panel.get('linewidth', 2.5), alpha=0.8)
+    if not panel.get('supports'):
+        draw_nodes(ax, cache, 'bo', 10)
+        return
+    free = model['bc'].sum(axis=1) == 0
+    if len(cache.x) <= vr.DETAIL_LIMIT:
+        ax.plot(cache.x[free], cache.y[free], 'o', color='green', markersize=12)
+
+
+def panel_deformed(ax, model, panel, units, label_limit):
+    """Original and deformed mesh, optionally with displacement arrows"""
+    cache = model['mesh']
+    scale = deformation_scale(model, panel)
+    deformed = cache.deformed(model['ux'], model['uy'], scale)
+    draw_edges(ax, cache, 'b', 2.5, alpha=0.7, label='Original Mesh')
+    draw_edges(ax, deformed, 'r', 2.5, alpha=0.8, linestyle='--',
+               label=f'Deformed Mesh (x{scale:g})')
+    draw_nodes(ax, cache, 'bo', 8)
+    draw_nodes(ax, deformed, 'ro', 8)
+    if panel.get('arrows'):
+        moving = np.hypot(model['ux'], model['uy']) > 0
+        ax.quiver(cache.x[moving], cache.y[moving], model['ux'][moving] * scale,
+                  model['uy'][moving] * scale, color='green', alpha=0.8,
+                  angles='xy', scale_units='xy', scale=1, width=0.006)
+    ax.legend(fontsize=11)
+
+
+def panel_vectors(ax, model, panel, units, label_limit):
+    """Displacement vectors coloured by magnitude"""
+    cache = model['mesh']
+    scale = deformation_scale(model, panel)
+    magnitude, _, label = scaled_field(model, 'umag', units)
+    draw_edges(ax, cache, 'k', 1, alpha=0.5)
+    quiver = ax.quiver(cache.x, cache.y, model['ux'] * scale, model['uy'] * scale, magnitude,
+                       angles='xy', scale_units='xy', scale=1, cmap=panel.get('cmap', 'viridis'),
+                       alpha=0.8, width=0.01)
+    draw_nodes(ax, cache)
+    plt.colorbar(quiver, ax=ax).set_label(label)
+
+
+def panel_contour(ax, model, panel, units, label_limit):
+    """Filled contours of a field (element fields are area-averaged to the nodes)"""
+    cache = model['mesh']
+    values, location, label = scaled_field(model, panel['field'], units)
+    if location == 'element':
+        values = vr.nodal_average(cache, values)
+    levels = panel.get('levels', 20)
+    if np.ptp(values) > 0:
+        # contours are cached on the mesh, so panels repeating a field reuse its polygons
+        contours = cache.contours(panel.get('refine', 0))
+        key = (panel['field'], label, tuple(np.atleast_1d(levels)))
+        if np.ndim(levels) == 0:
+            levels = contours.levels(key, contours.values(key, values), n=levels)
+        filled = contours.draw(ax, key, values, panel.get('cmap', 'RdBu_r'), levels=levels)
+    else:
+        filled = ax.tripcolor(cache.triangulation, values, cmap=panel.get('cmap', 'RdBu_r'))
+    plt.colorbar(filled, ax=ax).set_label(label, fontsize=12)
+    draw_edges(ax, cache, 'k', panel.get('linewidth', 1.5), alpha=0.4)
+    draw_nodes(ax, cache, 'ko', panel.get('markersize', 8))
+
+    show = panel.get('values')
+    if show:
+        style = VALUE_BOXES[show if isinstance(show, str) else 'dark']
+        fmt = panel.get('format', '{value:.1f}')
+        extent = np.abs(values).max()
+        offset = 0.03 * cache.size
+        for i in vr.select_labels(ax, cache.x, cache.y, label_limit, np.abs(values)):
+            value = label_value(values[i], extent)
+            if panel.get('skip_zero') and value == 0:
+                continue
+            ax.text(cache.x[i], cache.y[i] + offset, fmt.format(value=value), ha='center',
+                    va='bottom', fontsize=10, fontweight='bold', **style)
+
+
+def panel_element(ax, model, panel, units, label_limit):
+    """Element-constant field as coloured faces or centroid markers, with value labels"""
+    cache = model['mesh']
+    values, location, label = scaled_field(model, panel['field'], units)
+    cmap = plt.get_cmap(panel.get('cmap', 'jet'))
+    vmin, vmax = panel.get('range', (values.min(), values.max()))
+    norm = Normalize(vmin, vmax if vmax > vmin else vmin + 1.0)
+    cx, cy = cache.centroids.T
+
+    if panel.get('style', 'scatter') == 'faces':
+        mappable = ax.tripcolor(cache.triangulation, facecolors=values, cmap=cmap, norm=norm)
+    else:
+        edge = panel.get('edgecolor')
+        mappable = ax.scatter(cx, cy, c=values, s=panel.get('size', 300), cmap=cmap, norm=norm,
+                              alpha=0.9, edgecolors=edge, linewidths=2 if edge else None, zorder=3)
+    plt.colorbar(mappable, ax=ax).set_label(label, fontsize=12, fontweight='bold')
+    draw_edges(ax, cache, 'k', 1.5, alpha=0.6)
+    draw_nodes(ax, cache, 'ko', 8)
+
+    fmt = panel.get('format', '{value:.1f}')
+    box = panel.get('label_box')
+    extent = np.abs(values).max()
+    for i in vr.select_labels(ax, cx, cy, label_limit, np.abs(values)):
+        options = dict(VALUE_BOXES[box]) if box else {}
+        if not box:
+            # Text colour picked for contrast against the marker colour
+            r, g, b, _ = cmap(norm(values[i]))
+            options['color'] = 'black' if 0.299 * r + 0.587 * g + 0.114 * b > 0.5 else 'white'
+        text = fmt.format(value=label_value(values[i], extent), id=cache.elem_ids[i])
+        ax.text(cx[i], cy[i], text, ha='center', va='center', fontsize=panel.get('fontsize', 11),
+                fontweight='bold', zorder=4, **options)
+
+
+PANELS = {
+    'geometry': panel_geometry,
+    'deformed': panel_deformed,
+    'vectors': panel_vectors,
+    'contour': panel_contour,
+    'element': panel_element,
+}
+
+
+def draw_panel(ax, model, panel, units, label_limit):
+    """One panel: background outline, the panel body, then the shared overlays"""
+    cache = model['mesh']
+    if 'outline' in panel:
+        draw_outline(ax, cache, panel['outline'])
+    PANELS[panel['kind']](ax, model, panel, units, label_limit)
+
+    if panel.get('element_labels'):
+        draw_element_labels(ax, cache, panel['element_labels'], label_limit)
+    if panel.get('supports'):
+        draw_supports(ax, model, panel.get('support_size', 1.0))
+    if panel.get('loads'):
+        draw_loads(ax, model, panel['loads'] if isinstance(panel['loads'], dict) else {})
+    if panel.get('node_labels'):
+        draw_node_labels(ax, cache, panel['node_labels'], label_limit)
+    for note in panel.get('annotations', ()):
+        draw_annotation(ax, model['info'], note)
+
+    ax.set_title(panel.get('title', ''), fontweight='bold', fontsize=panel.get('title_size', 14),
+                 color=panel.get('title_color', 'black'))
+    ax.set_xlabel(AXIS_LABELS[0], fontsize=12)
+    ax.set_ylabel(AXIS_LABELS[1], fontsize=12)
+    ax.set_aspect('equal')
+    if panel.get('grid', True):
+        ax.grid(True, alpha=0.3)
+    if 'xlim' in panel:
+        ax.set_xlim(*panel['xlim'])
+    if 'ylim' in panel:
+        ax.set_ylim(*panel['ylim'])
+
+
+# ---------------------------------------------------------------- figures
+
+def render_figure(model, figure, units, output_dir, formats, dpi, label_limit=vr.LABEL_LIMIT):
+    """Lay out and draw every panel of one figure spec, then save it"""
+    rows, cols = figure.get('layout', (1, 1))
+    fig, axes = plt.subplots(rows, cols, figsize=figure.get('figsize', (8 * cols, 6 * rows)),
+                             squeeze=False)
+    axes = axes.ravel()
+    for ax, panel in zip(axes, figure['panels']):
+        draw_panel(ax, model, panel, units, label_limit)
+    for ax in axes[len(figure['panels']):]:
+        ax.set_visible(False)
+    if figure.get('title'):
+        fig.suptitle(figure['title'], fontsize=figure.get('title_size', 16), fontweight='bold',
+                     color=figure.get('title_color', 'black'))
+    fig.tight_layout()
+    vr.save_figure(fig, output_dir, figure['name'], formats, dpi)
+    plt.close(fig)
+
+
+def resolve(path, base):
+    """Spec paths are relative to the spec file (JSON) or the repository (built-in cases)"""
+    path = Path(path)
+    return path if path.is_absolute() else base / path
+
+
+def render_case(case, output_dir='.', formats=vr.OUTPUT_FORMATS, dpi=vr.DPI, names=None,
+                base=REPO_DIR):
+    """Render the figures of one case from a single parse; names restricts the figure set"""
+    model = load_model(resolve(case['out'], base),
+                       resolve(case['dat'], base) if case.get('dat') else None)
+    units = case.get('units', {})
+    rendered = []
+    for figure in case['figures']:
+        if names and figure['name'] not in names:
+            continue
+        render_figure(model, figure, units, output_dir, formats, dpi)
+        rendered.append(figure['name'])
+    return rendered
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Render report figures from declarative specs")
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help=f"built-in cases (default: all of {', '.join(CASES)})")
+    parser.add_argument('--spec', action='append', default=[],
+                        help="JSON case spec (may be repeated); paths relative to the spec file")
+    parser.add_argument('--figure', action='append', help="only render figures with these names")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--formats', nargs='+', default=list(vr.OUTPUT_FORMATS),
+                        choices=vr.OUTPUT_FORMATS)
+    parser.add_argument('--dpi', type=int, default=vr.DPI)
+    args = parser.parse_args()
+    plt.switch_backend('Agg')
+
+    unknown = [c for c in args.cases if c not in CASES]
+    if unknown:
+        print(f"Error: Unknown case {unknown[0]} (choose from {', '.join(CASES)})")
+        sys.exit(1)
+
+    jobs = [(CASES[name], REPO_DIR) for name in (args.cases or ([] if args.spec else CASES))]
+    for spec_path in args.spec:
+        with open(spec_path, encoding='utf-8') as f:
+            jobs.append((json.load(f), Path(spec_path).resolve().parent))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    total = 0
+    for case, base in jobs:
+        try:
+            total += len(render_case(case, args.output_dir, args.formats, args.dpi,
+                                     args.figure, base))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    print(f"✓ {total} figures rendered to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
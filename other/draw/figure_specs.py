@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Report Figure Specs
+Declarative specs of the paper figures rendered by figure_engine.py. A case names
+its result (.out) and input (.dat, for material properties), the display units,
+and its figures; each figure is a grid of panels. Text annotations may use the
+placeholders {E}, {nu}, {t}, {numnp}, {nume}, {neq}, {Fx}, {Fy}, {load_total}.
+"""
+
+PATCH_UNITS = {'length': 'mm', 'stress': 'Pa'}
+WZY_UNITS = {'length': 'μm', 'stress': 'Pa'}
+
+PATCH_PASSED = {'type': 'text', 'xy': (1.25, 0.3), 'text': 'PATCH TEST\nPASSED!\nCONSTANT STRESS',
+                'ha': 'center', 'va': 'center', 'fontsize': 14, 'fontweight': 'bold',
+                'color': 'darkgreen',
+                'box': {'facecolor': 'lightgreen', 'edgecolor': 'green', 'linewidth': 2}}
+
+PATCH_STRESS = {'kind': 'element', 'field': 'sxx', 'size': 1000, 'range': (9.9, 10.1),
+                'edgecolor': 'black', 'format': '{value:.1f} Pa', 'label_box': 'dark',
+                'fontsize': 13, 'title': 'Stress_XX Distribution (ALL = 10.0 Pa!)',
+                'title_color': 'darkgreen', 'annotations': [PATCH_PASSED]}
+
+PATCH_UX = {'kind': 'contour', 'field': 'ux', 'values': 'dark', 'title': 'X-Direction Displacement'}
+PATCH_UY = {'kind': 'contour', 'field': 'uy', 'values': 'dark',
+            'title': 'Y-Direction Displacement (Poisson Effect)'}
+
+PATCH_TEST = {
+    'dat': "data/patch_tests/test.dat",
+    'out': "data/patch_tests/test.out",
+    'units': PATCH_UNITS,
+    'figures': [
+        {
+            'name': 't3_patch_geometry',
+            'figsize': (14, 10),
+            'panels': [{
+                'kind': 'geometry', 'title': 'T3 Patch Test - Geometry Model (test.dat)',
+                'title_size': 16, 'supports': True,
+                'loads': {'color': 'blue', 'length': 0.1, 'anchor': 'tail'},
+                'element_labels': {'facecolor': 'lightblue'},
+                'node_labels': {'style': 'box', 'offset': (-0.08, 0.1)},
+                'xlim': (-0.9, 5.2), 'ylim': (-0.9, 3.8),
+                'annotations': [
+                    {'type': 'dimension', 'from': (0, -0.4), 'to': (2.5, -0.4), 'text': '2.5 m',
+                     'offset': (0, -0.2)},
+                    {'type': 'dimension', 'from': (-0.5, 0), 'to': (-0.5, 2.0), 'text': '2.0 m',
+                     'offset': (-0.2, 0)},
+                    {'type': 'dimension', 'from': (2.8, 0), 'to': (2.8, 3.0), 'text': '3.0 m',
+                     'offset': (0.2, 0)},
+                    {'type': 'text', 'xy': (3.4, 2.4), 'fontsize': 11,
+                     'box': {'facecolor': 'lightyellow', 'edgecolor': 'orange'},
+                     'text': "MATERIAL PROPERTIES:\nYoung's Modulus E = {E:,.0f} Pa\n"
+                             "Poisson's Ratio nu = {nu:g}\nThickness t = {t:g} m\n\n"
+                             "LOAD EQUILIBRIUM:\nSum Fx = {Fx:g} N\nSystem is in equilibrium"},
+                    {'type': 'text', 'xy': (3.4, 1.0), 'fontsize': 11,
+                     'box': {'facecolor': 'lightgray', 'edgecolor': 'gray'},
+                     'text': "BOUNDARY CONDITIONS:\nRed Square: ux=uy=0 FIXED\n"
+                             "Orange Triangle: uy=0 Y-FIXED\nGreen Circle: FREE\n\n"
+                             "FINITE ELEMENTS:\n{nume} T3 triangular elements\n"
+                             "All elements share internal node 5\nTotal DOF = {neq} equations"},
+                ],
+            }],
+        },
+        {
+            'name': 't3_patch_results',
+            'title': 'T3 Patch Test - Results Analysis (CONSTANT STRESS ACHIEVED!)',
+            'title_size': 18, 'title_color': 'darkgreen',
+            'layout': (2, 3), 'figsize': (20, 12),
+            'panels': [
+                {'kind': 'geometry', 'title': 'Original T3 Mesh (4 Elements)',
+                 'node_labels': {'style': 'plain', 'offset': (0.03, 0.03)}},
+                {'kind': 'deformed', 'scale': 60, 'arrows': True,
+                 'title': 'Mesh Deformation (Scaled 60x)'},
+                {'kind': 'contour', 'field': 'umag', 'cmap': 'plasma',
+                 'title': 'Displacement Magnitude Distribution'},
+                PATCH_UX,
+                PATCH_UY,
+                PATCH_STRESS,
+            ],
+        },
+        {
+            'name': 't3_displacement_stress_analysis',
+            'title': 'T3 Patch Test - Displacement and Stress Analysis', 'title_size': 18,
+            'layout': (1, 3), 'figsize': (20, 6),
+            'panels': [PATCH_UX, PATCH_UY, PATCH_STRESS],
+        },
+    ],
+}
+
+WZY_OUTLINE = {'facecolor': 'lightgray', 'alpha': 0.2, 'edgecolor': 'black'}
+WZY_NODES = {'style': 'circle', 'offset': (-0.05, 0.04)}
+
+
+def wzy_stress_panel(field, cmap, title, **extra):
+    """Centroid markers with element number and value, over the shaded trapezoid"""
+    return dict({'kind': 'element', 'field': field, 'cmap': cmap, 'size': 1200,
+                 'edgecolor': 'black', 'format': 'E{id}\n{value:.1f}', 'title': title,
+                 'outline': WZY_OUTLINE, 'node_labels': WZY_NODES}, **extra)
+
+
+WZY = {
+    'dat': "data/validation_tests/wzy.dat",
+    'out': "data/validation_tests/wzy.out",
+    'units': WZY_UNITS,
+    'figures': [
+        {
+            'name': 'wzy_geometry_model',
+            'figsize': (12, 8),
+            'panels': [{
+                'kind': 'geometry',
+                'title': 'Trapezoidal Structure - Geometry Model & Load Distribution',
+                'outline': {'facecolor': 'lightblue', 'alpha': 0.3}, 'supports': True,
+                'loads': {'length': 0.08}, 'element_labels': {'facecolor': 'white'},
+                'node_labels': {'style': 'circle', 'coords': True, 'offset': (-0.1, 0.07)},
+                'xlim': (-0.8, 3.5), 'ylim': (-0.7, 1.5),
+                'annotations': [
+                    {'type': 'dimension', 'from': (0, -0.15), 'to': (2, -0.15), 'text': '2.0 m',
+                     'offset': (0, -0.1), 'lw': 1.5, 'fontsize': 12},
+                    {'type': 'dimension', 'from': (0, 1.15), 'to': (2, 1.15), 'text': '2.0 m',
+                     'offset': (0, 0.1), 'lw': 1.5, 'fontsize': 12},
+                    {'type': 'dimension', 'from': (-0.2, 0), 'to': (-0.2, 1), 'text': '1.0 m',
+                     'offset': (-0.1, 0), 'lw': 1.5, 'fontsize': 12},
+                    {'type': 'dimension', 'from': (2.2, 0.5), 'to': (2.2, 1.0), 'text': '0.5 m',
+                     'offset': (0.1, 0), 'lw': 1.5, 'fontsize': 12},
+                    {'type': 'text', 'xy': (2.7, 0.8), 'fontsize': 10,
+                     'box': {'facecolor': 'lightyellow'},
+                     'text': "Material Properties:\nE = {E:.1e} Pa\nν = {nu:g}\n"
+                             "Thickness = {t:g} m"},
+                    {'type': 'text', 'xy': (1.0, 0.2),
+                     'text': "Total Load: {load_total:g}N downward",
+                     'fontsize': 12, 'fontweight': 'bold', 'ha': 'center', 'va': 'center',
+                     'box': {'facecolor': 'lightgreen'}},
+                    {'type': 'triad', 'xy': (-0.6, -0.4)},
+                    {'type': 'text', 'xy': (1.0, -0.5),
+                     'text': 'Trapezoidal Structure under Top Loading',
+                     'ha': 'center', 'va': 'center', 'fontsize': 14, 'fontweight': 'bold',
+                     'style': 'italic', 'box': {'facecolor': 'lightcyan'}},
+                ],
+            }],
+        },
+        {
+            'name': 'wzy_t3_analysis',
+            'title': 'WZY Case T3 Element Analysis Results (Based on STAPpp Output)',
+            'layout': (2, 3), 'figsize': (18, 12),
+            'panels': [
+                {'kind': 'geometry', 'title': 'Original T3 Mesh',
+                 'node_labels': {'style': 'plain', 'offset': (0.02, 0)}},
+                {'kind': 'deformed', 'scale': 1e6, 'loads': True,
+                 'title': 'Mesh Deformation Comparison'},
+                {'kind': 'vectors', 'scale': 1e6, 'title': 'Displacement Vector Field'},
+                {'kind': 'contour', 'field': 'ux', 'title': 'X-Direction Displacement'},
+                {'kind': 'contour', 'field': 'uy', 'title': 'Y-Direction Displacement'},
+                {'kind': 'element', 'field': 'von_mises', 'title': 'von Mises Stress Distribution'},
+            ],
+        },
+        {
+            'name': 'wzy_displacement_analysis',
+            'title': 'Problem 4-4 Trapezoidal Structure - Displacement Analysis',
+            'layout': (2, 2), 'figsize': (16, 12),
+            'panels': [
+                {'kind': 'deformed', 'scale': 1e5, 'title': 'Original vs Deformed Mesh',
+                 'outline': {'facecolor': 'lightblue', 'alpha': 0.2}, 'supports': True,
+                 'support_size': 0.8, 'loads': {'length': 0.08}, 'node_labels': WZY_NODES,
+                 'xlim': (-0.3, 2.5), 'ylim': (-0.2, 1.3)},
+                {'kind': 'contour', 'field': 'umag', 'cmap': 'viridis', 'values': 'light',
+                 'format': '{value:.2f}', 'skip_zero': True, 'title': 'Displacement Magnitude'},
+                {'kind': 'contour', 'field': 'ux', 'values': 'light', 'format': '{value:.2f}',
+                 'skip_zero': True, 'title': 'X-Direction Displacement'},
+                {'kind': 'contour', 'field': 'uy', 'values': 'light', 'format': '{value:.2f}',
+                 'skip_zero': True, 'title': 'Y-Direction Displacement'},
+            ],
+        },
+        {
+            'name': 'wzy_stress_analysis',
+            'title': 'Problem 4-4 Trapezoidal Structure - Stress Analysis',
+            'layout': (2, 2), 'figsize': (16, 12),
+            'panels': [
+                wzy_stress_panel('sxx', 'RdBu_r', 'σxx Stress Distribution'),
+                wzy_stress_panel('syy', 'RdBu_r', 'σyy Stress Distribution'),
+                wzy_stress_panel('sxy', 'RdBu_r', 'τxy Shear Stress Distribution'),
+                wzy_stress_panel('von_mises', 'jet', 'von Mises Stress Distribution',
+                                 loads={'length': 0.08}),
+            ],
+        },
+    ],
+}
+
+CASES = {
+    'patch_test': PATCH_TEST,
+    'wzy': WZY,
+}
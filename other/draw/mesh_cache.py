@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+STAPpp Mesh Cache
+网格派生量的缓存：三角剖分、边表、单元形心、面积、包围盒、TriFinder、空间索引和等值线缓存首次使用时计算一次，
+同一进程内的所有绘图函数共用；变形网格只更新坐标，拓扑（三角形、边、相邻关系）与原网格共享
+"""
+
+from functools import cached_property
+
+import numpy as np
+import matplotlib.tri as tri
+
+
+class MeshCache:
+    """T3 网格及其派生量（惰性计算并缓存）"""
+
+    def __init__(self, x, y, triangles, node_ids=None, elem_ids=None, base=None):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.triangles = np.asarray(triangles)
+        self.node_ids = node_ids
+        self.elem_ids = elem_ids
+        self.base = base   # 变形网格所对应的原网格
+        self._contours = {}
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        """由 visualize_results.build_mesh_arrays 的结果创建"""
+        return cls(mesh['x'], mesh['y'], mesh['triangles'], mesh['node_ids'], mesh['elem_ids'])
+
+    @cached_property
+    def triangulation(self):
+        """matplotlib 三角剖分；变形网格沿用原网格已算好的边与相邻关系"""
+        triang = tri.Triangulation(self.x, self.y, self.triangles)
+        if self.base is not None:
+            source = self.base.triangulation
+            # Triangulation 的边表、相邻表惰性计算并缓存在这两个私有属性里，只依赖拓扑；
+            # matplotlib 改名后不再共享，由新三角剖分自行计算
+            if '_edges' in vars(triang) and '_neighbors' in vars(source):
+                triang._edges = source.edges
+                triang._neighbors = source._neighbors
+        return triang
+
+    @cached_property
+    def edges(self):
+        """不重复的边 (M, 2)，节点索引从0开始"""
+        if self.base is not None:
+            return self.base.edges
+        return self.triangulation.edges
+
+    @cached_property
+    def centroids(self):
+        """单元形心 (E, 2)"""
+        return np.column_stack([self.x[self.triangles].mean(axis=1),
+                                self.y[self.triangles].mean(axis=1)])
+
+    @cached_property
+    def areas(self):
+        """单元面积 (E,)"""
+        x, y = self.x[self.triangles], self.y[self.triangles]
+        return 0.5 * np.abs((x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0])
+                            - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0]))
+
+    @cached_property
+    def bbox(self):
+        """包围盒 (xmin, xmax, ymin, ymax)"""
+        return (float(self.x.min()), float(self.x.max()), float(self.y.min()), float(self.y.max()))
+
+    @property
+    def size(self):
+        """模型尺寸：包围盒的较大边长"""
+        xmin, xmax, ymin, ymax = self.bbox
+        return max(xmax - xmin, ymax - ymin)
+
+    @cached_property
+    def trifinder(self):
+        """点定位用的 TriFinder（由三角剖分共享）"""
+        return self.triangulation.get_trifinder()
+
+    @cached_property
+    def spatial_index(self):
+        """探测点定位用的均匀网格索引（spatial_index.TriangleGrid）"""
+        from spatial_index import TriangleGrid
+        return TriangleGrid(self.x, self.y, self.triangles)
+
+    def probe(self, values, points, location='node'):
+        """探测点 (P, 2) 上的场值（节点场线性插值，单元场取所在单元的值）"""
+        return self.spatial_index.interpolate(values, points, location)
+
+    def contours(self, subdiv=0):
+        """等值线缓存（细分网格、插值器、级别与多边形），每个细分次数一份"""
+        if subdiv not in self._contours:
+            from contour_cache import ContourCache
+            self._contours[subdiv] = ContourCache(self, subdiv)
+        return self._contours[subdiv]
+
+    def deformed(self, ux, uy, scale=1.0):
+        """按放大系数 scale 叠加位移后的网格，拓扑与本网格共享"""
+        return MeshCache(self.x + ux * scale, self.y + uy * scale, self.triangles,
+                         self.node_ids, self.elem_ids, base=self.base or self)
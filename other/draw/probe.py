@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+STAPpp Point Probes and Path Plots
+在任意 (x, y) 点或沿折线提取位移、应力：网格的空间索引只建一次（MeshCache.spatial_index），
+全部探测点一次向量化定位并插值（节点场按重心坐标线性插值，单元场取所在单元的值）
+- --point X Y：打印各点的场值（可重复）；--points-file：CSV 中的全部点，结果写到 --csv
+- --path X0 Y0 X1 Y1 ...：沿折线等距取样，画出各场随弧长的变化曲线
+Usage: python3 probe.py xxx.out --point 4 1 [--point ...] [--fields ux uy von_mises]
+       python3 probe.py xxx.out --path 0 1 4 1 [--samples 200] [--csv path.csv] [--output-dir DIR]
+"""
+
+import sys
+import os
+import argparse
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import visualize_results as vr
+from figure_engine import FIELDS, load_model, field_values
+from spatial_index import sample_polyline
+
+
+def probe_fields(model, points, names):
+    """探测点 (P, 2) 上各场的值 {名称: (P,)}，网格外为 NaN"""
+    cache = model['mesh']
+    return {name: cache.probe(field_values(model, name), points, FIELDS[name][0]) for name in names}
+
+
+def write_csv(path, columns):
+    """{列名: (P,)} -> CSV"""
+    names = list(columns)
+    np.savetxt(path, np.column_stack([columns[n] for n in names]), delimiter=',',
+               header=','.join(names), comments='', fmt='%.8e')
+    print(f"✓ Samples saved to: {path}")
+
+
+def plot_path(title, s, values, output_dir, name, formats, dpi):
+    """各场沿折线弧长的曲线，每个场一个子图"""
+    fig, axes = plt.subplots(len(values), 1, figsize=(10, 2.8 * len(values)), sharex=True,
+                             squeeze=False)
+    for ax, (field, v) in zip(axes[:, 0], values.items()):
+        location, label, quantity = FIELDS[field]
+        ax.plot(s, v, 'b-', linewidth=1.5, drawstyle='steps-mid' if location == 'element' else 'default')
+        ax.set_ylabel(f"{label} ({'m' if quantity == 'length' else 'Pa'})")
+        ax.grid(True, alpha=0.3)
+    axes[-1, 0].set_xlabel('Distance Along Path (m)')
+    axes[0, 0].set_title(f"{title} - Path Profile", fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    vr.save_figure(fig, output_dir, name, formats, dpi)
+    plt.close(fig)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Probe STAPpp results at points or along a path")
+    parser.add_argument('input', help="result file (.out)")
+    parser.add_argument('--point', nargs=2, type=float, action='append', default=[], metavar=('X', 'Y'),
+                        help="probe point (may be repeated)")
+    parser.add_argument('--points-file', help="CSV file of x,y probe points")
+    parser.add_argument('--path', nargs='+', type=float, metavar='XY',
+                        help="polyline vertices X0 Y0 X1 Y1 ...")
+    parser.add_argument('--samples', type=int, default=200, help="samples along the path (default: 200)")
+    parser.add_argument('--fields', nargs='+', choices=list(FIELDS), default=['ux', 'uy', 'von_mises'])
+    parser.add_argument('--csv', help="write the probed values to this CSV file")
+    parser.add_argument('--output-dir', default='.', help="directory for the path plot")
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=vr.OUTPUT_FORMATS)
+    parser.add_argument('--dpi', type=int, default=150)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Error: File {args.input} not found!")
+        sys.exit(1)
+    if args.path is not None and (len(args.path) < 4 or len(args.path) % 2):
+        print("Error: --path needs at least two X Y vertices")
+        sys.exit(1)
+    if not (args.point or args.points_file or args.path):
+        print("Error: Give --point, --points-file or --path")
+        sys.exit(1)
+
+    try:
+        model = load_model(args.input)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.path is not None:
+        s, points = sample_polyline(np.reshape(args.path, (-1, 2)), args.samples)
+        values = probe_fields(model, points, args.fields)
+        outside = np.isnan(next(iter(values.values()))).sum()
+        if outside:
+            print(f"Warning: {outside} of {len(s)} samples lie outside the mesh")
+        os.makedirs(args.output_dir, exist_ok=True)
+        name = f"{os.path.splitext(os.path.basename(args.input))[0]}_path"
+        plot_path(model['info']['title'], s, values, args.output_dir, name, args.formats, args.dpi)
+        if args.csv:
+            write_csv(args.csv, {'s': s, 'x': points[:, 0], 'y': points[:, 1], **values})
+        return
+
+    points = np.array(args.point, dtype=float).reshape(-1, 2)
+    if args.points_file:
+        rows = np.genfromtxt(args.points_file, delimiter=',', ndmin=2)[:, :2]
+        points = np.vstack([points, rows[~np.isnan(rows).any(axis=1)]])   # 跳过表头等非数值行
+    values = probe_fields(model, points, args.fields)
+
+    if args.csv:
+        write_csv(args.csv, {'x': points[:, 0], 'y': points[:, 1], **values})
+    else:
+        print(f"{'X':>12} {'Y':>12}" + "".join(f" {name:>14}" for name in args.fields))
+        for i, (x, y) in enumerate(points):
+            print(f"{x:12.5g} {y:12.5g}" + "".join(f" {values[name][i]:14.6e}" for name in args.fields))
+
+
+if __name__ == "__main__":
+    main()
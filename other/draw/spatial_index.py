@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+STAPpp Spatial Index
+T3 网格上的均匀网格索引：每个单元按包围盒登记到所覆盖的格子中（CSR 存放），
+点定位、重心坐标插值和折线采样对成批的探测点一次性向量化计算
+"""
+
+import numpy as np
+
+# 点定位时每批处理的探测点数（限制候选 (点, 单元) 对的内存）
+PROBE_CHUNK = 100000
+
+# 重心坐标的容差：落在单元边上的点也算在单元内
+BARY_TOL = 1e-10
+
+
+class TriangleGrid:
+    """T3 单元的均匀网格索引；格子数约等于单元数，每个格子平均只登记几个单元"""
+
+    def __init__(self, x, y, triangles, cells=None):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.triangles = np.asarray(triangles)
+        tx, ty = self.x[self.triangles], self.y[self.triangles]
+
+        # 重心坐标的仿射变换：(l1, l2) = inv @ (p - v0)，l0 = 1 - l1 - l2
+        self.origin = np.column_stack([tx[:, 0], ty[:, 0]])
+        jacobian = np.stack([np.column_stack([tx[:, 1] - tx[:, 0], tx[:, 2] - tx[:, 0]]),
+                             np.column_stack([ty[:, 1] - ty[:, 0], ty[:, 2] - ty[:, 0]])], axis=1)
+        self.inverse = np.linalg.inv(jacobian)
+
+        # 格子划分：格子边长取包围盒面积 / 格子数的平方根
+        count = cells or len(self.triangles)
+        self.xmin, self.ymin = self.x.min(), self.y.min()
+        width = max(self.x.max() - self.xmin, 1e-300)
+        height = max(self.y.max() - self.ymin, 1e-300)
+        h = np.sqrt(width * height / max(count, 1)) or max(width, height)
+        self.nx = max(1, int(np.ceil(width / h)))
+        self.ny = max(1, int(np.ceil(height / h)))
+        self.hx, self.hy = width / self.nx, height / self.ny
+
+        # 每个单元覆盖的格子范围，展开成 (格子, 单元) 对后按格子排序
+        ix0, iy0 = self.cell_index(tx.min(axis=1), ty.min(axis=1))
+        ix1, iy1 = self.cell_index(tx.max(axis=1), ty.max(axis=1))
+        span_x = ix1 - ix0 + 1
+        span = span_x * (iy1 - iy0 + 1)
+        owner = np.repeat(np.arange(len(self.triangles)), span)
+        local = np.arange(len(owner)) - np.repeat(np.cumsum(span) - span, span)
+        cell = ((iy0[owner] + local // span_x[owner]) * self.nx + ix0[owner] + local % span_x[owner])
+        order = np.argsort(cell, kind='stable')
+        self.cell_triangles = owner[order]
+        self.cell_start = np.concatenate([[0], np.cumsum(np.bincount(cell, minlength=self.nx * self.ny))])
+
+    def cell_index(self, px, py):
+        """坐标所在的格子 (ix, iy)，截断到网格范围内"""
+        ix = np.clip(((px - self.xmin) / self.hx).astype(np.int64), 0, self.nx - 1)
+        iy = np.clip(((py - self.ymin) / self.hy).astype(np.int64), 0, self.ny - 1)
+        return ix, iy
+
+    def locate(self, points):
+        """点定位：points (P, 2) -> (单元索引 (P,)，网格外为 -1；重心坐标 (P, 3)，网格外为 NaN)"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        elements = np.full(len(points), -1, dtype=np.int64)
+        bary = np.full((len(points), 3), np.nan)
+        for start in range(0, len(points), PROBE_CHUNK):
+            stop = min(start + PROBE_CHUNK, len(points))
+            elements[start:stop], bary[start:stop] = self._locate(points[start:stop])
+        return elements, bary
+
+    def _locate(self, points):
+        """一批探测点的定位：展开为 (点, 候选单元) 对，逐对算重心坐标，取每个点第一个命中的单元"""
+        px, py = points[:, 0], points[:, 1]
+        inside_box = ((px >= self.xmin) & (px <= self.xmin + self.nx * self.hx)
+                      & (py >= self.ymin) & (py <= self.ymin + self.ny * self.hy))
+        ix, iy = self.cell_index(px, py)
+        cell = iy * self.nx + ix
+        first = self.cell_start[cell]
+        count = np.where(inside_box, self.cell_start[cell + 1] - first, 0)
+
+        point = np.repeat(np.arange(len(points)), count)
+        offset = np.arange(len(point)) - np.repeat(np.cumsum(count) - count, count)
+        candidate = self.cell_triangles[first[point] + offset]
+
+        local = np.einsum('pij,pj->pi', self.inverse[candidate], points[point] - self.origin[candidate])
+        pair_bary = np.column_stack([1.0 - local.sum(axis=1), local])
+        hit = np.flatnonzero(pair_bary.min(axis=1) >= -BARY_TOL)
+        found, index = np.unique(point[hit], return_index=True)
+
+        elements = np.full(len(points), -1, dtype=np.int64)
+        bary = np.full((len(points), 3), np.nan)
+        elements[found] = candidate[hit[index]]
+        bary[found] = pair_bary[hit[index]]
+        return elements, bary
+
+    def interpolate(self, values, points, location='node'):
+        """探测点上的场值：节点场按重心坐标线性插值，单元场取所在单元的值；网格外为 NaN
+
+        values: 节点场 (N,) / (N, k) 或单元场 (E,) / (E, k)
+        """
+        elements, bary = self.locate(points)
+        values = np.asarray(values, dtype=float)
+        found = elements >= 0
+        result = np.full((len(elements),) + values.shape[1:], np.nan)
+        if location == 'node':
+            corner = values[self.triangles[elements[found]]]
+            result[found] = np.einsum('pc,pc...->p...', bary[found], corner)
+        else:
+            result[found] = values[elements[found]]
+        return result
+
+
+def sample_polyline(vertices, samples=200):
+    """沿折线等距取样：vertices (M, 2) -> (弧长 (samples,)，取样点 (samples, 2))"""
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    length = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(vertices, axis=0).T))])
+    s = np.linspace(0.0, length[-1], samples)
+    return s, np.column_stack([np.interp(s, length, vertices[:, 0]),
+                               np.interp(s, length, vertices[:, 1])])
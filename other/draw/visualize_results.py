@@ -2,21 +2,46 @@
 """
 STAPpp Universal Results Visualization Script
 通用STAPpp结果可视化脚本，自动解析.out文件并生成图片
-Usage: python3 visualize_results.py xxx.out
+批处理模式（多个文件、目录或 --headless）强制使用 Agg 后端、不弹出窗口，
+按 (结果文件, 图类型) 用进程池并行渲染；单个文件时 --profile 按 plot_* 等函数调用
+分阶段计时，--profile-memory 另统计峰值内存（计时因此偏高），--cprofile 另存 cProfile 与折叠栈
+Usage: python3 visualize_results.py xxx.out [--label-limit N] [--smooth] [--refine N] [-j N] [-v | -q]
+       python3 visualize_results.py xxx.out --cprofile --figures analysis
+       python3 visualize_results.py results/ more.out --headless -j 8 --formats png --dpi 150
 """
 
 import sys
 import os
 import json
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.tri as tri
 from pathlib import Path
 
 # 确保draw目录存在
 SCRIPT_DIR = Path(__file__).parent
 RESULT_DIR = SCRIPT_DIR / "result"
 RESULT_DIR.mkdir(parents=True, exist_ok=True)
+sys.path.insert(0, str(SCRIPT_DIR.resolve().parent.parent / "data" / "result"))
+
+import get
+import derived_fields
+import profiling
+from mesh_cache import MeshCache
+
+logger = logging.getLogger(__name__)
+
+# 逐个标注（节点号、数值）的数量上限，超过后按空间网格抽稀，只保留互不重叠的标注
+LABEL_LIMIT = 200
+# 以完整线宽、标记尺寸绘制的实体数上限，超过后按数量缩小
+DETAIL_LIMIT = 500
+
+# 可生成的结果：总览图、应力分析图、文本报告
+FIGURES = ('analysis', 'stress', 'report')
+OUTPUT_FORMATS = ('png', 'pdf')
+DPI = 300
 
 def load_parsed_data(filepath):
     """加载解析后的数据，如果不存在则先解析"""
@@ -27,98 +52,154 @@ def load_parsed_data(filepath):
     json_path = os.path.join(dir_name, f"{base_name}_parsed.json")
     
     if not os.path.exists(json_path):
-        print(f"Parsed data not found at {json_path}")
-        print("Please run get.py first to parse the output file:")
-        print(f"python3 get.py {filepath}")
+        logger.error(f"Parsed data not found at {json_path}")
+        logger.error("Please run get.py first to parse the output file:")
+        logger.error(f"python3 get.py {filepath}")
         return None
     
     # 加载JSON数据
     try:
         with open(json_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        print(f"✓ Loaded parsed data from: {json_path}")
+        logger.info(f"✓ Loaded parsed data from: {json_path}")
         return data
     except Exception as e:
-        print(f"Error loading parsed data: {e}")
+        logger.error(f"Error loading parsed data: {e}")
         return None
 
-def create_visualization(data, output_prefix):
-    """创建完整的可视化分析"""
-    
-    # 提取数据
+def build_mesh_arrays(data):
+    """把解析数据转换为数组：节点编号升序排列，单元连接一次性映射为从0开始的三角形索引
+
+    返回字典: node_ids, x, y, ux, uy, uz (N,), elem_ids (E,), triangles (E, 3)，
+    只保留所有节点都存在的单元
+    """
     nodes = data['nodes']
     elements = data['elements']
     displacements = data['displacements']
-    stresses = data['stresses']
-    loads = data.get('loads', {})
-    
-    print(f"Processing {len(nodes)} nodes, {len(elements)} elements")
-    
-    # 调试信息
-    print("Available nodes:", sorted([int(k) for k in nodes.keys()]))
-    if elements:
-        first_elem = list(elements.values())[0]
-        print("Sample element nodes:", first_elem['nodes'])
-    
-    # 转换为numpy数组 - 修复索引问题
-    node_ids = sorted([int(k) for k in nodes.keys()])  # 转换为整数列表并排序
-    x = np.array([nodes[str(nid)]['x'] for nid in node_ids])
-    y = np.array([nodes[str(nid)]['y'] for nid in node_ids])
+
+    node_ids = np.sort(np.fromiter((int(k) for k in nodes), dtype=np.int64, count=len(nodes)))
+    keys = [str(nid) for nid in node_ids]
+    x = np.array([nodes[k]['x'] for k in keys], dtype=float)
+    y = np.array([nodes[k]['y'] for k in keys], dtype=float)
+
+    zero = {'ux': 0.0, 'uy': 0.0, 'uz': 0.0}
+    disp = np.array([[d['ux'], d['uy'], d['uz']] for d in (displacements.get(k, zero) for k in keys)],
+                    dtype=float).reshape(-1, 3)
+
+    elem_ids = np.fromiter((int(k) for k in elements), dtype=np.int64, count=len(elements))
+    conn = np.array([elem['nodes'] for elem in elements.values()], dtype=np.int64).reshape(-1, 3)
+
+    # 编号 -> 索引：有序数组上的二分查找，找不到的节点由掩码标出
+    index = np.searchsorted(node_ids, conn)
+    found = np.zeros(conn.shape, dtype=bool)
+    if len(node_ids):
+        found = node_ids[np.minimum(index, len(node_ids) - 1)] == conn
+    valid = found.all(axis=1)
+
+    if not valid.all():
+        bad = elem_ids[~valid]
+        logger.warning(f"Skipping {len(bad)} elements that reference non-existent nodes "
+                       f"(e.g. {bad[:5].tolist()})")
+        for elem_id, row, ok in zip(bad[:20], conn[~valid][:20], found[~valid][:20]):
+            logger.debug(f"  element {elem_id}: missing nodes {row[~ok].tolist()}")
+
+    order = np.argsort(elem_ids[valid], kind='stable')
+    return {
+        'node_ids': node_ids, 'x': x, 'y': y,
+        'ux': disp[:, 0], 'uy': disp[:, 1], 'uz': disp[:, 2],
+        'elem_ids': elem_ids[valid][order],
+        'triangles': index[valid][order]
+    }
+
+def element_stress_arrays(stresses, elem_ids):
+    """按单元编号取应力分量 (E, 3) [sxx, syy, sxy]，缺失的单元为0"""
+    zero = {'sxx': 0.0, 'syy': 0.0, 'sxy': 0.0}
+    values = [stresses.get(str(eid), zero) for eid in elem_ids]
+    return np.array([[s['sxx'], s['syy'], s['sxy']] for s in values], dtype=float).reshape(-1, 3)
+
+def save_figure(fig, output_dir, name, formats=OUTPUT_FORMATS, dpi=DPI):
+    """按指定格式保存图片"""
+    for fmt in formats:
+        output_path = Path(output_dir) / f"{name}.{fmt}"
+        fig.savefig(output_path, dpi=dpi, bbox_inches='tight', facecolor='white')
+        logger.info(f"✓ Plot saved: {output_path}")
+
+def finish_figure(fig, show):
+    """交互模式下显示图片；之后关闭图片释放内存（批处理模式不调用 show）"""
+    if show:
+        plt.show()
+    plt.close(fig)
+
+def create_visualization(data, output_prefix, label_limit=LABEL_LIMIT, smooth=False,
+                         figures=FIGURES, formats=OUTPUT_FORMATS, dpi=DPI, show=True,
+                         output_dir=RESULT_DIR, refine=0, contour_workers=None):
+    """创建完整的可视化分析（refine: 等值线细分次数；contour_workers > 1 时等值线先在进程池中算好）"""
     
-    # 位移数据
-    ux = np.array([displacements[str(nid)]['ux'] for nid in node_ids])
-    uy = np.array([displacements[str(nid)]['uy'] for nid in node_ids])
-    uz = np.array([displacements[str(nid)]['uz'] for nid in node_ids])
+    stresses = data['stresses']
     
-    # 创建三角剖分 - 修复索引转换
-    triangles = []
-    valid_elements = {}
+    logger.info(f"Processing {len(data['nodes'])} nodes, {len(data['elements'])} elements")
     
-    for elem_id, elem in elements.items():
-        nodes_elem = elem['nodes']
-        print(f"Processing element {elem_id} with nodes {nodes_elem}")
+    if 'analysis' in figures or 'stress' in figures:
+        mesh = build_mesh_arrays(data)
         
-        # 检查所有节点是否存在
-        valid_nodes = True
-        for node in nodes_elem:
-            if int(node) not in node_ids:
-                print(f"Warning: Element {elem_id} references non-existent node {node}")
-                valid_nodes = False
-                break
+        if len(mesh['triangles']) == 0:
+            logger.error("Error: No valid triangles found!")
+            logger.error(f"Available nodes: {len(mesh['node_ids'])}; element connectivity issues detected.")
+            return
         
-        if valid_nodes:
-            try:
-                # 转换为从0开始的索引
-                tri_indices = [node_ids.index(int(node)) for node in nodes_elem]
-                triangles.append(tri_indices)
-                valid_elements[elem_id] = elem
-                print(f"✓ Element {elem_id}: nodes {nodes_elem} -> indices {tri_indices}")
-            except ValueError as e:
-                print(f"Error processing element {elem_id}: {e}")
-        else:
-            print(f"✗ Skipping invalid element {elem_id}")
-    
-    if not triangles:
-        print("Error: No valid triangles found!")
-        print("Available nodes:", node_ids)
-        print("Element connectivity issues detected.")
-        return
+        logger.info(f"✓ Created {len(mesh['triangles'])} valid triangles")
+        
+        try:
+            # 三角剖分等网格派生量只计算一次，由各图共用
+            cache = MeshCache.from_mesh(mesh)
+            cache.triangulation  # 在此构建，以便捕获无效网格的错误
+            logger.debug("✓ Triangulation successful")
+        except Exception as e:
+            logger.error(f"Error creating triangulation: {e}")
+            return
+        
+        if contour_workers and contour_workers > 1:
+            prefetch_contours(data, mesh, cache, figures, smooth, refine, contour_workers)
     
-    print(f"✓ Created {len(triangles)} valid triangles")
-    triangles = np.array(triangles)
+    if 'analysis' in figures:
+        fig = create_analysis_figure(data, mesh, cache, label_limit, smooth, refine)
+        save_figure(fig, output_dir, f"{output_prefix}_analysis", formats, dpi)
+        finish_figure(fig, show)
     
-    try:
-        triang = tri.Triangulation(x, y, triangles)
-        print("✓ Triangulation successful")
-    except Exception as e:
-        print(f"Error creating triangulation: {e}")
-        return
+    # 创建详细应力分析
+    if 'stress' in figures and stresses:
+        create_stress_analysis(data, output_prefix, cache, label_limit, smooth,
+                               formats, dpi, show, output_dir, refine)
     
-    # 计算变形后坐标
-    scale_factor = auto_scale_factor(x, y, ux, uy)
-    x_def = x + ux * scale_factor
-    y_def = y + uy * scale_factor
-    triang_def = tri.Triangulation(x_def, y_def, triangles)
+    # 生成数据报告
+    if 'report' in figures:
+        generate_analysis_report(data, output_prefix, output_dir)
+
+def prefetch_contours(data, mesh, cache, figures, smooth, refine, workers):
+    """在进程池中预先计算各图要用到的填充等值线（键与绘图函数中的一致）"""
+    fields = {}
+    if 'analysis' in figures:
+        fields['ux'] = (mesh['ux'] * 1e6, None)
+        fields['uy'] = (mesh['uy'] * 1e6, None)
+    if smooth and data['stresses']:
+        stress = stress_fields(element_stress_arrays(data['stresses'], cache.elem_ids))
+        keys = [key for key, _, _ in STRESS_COMPONENTS] if 'stress' in figures else ['von_mises']
+        fields.update((key, (nodal_average(cache, stress[key]), None)) for key in keys
+                      if np.ptp(stress[key]) > 1e-12 * np.max(np.abs(stress[key])))
+    cache.contours(refine).prefetch(fields, workers)
+    logger.debug(f"✓ Prefetched {len(fields)} contour fields")
+
+def create_analysis_figure(data, mesh, cache, label_limit=LABEL_LIMIT, smooth=False, refine=0):
+    """总览图：网格与载荷、变形、位移矢量、位移等值线和应力分布"""
+    node_ids, x, y = mesh['node_ids'], mesh['x'], mesh['y']
+    ux, uy, uz = mesh['ux'], mesh['uy'], mesh['uz']
+    triang = cache.triangulation
+    
+    # 变形后网格：只更新坐标，拓扑与原网格共享
+    scale_factor = auto_scale_factor(cache.size, ux, uy)
+    deformed = cache.deformed(ux, uy, scale_factor)
+    x_def, y_def = deformed.x, deformed.y
+    triang_def = deformed.triangulation
     
     # 位移幅值
     displacement_mag = np.sqrt(ux**2 + uy**2 + uz**2)
@@ -129,7 +210,7 @@ def create_visualization(data, output_prefix):
     
     # 1. 原始网格
     ax1 = axes[0, 0]
-    plot_original_mesh(ax1, triang, x, y, node_ids, loads)
+    plot_original_mesh(ax1, triang, x, y, node_ids, data.get('loads', {}), label_limit)
     
     # 2. 变形对比
     ax2 = axes[0, 1]
@@ -142,39 +223,24 @@ def create_visualization(data, output_prefix):
     
     # 4. X位移等值线
     ax4 = axes[1, 0]
-    plot_displacement_contour(ax4, triang, x, y, ux*1e6, 'X-Displacement (μm)', 'RdBu_r')
+    contours = cache.contours(refine)
+    plot_displacement_contour(ax4, contours, 'ux', ux*1e6, 'X-Displacement (μm)', 'RdBu_r',
+                              label_limit)
     
     # 5. Y位移等值线
     ax5 = axes[1, 1]
-    plot_displacement_contour(ax5, triang, x, y, uy*1e6, 'Y-Displacement (μm)', 'RdBu_r')
+    plot_displacement_contour(ax5, contours, 'uy', uy*1e6, 'Y-Displacement (μm)', 'RdBu_r',
+                              label_limit)
     
     # 6. 应力分布
     ax6 = axes[1, 2]
-    plot_stress_distribution(ax6, triang, x, y, valid_elements, stresses, node_ids)
-    
-    plt.tight_layout()
-    
-    # 保存图片
-    output_path = RESULT_DIR / f"{output_prefix}_analysis.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Analysis plot saved: {output_path}")
-    
-    output_path_pdf = RESULT_DIR / f"{output_prefix}_analysis.pdf"
-    plt.savefig(output_path_pdf, bbox_inches='tight', facecolor='white')
-    print(f"✓ Analysis plot saved: {output_path_pdf}")
+    plot_stress_distribution(ax6, cache, data['stresses'], label_limit, smooth, refine)
     
-    plt.show()
-    
-    # 创建详细应力分析
-    if stresses:
-        create_stress_analysis(data, output_prefix, valid_elements, node_ids)
-    
-    # 生成数据报告
-    generate_analysis_report(data, output_prefix)
+    fig.tight_layout()
+    return fig
 
-def auto_scale_factor(x, y, ux, uy):
-    """自动计算变形缩放因子"""
-    model_size = max(np.max(x) - np.min(x), np.max(y) - np.min(y))
+def auto_scale_factor(model_size, ux, uy):
+    """自动计算变形缩放因子（model_size: 包围盒的较大边长）"""
     max_displacement = np.max(np.sqrt(ux**2 + uy**2))
     
     if max_displacement > 0:
@@ -186,34 +252,108 @@ def auto_scale_factor(x, y, ux, uy):
     
     return scale_factor
 
-def plot_original_mesh(ax, triang, x, y, node_ids, loads):
+def detail_scale(count, limit=DETAIL_LIMIT):
+    """实体数超过 limit 时线宽、标记尺寸的缩放系数"""
+    return 1.0 if count <= limit else max(0.05, limit / count)
+
+def label_box(ax, fontsize, chars):
+    """一个标注在数据坐标下的大致宽、高（按坐标轴当前的显示比例估算）"""
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    bbox = ax.get_window_extent()
+    pixels_per_point = ax.figure.dpi / 72.0
+    # 每数据单位对应的磅数；取两个方向中较小者，与 set_aspect('equal') 后的比例一致
+    scale = min(bbox.width / max(abs(x1 - x0), 1e-300),
+                bbox.height / max(abs(y1 - y0), 1e-300)) / pixels_per_point
+    return 0.65 * fontsize * chars / scale, 1.8 * fontsize / scale
+
+def select_labels(ax, x, y, limit=LABEL_LIMIT, priority=None, fontsize=10, chars=6):
+    """选出需要逐个标注的点的索引
+    
+    不超过 limit 个时全部标注；否则按标注在图上的大小划分网格，每格先保留优先级最高的点，
+    再按优先级贪心地剔除与已选标注重叠者，最多保留 limit 个
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= limit:
+        return np.arange(n)
+    if limit <= 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    width, height = label_box(ax, fontsize, chars)
+    ix = np.floor((x - x.min()) / width).astype(np.int64)
+    iy = np.floor((y - y.min()) / height).astype(np.int64)
+    key = ix * (iy.max() + 1) + iy
+    
+    order = np.argsort(-np.asarray(priority), kind='stable') if priority is not None else np.arange(n)
+    _, first = np.unique(key[order], return_index=True)
+    
+    taken = {}
+    keep = []
+    for i in order[np.sort(first)]:
+        cell = (ix[i], iy[i])
+        neighbours = (taken.get((cell[0] + dx, cell[1] + dy)) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        if any(j is not None and abs(x[j] - x[i]) < width and abs(y[j] - y[i]) < height
+               for j in neighbours):
+            continue
+        taken[cell] = i
+        keep.append(i)
+        if len(keep) >= limit:
+            break
+    return np.sort(np.array(keep, dtype=np.int64))
+
+def mesh_lines(ax, triang, color, linewidth, alpha=1.0, linestyle='-', label=None):
+    """把网格的每条边只画一次，合并为一条以 NaN 断开的折线（单个 artist，
+    PDF 输出比逐段的 LineCollection 快一个数量级）"""
+    edges = triang.edges
+    segments = np.full((len(edges), 3, 2), np.nan)
+    segments[:, 0, 0], segments[:, 1, 0] = triang.x[edges[:, 0]], triang.x[edges[:, 1]]
+    segments[:, 0, 1], segments[:, 1, 1] = triang.y[edges[:, 0]], triang.y[edges[:, 1]]
+    segments = segments.reshape(-1, 2)
+    lines, = ax.plot(segments[:, 0], segments[:, 1], color=color, alpha=alpha,
+                     linestyle=linestyle, linewidth=linewidth * detail_scale(len(edges)),
+                     label=label)
+    return lines
+
+def plot_original_mesh(ax, triang, x, y, node_ids, loads, label_limit=LABEL_LIMIT):
     """绘制原始网格"""
-    ax.triplot(triang, 'b-', linewidth=2, alpha=0.8)
-    ax.plot(x, y, 'bo', markersize=8)
+    mesh_lines(ax, triang, 'b', 2, alpha=0.8)
+    ax.plot(x, y, 'bo', markersize=8 * detail_scale(len(x)))
     
-    # 标注节点
-    for i, node_id in enumerate(node_ids):
-        ax.text(x[i], y[i], f'  {node_id}', fontsize=10, ha='left', va='bottom')
+    # 标注节点（数量过多时抽稀）
+    for i in select_labels(ax, x, y, label_limit, chars=len(str(node_ids.max())) + 2):
+        ax.text(x[i], y[i], f'  {node_ids[i]}', fontsize=10, ha='left', va='bottom')
     
-    # 绘制载荷箭头
+    # 载荷箭头：收集为数组后用一个 quiver 绘制
+    load_node = []
+    load_dir = []
+    load_mag = []
     for node_id_str, load_dict in loads.items():
-        node_id = int(node_id_str)
-        if node_id in node_ids:
-            idx = node_ids.index(node_id)
-            for direction, magnitude in load_dict.items():
-                arrow_scale = min(0.3, abs(magnitude)/1000)  # 调整箭头大小
-                if direction == 1:  # X方向
-                    dx = arrow_scale * np.sign(magnitude)
-                    ax.arrow(x[idx], y[idx], dx, 0, head_width=0.05, head_length=0.03,
-                            fc='red', ec='red', linewidth=2)
-                    ax.text(x[idx] + dx*1.5, y[idx], f'{magnitude:.0f}N', 
-                           fontsize=9, color='red', fontweight='bold', ha='center')
-                elif direction == 2:  # Y方向
-                    dy = arrow_scale * np.sign(magnitude)
-                    ax.arrow(x[idx], y[idx], 0, dy, head_width=0.05, head_length=0.03,
-                            fc='green', ec='green', linewidth=2)
-                    ax.text(x[idx], y[idx] + dy*1.5, f'{magnitude:.0f}N', 
-                           fontsize=9, color='green', fontweight='bold', ha='center')
+        for direction, magnitude in load_dict.items():
+            if int(direction) in (1, 2):
+                load_node.append(int(node_id_str))
+                load_dir.append(int(direction))
+                load_mag.append(float(magnitude))
+    
+    if load_node:
+        load_node = np.array(load_node)
+        load_dir = np.array(load_dir)
+        load_mag = np.array(load_mag)
+        idx = np.searchsorted(node_ids, load_node)
+        ok = (idx < len(node_ids)) & (node_ids[np.minimum(idx, len(node_ids) - 1)] == load_node)
+        idx, load_dir, load_mag = idx[ok], load_dir[ok], load_mag[ok]
+        
+        arrow = np.minimum(0.3, np.abs(load_mag) / 1000) * np.sign(load_mag)  # 调整箭头大小
+        dx = np.where(load_dir == 1, arrow, 0.0)
+        dy = np.where(load_dir == 2, arrow, 0.0)
+        colors = np.where(load_dir == 1, 'red', 'green')
+        ax.quiver(x[idx], y[idx], dx, dy, color=colors, angles='xy', scale_units='xy', scale=1,
+                  width=0.006, zorder=3)
+        
+        for k in select_labels(ax, x[idx] + dx, y[idx] + dy, label_limit, np.abs(load_mag), fontsize=9):
+            ax.text(x[idx[k]] + dx[k]*1.5, y[idx[k]] + dy[k]*1.5, f'{load_mag[k]:.0f}N',
+                    fontsize=9, color=colors[k], fontweight='bold', ha='center')
     
     ax.set_title('Original Mesh with Loads', fontweight='bold')
     ax.set_xlabel('X Coordinate (m)')
@@ -224,240 +364,171 @@ def plot_original_mesh(ax, triang, x, y, node_ids, loads):
 def plot_deformation_comparison(ax, triang, triang_def, x, y, x_def, y_def, 
                                ux, uy, displacement_mag, scale_factor):
     """绘制变形对比"""
-    ax.triplot(triang, 'b-', linewidth=2, alpha=0.6, label='Original')
-    ax.triplot(triang_def, 'r--', linewidth=2, alpha=0.8, 
-              label=f'Deformed (×{scale_factor:.0f})')
-    ax.plot(x, y, 'bo', markersize=6)
-    ax.plot(x_def, y_def, 'ro', markersize=6)
-    
-    # 绘制位移矢量
-    for i in range(len(x)):
-        if displacement_mag[i] > 1e-12:
-            ax.arrow(x[i], y[i], ux[i]*scale_factor, uy[i]*scale_factor,
-                    head_width=0.03, head_length=0.02, fc='purple', 
-                    ec='purple', alpha=0.8)
+    mesh_lines(ax, triang, 'b', 2, alpha=0.6, label='Original')
+    mesh_lines(ax, triang_def, 'r', 2, alpha=0.8, linestyle='--',
+               label=f'Deformed (×{scale_factor:.0f})')
+    size = 6 * detail_scale(len(x))
+    ax.plot(x, y, 'bo', markersize=size)
+    ax.plot(x_def, y_def, 'ro', markersize=size)
+    
+    # 位移矢量：一个 quiver
+    moving = displacement_mag > 1e-12
+    if moving.any():
+        ax.quiver(x[moving], y[moving], ux[moving]*scale_factor, uy[moving]*scale_factor,
+                  color='purple', alpha=0.8, angles='xy', scale_units='xy', scale=1,
+                  width=0.004 * detail_scale(np.count_nonzero(moving)))
     
     ax.set_title('Deformation Comparison', fontweight='bold')
     ax.set_xlabel('X Coordinate (m)')
     ax.set_ylabel('Y Coordinate (m)')
-    ax.legend()
+    ax.legend(loc='best' if len(x) <= DETAIL_LIMIT else 'upper right')  # 'best' 需遍历全部数据点
     ax.grid(True, alpha=0.3)
     ax.set_aspect('equal')
 
 def plot_displacement_vectors(ax, triang, x, y, ux, uy, displacement_mag, scale_factor):
     """绘制位移矢量场"""
-    ax.triplot(triang, 'k-', alpha=0.4)
+    mesh_lines(ax, triang, 'k', 1, alpha=0.4)
     
     if np.max(displacement_mag) > 0:
         quiver = ax.quiver(x, y, ux*scale_factor, uy*scale_factor,
                           displacement_mag*1e6, scale=1, scale_units='xy',
-                          angles='xy', cmap='viridis', alpha=0.8, width=0.003)
+                          angles='xy', cmap='viridis', alpha=0.8,
+                          width=0.003 * detail_scale(len(x)))
         cbar = plt.colorbar(quiver, ax=ax)
         cbar.set_label('Displacement Magnitude (μm)')
     
-    ax.plot(x, y, 'ko', markersize=6)
+    ax.plot(x, y, 'ko', markersize=6 * detail_scale(len(x)))
     ax.set_title('Displacement Vector Field', fontweight='bold')
     ax.set_xlabel('X Coordinate (m)')
     ax.set_ylabel('Y Coordinate (m)')
     ax.grid(True, alpha=0.3)
     ax.set_aspect('equal')
 
-def plot_displacement_contour(ax, triang, x, y, displacement, title, cmap):
-    """绘制位移等值线"""
+def plot_displacement_contour(ax, contours, key, displacement, title, cmap, label_limit=LABEL_LIMIT):
+    """绘制位移等值线（等值线由 contours 按 key 缓存，可在各图之间复用）"""
+    triang = contours.mesh.triangulation
+    x, y = triang.x, triang.y
     if np.max(np.abs(displacement)) > 1e-10:
         try:
-            contour = ax.tricontourf(triang, displacement, levels=20, cmap=cmap)
+            contour = contours.draw(ax, key, displacement, cmap)
             cbar = plt.colorbar(contour, ax=ax)
             cbar.set_label(title)
         except:
             pass  # 如果等值线绘制失败，继续其他部分
     
-    ax.triplot(triang, 'k-', alpha=0.3)
-    ax.plot(x, y, 'ko', markersize=4)
+    mesh_lines(ax, triang, 'k', 1, alpha=0.3)
+    ax.plot(x, y, 'ko', markersize=4 * detail_scale(len(x)))
     
-    # 添加数值标注
-    for i in range(len(x)):
-        if abs(displacement[i]) < 1e6:  # 避免标注过大的数字
-            ax.text(x[i], y[i]+0.05, f'{displacement[i]:.1f}', 
-                   ha='center', va='bottom', fontsize=8, fontweight='bold',
-                   bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
+    # 添加数值标注（数量过多时抽稀，优先标注绝对值大的点）
+    shown = np.nonzero(np.abs(displacement) < 1e6)[0]  # 避免标注过大的数字
+    for i in shown[select_labels(ax, x[shown], y[shown], label_limit, np.abs(displacement[shown]),
+                                 fontsize=8, chars=9)]:
+        ax.text(x[i], y[i]+0.05, f'{displacement[i]:.1f}',
+               ha='center', va='bottom', fontsize=8, fontweight='bold',
+               bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
     
     ax.set_title(title, fontweight='bold')
     ax.set_xlabel('X Coordinate (m)')
     ax.set_ylabel('Y Coordinate (m)')
     ax.set_aspect('equal')
 
-def plot_stress_distribution(ax, triang, x, y, elements, stresses, node_ids):
-    """绘制应力分布"""
-    # 计算单元中心和von Mises应力
-    elem_centers = []
-    von_mises = []
-    
-    for elem_id, elem in elements.items():
-        nodes_elem = elem['nodes']
-        # 获取节点在数组中的索引
-        try:
-            node_indices = [node_ids.index(int(node)) for node in nodes_elem]
-            cx = np.mean([x[i] for i in node_indices])
-            cy = np.mean([y[i] for i in node_indices])
-            elem_centers.append([cx, cy])
-            
-            if str(elem_id) in stresses:
-                stress = stresses[str(elem_id)]
-                sxx, syy, sxy = stress['sxx'], stress['syy'], stress['sxy']
-                vm = np.sqrt(sxx**2 + syy**2 - sxx*syy + 3*sxy**2)
-                von_mises.append(vm)
-            else:
-                von_mises.append(0.0)
-        except ValueError:
-            continue  # 跳过无效的单元
-    
-    if not elem_centers:
-        ax.text(0.5, 0.5, 'No valid stress data', ha='center', va='center', 
-                transform=ax.transAxes, fontsize=14)
-        ax.triplot(triang, 'k-', alpha=0.5)
-        ax.plot(x, y, 'ko', markersize=6)
-        ax.set_title('von Mises Stress Distribution', fontweight='bold')
-        ax.set_xlabel('X Coordinate (m)')
-        ax.set_ylabel('Y Coordinate (m)')
-        ax.set_aspect('equal')
-        return
-    
-    elem_centers = np.array(elem_centers)
-    
-    # 绘制应力分布
-    if len(von_mises) > 0 and np.max(von_mises) > 0:
-        scatter = ax.scatter(elem_centers[:, 0], elem_centers[:, 1],
-                           c=von_mises, s=300, cmap='jet', alpha=0.8)
-        cbar = plt.colorbar(scatter, ax=ax)
-        cbar.set_label('von Mises Stress (Pa)')
+# 应力分量：(字段名, 标题, 颜色表)，Sxx/Syy/Sxy/von Mises 共用同一绘图路径
+STRESS_COMPONENTS = [
+    ('sxx', 'Sxx Stress (Pa)', 'RdBu_r'),
+    ('syy', 'Syy Stress (Pa)', 'RdBu_r'),
+    ('sxy', 'Sxy Stress (Pa)', 'RdBu_r'),
+    ('von_mises', 'von Mises Stress (Pa)', 'jet'),
+]
+
+def stress_fields(stress):
+    """单元应力 (E, 3) -> 各分量、von Mises、主应力等单元字段的数组字典（derived_fields）"""
+    return derived_fields.stress_fields(stress)
+
+def nodal_average(cache, values):
+    """单元常值 -> 节点值：按面积加权平均相邻单元"""
+    tris = cache.triangles
+    area = cache.areas
+    n = len(cache.x)
+    weight = np.bincount(tris.ravel(), weights=np.repeat(area, 3), minlength=n)
+    total = np.bincount(tris.ravel(), weights=np.repeat(area * values, 3), minlength=n)
+    return np.divide(total, weight, out=np.zeros(n), where=weight > 0)
+
+def plot_stress_field(ax, cache, values, title, cmap, smooth=False, label_limit=LABEL_LIMIT,
+                      colorbar_label=None, key=None, refine=0):
+    """绘制一个单元常值应力场：默认按单元着色（tripcolor），smooth 时绘制节点平均后的等值线
+    （按 key 缓存，refine 为细分次数）"""
+    triang = cache.triangulation
+    if len(values) > 0 and np.max(np.abs(values)) > 1e-10:
+        if smooth and np.ptp(values) > 1e-12 * np.max(np.abs(values)):  # 常值场无法绘制等值线
+            artist = cache.contours(refine).draw(ax, key or title, nodal_average(cache, values),
+                                                 cmap)
+        else:
+            artist = ax.tripcolor(triang, facecolors=values, cmap=cmap, edgecolors='none')
+        cbar = plt.colorbar(artist, ax=ax)
+        cbar.set_label(colorbar_label or title)
         
-        # 标注应力值
-        for i, (center, vm) in enumerate(zip(elem_centers, von_mises)):
-            ax.text(center[0], center[1], f'{vm:.1f}', ha='center', va='center',
+        # 标注数值（数量过多时抽稀）
+        cx, cy = cache.centroids.T
+        for i in select_labels(ax, cx, cy, label_limit, np.abs(values)):
+            ax.text(cx[i], cy[i], f'{values[i]:.1f}', ha='center', va='center',
                    fontsize=10, fontweight='bold', color='white')
     
-    ax.triplot(triang, 'k-', alpha=0.5)
-    ax.plot(x, y, 'ko', markersize=6)
-    ax.set_title('von Mises Stress Distribution', fontweight='bold')
+    mesh_lines(ax, triang, 'k', 1, alpha=0.5)
+    ax.plot(triang.x, triang.y, 'ko', markersize=6 * detail_scale(len(triang.x)))
+    ax.set_title(title, fontweight='bold')
     ax.set_xlabel('X Coordinate (m)')
     ax.set_ylabel('Y Coordinate (m)')
     ax.set_aspect('equal')
 
-def create_stress_analysis(data, output_prefix, elements, node_ids):
+def plot_stress_distribution(ax, cache, stresses, label_limit=LABEL_LIMIT, smooth=False, refine=0):
+    """绘制应力分布"""
+    if len(cache.elem_ids) == 0 or not stresses:
+        ax.text(0.5, 0.5, 'No valid stress data', ha='center', va='center', 
+                transform=ax.transAxes, fontsize=14)
+        plot_stress_field(ax, cache, np.zeros(0), 'von Mises Stress Distribution', 'jet')
+        return
+    
+    fields = stress_fields(element_stress_arrays(stresses, cache.elem_ids))
+    plot_stress_field(ax, cache, fields['von_mises'], 'von Mises Stress Distribution', 'jet',
+                      smooth, label_limit, colorbar_label='von Mises Stress (Pa)',
+                      key='von_mises', refine=refine)
+
+def create_stress_analysis(data, output_prefix, cache, label_limit=LABEL_LIMIT, smooth=False,
+                           formats=OUTPUT_FORMATS, dpi=DPI, show=True, output_dir=RESULT_DIR,
+                           refine=0):
     """创建详细应力分析"""
     
-    nodes = data['nodes']
     stresses = data['stresses']
     
     if not stresses:
-        print("No stress data available for detailed analysis")
+        logger.info("No stress data available for detailed analysis")
         return
     
-    x = np.array([nodes[str(nid)]['x'] for nid in node_ids])
-    y = np.array([nodes[str(nid)]['y'] for nid in node_ids])
-    
-    # 创建三角剖分
-    triangles = []
-    for elem_id, elem in elements.items():
-        nodes_elem = elem['nodes']
-        try:
-            tri_indices = [node_ids.index(int(node)) for node in nodes_elem]
-            triangles.append(tri_indices)
-        except ValueError:
-            continue
-    
-    if not triangles:
-        print("No valid triangles for stress analysis")
+    if len(cache.triangles) == 0:
+        logger.warning("No valid triangles for stress analysis")
         return
     
-    triangles = np.array(triangles)
-    triang = tri.Triangulation(x, y, triangles)
-    
-    # 计算单元中心和应力分量
-    elem_centers = []
-    stress_xx = []
-    stress_yy = []
-    stress_xy = []
-    von_mises = []
-    
-    for elem_id, elem in elements.items():
-        nodes_elem = elem['nodes']
-        try:
-            node_indices = [node_ids.index(int(node)) for node in nodes_elem]
-            cx = np.mean([x[i] for i in node_indices])
-            cy = np.mean([y[i] for i in node_indices])
-            elem_centers.append([cx, cy])
-            
-            if str(elem_id) in stresses:
-                stress = stresses[str(elem_id)]
-                sxx, syy, sxy = stress['sxx'], stress['syy'], stress['sxy']
-                stress_xx.append(sxx)
-                stress_yy.append(syy)
-                stress_xy.append(sxy)
-                vm = np.sqrt(sxx**2 + syy**2 - sxx*syy + 3*sxy**2)
-                von_mises.append(vm)
-            else:
-                stress_xx.append(0.0)
-                stress_yy.append(0.0)
-                stress_xy.append(0.0)
-                von_mises.append(0.0)
-        except ValueError:
-            continue
-    
-    elem_centers = np.array(elem_centers)
+    fields = stress_fields(element_stress_arrays(stresses, cache.elem_ids))
     
     # 创建应力分析图
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.suptitle(f'{data["title"]} - Detailed Stress Analysis', 
                  fontsize=16, fontweight='bold')
     
-    stress_components = [
-        (stress_xx, 'Sxx Stress (Pa)', 'RdBu_r'),
-        (stress_yy, 'Syy Stress (Pa)', 'RdBu_r'),
-        (stress_xy, 'Sxy Stress (Pa)', 'RdBu_r'),
-        (von_mises, 'von Mises Stress (Pa)', 'jet')
-    ]
+    for ax, (key, title, cmap) in zip(axes.ravel(), STRESS_COMPONENTS):
+        plot_stress_field(ax, cache, fields[key], title, cmap, smooth, label_limit,
+                          key=key, refine=refine)
     
-    for i, (stress_data, title, cmap) in enumerate(stress_components):
-        ax = axes[i//2, i%2]
-        
-        if len(stress_data) > 0 and np.max(np.abs(stress_data)) > 1e-10:
-            scatter = ax.scatter(elem_centers[:, 0], elem_centers[:, 1],
-                               c=stress_data, s=300, cmap=cmap, alpha=0.8)
-            cbar = plt.colorbar(scatter, ax=ax)
-            cbar.set_label(title)
-            
-            # 标注数值
-            for j, (center, stress_val) in enumerate(zip(elem_centers, stress_data)):
-                ax.text(center[0], center[1], f'{stress_val:.1f}', 
-                       ha='center', va='center', fontsize=10, fontweight='bold', 
-                       color='white')
-        
-        ax.triplot(triang, 'k-', alpha=0.5)
-        ax.plot(x, y, 'ko', markersize=6)
-        ax.set_title(title, fontweight='bold')
-        ax.set_xlabel('X Coordinate (m)')
-        ax.set_ylabel('Y Coordinate (m)')
-        ax.set_aspect('equal')
-    
-    plt.tight_layout()
+    fig.tight_layout()
     
     # 保存应力分析图
-    output_path = RESULT_DIR / f"{output_prefix}_stress_analysis.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Stress analysis plot saved: {output_path}")
-    
-    output_path_pdf = RESULT_DIR / f"{output_prefix}_stress_analysis.pdf"
-    plt.savefig(output_path_pdf, bbox_inches='tight', facecolor='white')
-    print(f"✓ Stress analysis plot saved: {output_path_pdf}")
-    
-    plt.show()
+    save_figure(fig, output_dir, f"{output_prefix}_stress_analysis", formats, dpi)
+    finish_figure(fig, show)
 
-def generate_analysis_report(data, output_prefix):
+def generate_analysis_report(data, output_prefix, output_dir=RESULT_DIR):
     """生成分析报告"""
     
-    report_path = RESULT_DIR / f"{output_prefix}_report.txt"
+    report_path = Path(output_dir) / f"{output_prefix}_report.txt"
     
     nodes = data['nodes']
     elements = data['elements']
@@ -481,80 +552,172 @@ def generate_analysis_report(data, output_prefix):
         
         f.write("DISPLACEMENT RESULTS SUMMARY:\n")
         f.write("-"*50 + "\n")
-        node_ids = sorted([int(k) for k in nodes.keys()])
-        
-        # 计算最大位移
-        max_ux = max_uy = max_mag = 0
-        for node_id in node_ids:
-            if str(node_id) in displacements:
-                disp = displacements[str(node_id)]
-                ux_mm = abs(disp['ux'] * 1000)
-                uy_mm = abs(disp['uy'] * 1000)
-                mag_mm = np.sqrt((disp['ux']*1000)**2 + (disp['uy']*1000)**2)
-                max_ux = max(max_ux, ux_mm)
-                max_uy = max(max_uy, uy_mm)
-                max_mag = max(max_mag, mag_mm)
+        # 位移、应力整理成数组，派生量（位移模、von Mises、主应力）由 derived_fields 一次算出
+        disp_ids = [n for n in sorted(int(k) for k in nodes) if str(n) in displacements]
+        u = np.array([[displacements[str(n)]['ux'], displacements[str(n)]['uy']]
+                      for n in disp_ids], dtype=float).reshape(-1, 2)
+        stress_ids = sorted(int(k) for k in stresses)
+        stress = element_stress_arrays(stresses, stress_ids)
+        derived = derived_fields.DerivedFields.single(u, stress)
         
-        f.write(f"Maximum X-Displacement: {max_ux:.3f} mm\n")
-        f.write(f"Maximum Y-Displacement: {max_uy:.3f} mm\n")
-        f.write(f"Maximum Total Displacement: {max_mag:.3f} mm\n\n")
+        u_mm = np.abs(u) * 1000
+        f.write(f"Maximum X-Displacement: {np.max(u_mm[:, 0], initial=0):.3f} mm\n")
+        f.write(f"Maximum Y-Displacement: {np.max(u_mm[:, 1], initial=0):.3f} mm\n")
+        f.write(f"Maximum Total Displacement: {np.max(derived['umag'], initial=0) * 1000:.3f} mm\n\n")
         
         f.write("STRESS RESULTS SUMMARY:\n")
         f.write("-"*50 + "\n")
         if stresses:
-            stress_values = []
-            for elem_id, stress in stresses.items():
-                sxx, syy, sxy = stress['sxx'], stress['syy'], stress['sxy']
-                vm = np.sqrt(sxx**2 + syy**2 - sxx*syy + 3*sxy**2)
-                stress_values.append({'sxx': sxx, 'syy': syy, 'sxy': sxy, 'vm': vm})
-            
-            if stress_values:
-                max_sxx = max([abs(s['sxx']) for s in stress_values])
-                max_syy = max([abs(s['syy']) for s in stress_values])
-                max_sxy = max([abs(s['sxy']) for s in stress_values])
-                max_vm = max([s['vm'] for s in stress_values])
-                
-                f.write(f"Maximum |Sxx|: {max_sxx:.2f} Pa\n")
-                f.write(f"Maximum |Syy|: {max_syy:.2f} Pa\n")
-                f.write(f"Maximum |Sxy|: {max_sxy:.2f} Pa\n")
-                f.write(f"Maximum von Mises: {max_vm:.2f} Pa\n\n")
+            f.write(f"Maximum |Sxx|: {np.abs(derived['sxx']).max():.2f} Pa\n")
+            f.write(f"Maximum |Syy|: {np.abs(derived['syy']).max():.2f} Pa\n")
+            f.write(f"Maximum |Sxy|: {np.abs(derived['sxy']).max():.2f} Pa\n")
+            f.write(f"Maximum von Mises: {derived['von_mises'].max():.2f} Pa\n")
+            f.write(f"Principal Stress Range: {derived['s2'].min():.2f} ~ {derived['s1'].max():.2f} Pa\n")
+            f.write(f"Maximum In-plane Shear: {derived['max_shear'].max():.2f} Pa\n\n")
         
         f.write("DETAILED RESULTS:\n")
         f.write("-"*50 + "\n")
         f.write("Node Displacements:\n")
         f.write(f"{'Node':<4} {'UX(μm)':<12} {'UY(μm)':<12} {'Magnitude(μm)':<15}\n")
         f.write("-"*45 + "\n")
-        for node_id in node_ids:
-            if str(node_id) in displacements:
-                disp = displacements[str(node_id)]
-                ux_um = disp['ux'] * 1e6
-                uy_um = disp['uy'] * 1e6
-                mag_um = np.sqrt(ux_um**2 + uy_um**2)
-                f.write(f"{node_id:<4} {ux_um:<12.3f} {uy_um:<12.3f} {mag_um:<15.3f}\n")
+        u_um = u * 1e6
+        for node_id, (ux_um, uy_um), mag_um in zip(disp_ids, u_um, derived['umag'] * 1e6):
+            f.write(f"{node_id:<4} {ux_um:<12.3f} {uy_um:<12.3f} {mag_um:<15.3f}\n")
         
         f.write("\nElement Stresses:\n")
         f.write(f"{'Elem':<4} {'Sxx(Pa)':<12} {'Syy(Pa)':<12} {'Sxy(Pa)':<12} {'von Mises(Pa)':<15}\n")
         f.write("-"*60 + "\n")
-        for elem_id in sorted([int(k) for k in elements.keys()]):
-            if str(elem_id) in stresses:
-                stress = stresses[str(elem_id)]
-                sxx, syy, sxy = stress['sxx'], stress['syy'], stress['sxy']
-                vm = np.sqrt(sxx**2 + syy**2 - sxx*syy + 3*sxy**2)
+        for elem_id, (sxx, syy, sxy), vm in zip(stress_ids, stress, derived['von_mises']):
+            if str(elem_id) in elements:
                 f.write(f"{elem_id:<4} {sxx:<12.2f} {syy:<12.2f} {sxy:<12.2f} {vm:<15.2f}\n")
         
         f.write("\n" + "="*80 + "\n")
         f.write("End of Report\n")
         f.write("="*80 + "\n")
     
-    print(f"✓ Analysis report saved: {report_path}")
+    logger.info(f"✓ Analysis report saved: {report_path}")
+
+def ensure_parsed(input_file):
+    """工作进程：get.py 的解析结果不存在时先解析并保存"""
+    if not os.path.exists(os.path.splitext(input_file)[0] + "_parsed.json"):
+        parsed = get.parse_stappp_output(input_file)
+        if parsed is None:
+            raise RuntimeError(f"cannot parse {input_file}")
+        get.save_parsed_data(parsed, input_file)
+
+def render_task(input_file, figure, options):
+    """工作进程：无界面渲染一个结果文件的一种图"""
+    plt.switch_backend('Agg')
+    data = load_parsed_data(input_file)
+    if data is None:
+        raise RuntimeError(f"cannot load {input_file}")
+    output_prefix = os.path.splitext(os.path.basename(input_file))[0]
+    create_visualization(data, output_prefix, figures=(figure,), show=False, **options)
+
+def collect_inputs(paths):
+    """展开命令行输入：目录取其中全部 .out 文件"""
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            inputs.extend(sorted(str(p) for p in Path(path).glob('*.out')))
+        else:
+            inputs.append(path)
+    return inputs
+
+def render_batch(inputs, figures=FIGURES, workers=None, **options):
+    """批处理：进程池按 (结果文件, 图类型) 并行渲染，返回失败列表 [(文件, 图, 错误)]
+    
+    缺少解析结果的文件先并行解析一遍，避免同一文件的多个渲染任务同时写入JSON
+    """
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsing = {pool.submit(ensure_parsed, input_file): input_file for input_file in inputs}
+        for future in as_completed(parsing):
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"✗ {parsing[future]}: {e}")
+                failures.extend((parsing[future], figure, str(e)) for figure in figures)
+        inputs = [f for f in inputs if f not in {failed for failed, _, _ in failures}]
+        
+        futures = {pool.submit(render_task, input_file, figure, options): (input_file, figure)
+                   for input_file in inputs for figure in figures}
+        for future in as_completed(futures):
+            input_file, figure = futures[future]
+            try:
+                future.result()
+                logger.info(f"✓ {input_file}: {figure}")
+            except Exception as e:
+                logger.error(f"✗ {input_file}: {figure} failed: {e}")
+                failures.append((input_file, figure, str(e)))
+    return failures
 
 def main():
     """主函数"""
-    if len(sys.argv) != 2:
-        print("Usage: python3 visualize_results.py xxx.out")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Visualize a parsed STAPpp output file")
+    parser.add_argument('inputs', nargs='+',
+                        help="STAPpp output files (.out) or directories of them; a single file must "
+                             "be parsed by get.py beforehand, batch mode parses missing ones itself")
+    parser.add_argument('--label-limit', type=int, default=LABEL_LIMIT,
+                        help=f"maximum number of per-node/per-element labels per plot (default: {LABEL_LIMIT})")
+    parser.add_argument('--smooth', action='store_true',
+                        help="draw stresses as nodal-averaged contours instead of element-constant colours")
+    parser.add_argument('--refine', type=int, default=0,
+                        help="split each triangle into 4^N and interpolate cubically for smoother "
+                             "contours (default: 0)")
+    parser.add_argument('--figures', nargs='+', choices=FIGURES, default=list(FIGURES),
+                        help="results to generate (default: all)")
+    parser.add_argument('--formats', nargs='+', default=list(OUTPUT_FORMATS),
+                        help="image formats, e.g. png pdf svg (default: png pdf)")
+    parser.add_argument('--dpi', type=int, default=DPI, help=f"raster resolution (default: {DPI})")
+    parser.add_argument('--output-dir', default=str(RESULT_DIR), help="directory for the results")
+    parser.add_argument('--headless', action='store_true',
+                        help="batch mode: Agg backend, never open windows (implied by several inputs)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="worker processes in batch mode (default: CPU count); for a single file, "
+                             "processes that compute the contours ahead of drawing")
+    parser.add_argument('-v', '--verbose', action='store_true', help="print per-element diagnostics")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only print warnings and errors")
+    parser.add_argument('--profile', action='store_true',
+                        help="single file: record wall/CPU time of every load, create_* and plot_* "
+                             "stage into xxx_profile.json in the output directory")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="like --profile, plus the tracemalloc peak of every stage "
+                             "(tracemalloc slows Python code several times, so times are inflated)")
+    parser.add_argument('--cprofile', action='store_true',
+                        help="like --profile, plus a cProfile dump (xxx_profile.prof) and its "
+                             "collapsed stacks for flame graphs (xxx_profile.collapsed)")
+    args = parser.parse_args()
+    
+    level = logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO
+    logging.basicConfig(format='%(message)s')
+    logger.setLevel(level)
+    
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    options = {'label_limit': args.label_limit, 'smooth': args.smooth, 'refine': args.refine,
+               'formats': args.formats, 'dpi': args.dpi, 'output_dir': output_dir}
+    
+    inputs = collect_inputs(args.inputs)
+    if args.headless or len(inputs) != 1 or os.path.isdir(args.inputs[0]):
+        if args.profile or args.profile_memory or args.cprofile:
+            print("Error: --profile works on a single input file, not in batch mode")
+            sys.exit(1)
+        plt.switch_backend('Agg')
+        missing = [f for f in inputs if not os.path.exists(f)]
+        if not inputs or missing:
+            print("Error: No .out files to render" if not inputs else f"Error: File {missing[0]} not found!")
+            sys.exit(1)
+        
+        print(f"Rendering {len(inputs)} result files x {len(args.figures)} figures into {output_dir}")
+        failures = render_batch(inputs, args.figures, args.workers, **options)
+        print(f"{len(inputs) * len(args.figures) - len(failures)}/{len(inputs) * len(args.figures)} "
+              f"renders succeeded")
+        if failures:
+            sys.exit(1)
+        return
     
-    input_file = sys.argv[1]
+    input_file = inputs[0]
     
     if not input_file.endswith('.out'):
         print("Error: Input file must be a .out file")
@@ -567,8 +730,16 @@ def main():
     # 获取输出前缀
     output_prefix = os.path.splitext(os.path.basename(input_file))[0]
     
+    profiler = None
+    if args.profile or args.profile_memory or args.cprofile:
+        profiler = profiling.StageProfiler(memory=args.profile_memory, cprofile=args.cprofile)
+        profiler.instrument(sys.modules[__name__], 'load_parsed_data', 'build_mesh_arrays',
+                            'create_*', 'prefetch_contours', 'plot_*', 'save_figure',
+                            'generate_analysis_report')
+        profiler.start()
+    
     print(f"Processing STAPpp output file: {input_file}")
-    print(f"Output directory: {RESULT_DIR}")
+    print(f"Output directory: {output_dir}")
     print("="*60)
     
     # 加载数据
@@ -579,17 +750,27 @@ def main():
         sys.exit(1)
     
     # 创建可视化
-    create_visualization(data, output_prefix)
+    create_visualization(data, output_prefix, figures=args.figures,
+                         contour_workers=args.workers, **options)
     
+    formats = '/'.join(args.formats)
     print("\n" + "="*60)
     print("Visualization completed successfully!")
-    print(f"All results saved in: {RESULT_DIR}")
+    print(f"All results saved in: {output_dir}")
     print("Generated files:")
-    print(f"  - {output_prefix}_analysis.png/pdf")
-    if data.get('stresses'):
-        print(f"  - {output_prefix}_stress_analysis.png/pdf")
-    print(f"  - {output_prefix}_report.txt")
+    if 'analysis' in args.figures:
+        print(f"  - {output_prefix}_analysis.{formats}")
+    if 'stress' in args.figures and data.get('stresses'):
+        print(f"  - {output_prefix}_stress_analysis.{formats}")
+    if 'report' in args.figures:
+        print(f"  - {output_prefix}_report.txt")
     print("="*60)
+    
+    if profiler is not None:
+        profiler.stop()
+        print(profiler.report())
+        for path in profiler.save(str(output_dir / f"{output_prefix}_profile")):
+            print(f"✓ Profile saved to: {path}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file